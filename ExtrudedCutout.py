@@ -28,6 +28,7 @@ import FreeCAD
 import FreeCADGui as Gui
 import Part
 import SheetMetalTools
+import SheetMetalParallel
 from SheetMetalTools import SMException
 
 # list of properties to be saved as defaults
@@ -131,6 +132,17 @@ class ExtrudedCutout:
             "ExtrudedCutoutImprovements"
         )
 
+        SheetMetalTools.smAddBoolProperty(
+            obj,
+            "ParallelOffsets",
+            FreeCAD.Qt.translate(
+                "SheetMetal",
+                "Offset the cut components in parallel processes. Faster for dense cut patterns",
+            ),
+            False,
+            "ExtrudedCutoutImprovements"
+        )
+
     def onChanged(self, fp, prop):
         '''Respond to property changes'''
         # Show or hide improvement of the cut:
@@ -162,6 +174,7 @@ class ExtrudedCutout:
         '''Perform the cut when the object is recomputed'''
 
         self.addVerifyProperties(fp)
+        refine = fp.Refine and not SheetMetalTools.smIsPreview(fp)
 
         try:
             # Ensure the Sketch and baseObject properties are valid
@@ -176,8 +189,6 @@ class ExtrudedCutout:
             face_name = face_name[0]
             selected_face = selected_object.Shape.getElement(face_name)
 
-            normal_vector = selected_face.normalAt(0, 0)
-
             # Lengths
             if fp.CutType == "Two dimensions":
                 ExtLength1 = fp.ExtrusionLength1.Value
@@ -217,61 +228,19 @@ class ExtrudedCutout:
                 ExtLength2 = TotalLength
                 ExtLength1 = -TotalLength
 
-            # Step 1: Determine the sheet metal thickness
-            min_distance = float('inf')
-            
-            faces = selected_object.Shape.Faces
-            for face in faces:
-                if face is not selected_face:
-                    if normal_vector.isEqual(face.normalAt(0, 0).multiply(-1), 1e-6): # Test to find a face with opposite normal
-                        distance_info = selected_face.distToShape(face)
-                        distance = distance_info[0]
-                        if distance < min_distance: # Test to find the closest opposite face
-                            try:
-                                checkFace = face.makeOffsetShape(-distance, 0)
-                                checkCut = selected_face.cut(checkFace)
-                                if checkCut.Area < 1e-6: # Test to ensure the opposite face is, in fact, the other side of the sheet metal part
-                                    min_distance = distance
-                            except: # Is necessary 'try' and 'except','cause rounded surfaces offset can lead to errors if offset is bigger than it's radius
-                                continue
-        
-            if min_distance == float('inf'):
-                raise SMException("No opposite face found to calculate thickness.")
-            
-            thickness = round(min_distance,4) # Appear that rounding can help on speed performance of the rest of the code
-
-            # Step 2: Find pairs of parallel faces
-            parallel_faces = []
-            for i, face1 in enumerate(faces):
-                for j, face2 in enumerate(faces):
-                    if i >= j:
-                        continue
-                    if face1.normalAt(0, 0).isEqual(face2.normalAt(0, 0).multiply(-1), 1e-6):
-                        distance_info = face1.distToShape(face2)
-                        distance = distance_info[0]
-                        if abs(distance - thickness) < 1e-5: # In the past, this tolerance was 1e-6, it's leads to errors
-                            parallel_faces.extend([face1, face2])
-
-            if parallel_faces:
-                shell = Part.Shell(parallel_faces)
-            else:
-                raise SMException("No pairs of parallel faces with the specified thickness distance were found.")
+            # Steps 1 and 2 depend only on the base object and are cached,
+            # so editing the cut sketch will skip them
+            cache = SheetMetalTools.smGetRecomputeCache(self)
+            cache.validate((SheetMetalTools.smGetShapeFingerprint(selected_object.Shape), face_name))
+            thickness, shell = cache.get(
+                "sheetSkin", lambda: self.find_sheet_skin(selected_object.Shape, selected_face))
 
             # Surfaces to improve the cut geometry:
             if fp.ImproveCut:
-                smSide1 = self.find_connected_faces(shell)
-                smSide1 = Part.Shell(smSide1[0])
-
-                tknOffStep = thickness / fp.ImproveLevel
-
-                improvSurfaces = []
-                tknOff = tknOffStep
-                while abs(thickness - tknOff) > 1e-6:
-                    sideOff = smSide1.makeOffsetShape(-tknOff, 0)
-                    improvSurfaces.append(sideOff)
-                    tknOff = tknOff + tknOffStep
-
-                improvShell = improvSurfaces
+                smSide1, improvShell = cache.get(
+                    "improveSurfaces",
+                    lambda: self.make_improve_surfaces(shell, thickness, fp.ImproveLevel),
+                    fp.ImproveLevel)
 
             # Step 3: Extrude the cut sketch
             # Get all faces in sketch
@@ -297,7 +266,7 @@ class ExtrudedCutout:
                 myExtrusion1 = compFaces.extrude(ExtLength1)
                 myExtrusion2 = compFaces.extrude(ExtLength2)
 
-                if fp.Refine:
+                if refine:
                     myUnion = Part.Solid.fuse(myExtrusion1, myExtrusion2).removeSplitter()
                 else:
                     myUnion = Part.Solid.fuse(myExtrusion1, myExtrusion2)
@@ -309,63 +278,59 @@ class ExtrudedCutout:
                     myCommImprov = myUnion.common(improvShell)
 
             # Step 4: Find connected components and offset shapes
+            # The offsets are independent, all of them are made in one batch
+            # that can run in parallel
             connected_components = self.find_connected_faces(myCommon)
-            offset_shapes = []
+            offset_shells = []
             for component in connected_components:
                 component_shell = Part.Shell(component)
                 if component_shell.isValid():
-                    offset_shape = component_shell.makeOffsetShape(-thickness, 0, fill=True)
-                    if offset_shape.isValid():
-                        offset_shapes.append(offset_shape)
+                    offset_shells.append(component_shell)
+            offset_values = [-thickness for _shell in offset_shells]
+            num_components = len(offset_shells)
 
             if fp.ImproveCut:
                 connected_improv = self.find_connected_faces(myCommImprov)
-                offset_improv = []
-                for improv in connected_improv: # Offset to one side
-                    improv_shell = Part.Shell(improv)
-                    offset_value = improv_shell.distToShape(smSide1)[0]
-                    off_impr = improv_shell.makeOffsetShape(offset_value, 0, fill=True)
-                    offset_improv.append(off_impr)
-                for improv in connected_improv: # Offset to other side
-                    improv_shell = Part.Shell(improv)
-                    offset_value = thickness - improv_shell.distToShape(smSide1)[0]
-                    off_impr = improv_shell.makeOffsetShape(-offset_value, 0, fill=True)
-                    offset_improv.append(off_impr)
+                improv_shells = [Part.Shell(improv) for improv in connected_improv]
+                improv_dist = [improv_shell.distToShape(smSide1)[0] for improv_shell in improv_shells]
+                offset_shells += improv_shells + improv_shells
+                offset_values += improv_dist # Offset to one side
+                offset_values += [dist - thickness for dist in improv_dist] # Offset to other side
+
+            all_offsets = SheetMetalParallel.makeOffsetShapes(
+                offset_shells, offset_values, 0, fill=True, parallel=fp.ParallelOffsets)
+            offset_shapes = [offset_shape for offset_shape in all_offsets[:num_components]
+                             if offset_shape.isValid()]
+            offset_improv = all_offsets[num_components:]
 
             # Step 5: Combine the offsets
+            # all solids are combined in a single fuse, profiles that do not
+            # touch each other are only compounded
             if offset_shapes:
-                combined_offset = Part.Solid(offset_shapes[0])
-                for shape in offset_shapes[1:]:
-                    combined_offset = combined_offset.fuse(shape)
-
                 if fp.ImproveCut:
-                    comb_impr_off = Part.Solid(offset_improv[0])
-                    for impr_shape in offset_improv[1:]:
-                        comb_impr_off = comb_impr_off.fuse(impr_shape)
-                    combined_offset = combined_offset.fuse(comb_impr_off)
+                    combined_offset = SheetMetalTools.smFuseShapes(offset_shapes + offset_improv)
 
                     # Intersection with sheet metal faces
                     cutOffsets = combined_offset.common(shell)
                     conn_offsetFaces = self.find_connected_faces(cutOffsets)
-                    shapeCutOffsets = []
-                    for offset in conn_offsetFaces:
-                        offsetFace = Part.Shell(offset)
-                        offsetSolid = offsetFace.makeOffsetShape(-thickness, 0, fill=True)
-                        shapeCutOffsets.append(offsetSolid)
+                    offsetFaces = [Part.Shell(offset) for offset in conn_offsetFaces]
+                    shapeCutOffsets = SheetMetalParallel.makeOffsetShapes(
+                        offsetFaces, [-thickness for _face in offsetFaces], 0,
+                        fill=True, parallel=fp.ParallelOffsets)
 
-                    combined_offset = Part.Solid(shapeCutOffsets[0])
-                    for shape in shapeCutOffsets[1:]:
-                        combined_offset = combined_offset.fuse(shape)
+                    combined_offset = SheetMetalTools.smFuseShapes(shapeCutOffsets)
+                else:
+                    combined_offset = SheetMetalTools.smFuseShapes(offset_shapes)
 
                 # Step 6: Cut
                 # Check the "CutSide" property to decide how to perform the cut
                 if fp.CutSide == "Inside":
-                    if fp.Refine:
+                    if refine:
                         cut_result = selected_object.Shape.cut(combined_offset).removeSplitter()
                     else:
                         cut_result = selected_object.Shape.cut(combined_offset)
                 elif fp.CutSide == "Outside":
-                    if fp.Refine:
+                    if refine:
                         cut_result = selected_object.Shape.common(combined_offset).removeSplitter()
                     else:
                         cut_result = selected_object.Shape.common(combined_offset)
@@ -379,33 +344,110 @@ class ExtrudedCutout:
         except SMException as e:
             FreeCAD.Console.PrintError(f"Error: {e}\n")
 
-    def find_connected_faces(self, shape):
-        '''Find connected faces in a shape'''
+    def find_sheet_skin(self, shape, selected_face):
+        '''Find the sheet metal thickness and the shell of the faces parallel to
+           the selected face, at thickness distance'''
+        normal_vector = selected_face.normalAt(0, 0)
+
+        # Step 1: Determine the sheet metal thickness
+        min_distance = float('inf')
+        
         faces = shape.Faces
-        visited = set()
-        components = []
+        for face in faces:
+            if face is not selected_face:
+                if normal_vector.isEqual(face.normalAt(0, 0).multiply(-1), 1e-6): # Test to find a face with opposite normal
+                    distance_info = selected_face.distToShape(face)
+                    distance = distance_info[0]
+                    if distance < min_distance: # Test to find the closest opposite face
+                        try:
+                            checkFace = face.makeOffsetShape(-distance, 0)
+                            checkCut = selected_face.cut(checkFace)
+                            if checkCut.Area < 1e-6: # Test to ensure the opposite face is, in fact, the other side of the sheet metal part
+                                min_distance = distance
+                        except: # Is necessary 'try' and 'except','cause rounded surfaces offset can lead to errors if offset is bigger than it's radius
+                            continue
+    
+        if min_distance == float('inf'):
+            raise SMException("No opposite face found to calculate thickness.")
         
-        def is_connected(face1, face2):
-            for edge1 in face1.Edges:
-                for edge2 in face2.Edges:
-                    if edge1.isSame(edge2):
-                        return True
-            return False
-
-        def dfs(face, component):
-            visited.add(face)
-            component.append(face)
-            for next_face in faces:
-                if next_face not in visited and is_connected(face, next_face):
-                    dfs(next_face, component)
+        thickness = round(min_distance,4) # Appear that rounding can help on speed performance of the rest of the code
+
+        # Step 2: Find pairs of parallel faces
+        parallel_faces = []
+        for i, face1 in enumerate(faces):
+            for j, face2 in enumerate(faces):
+                if i >= j:
+                    continue
+                if face1.normalAt(0, 0).isEqual(face2.normalAt(0, 0).multiply(-1), 1e-6):
+                    distance_info = face1.distToShape(face2)
+                    distance = distance_info[0]
+                    if abs(distance - thickness) < 1e-5: # In the past, this tolerance was 1e-6, it's leads to errors
+                        parallel_faces.extend([face1, face2])
+
+        if parallel_faces:
+            shell = Part.Shell(parallel_faces)
+        else:
+            raise SMException("No pairs of parallel faces with the specified thickness distance were found.")
+
+        return thickness, shell
+
+    def make_improve_surfaces(self, shell, thickness, improveLevel):
+        '''Create the offset surfaces of one sheet side, used to improve the cut'''
+        smSide1 = self.find_connected_faces(shell)
+        smSide1 = Part.Shell(smSide1[0])
+
+        tknOffStep = thickness / improveLevel
+
+        improvSurfaces = []
+        tknOff = tknOffStep
+        while abs(thickness - tknOff) > 1e-6:
+            sideOff = smSide1.makeOffsetShape(-tknOff, 0)
+            improvSurfaces.append(sideOff)
+            tknOff = tknOff + tknOffStep
+
+        return smSide1, improvSurfaces
 
-        for face in faces:
-            if face not in visited:
-                component = []
-                dfs(face, component)
-                components.append(component)
+    def find_connected_faces(self, shape):
+        '''Find connected faces in a shape.
+           Faces sharing an edge are joined with a union-find over an edge map,
+           components are returned in the order of their first face'''
+        faces = shape.Faces
+        parent = list(range(len(faces)))
+
+        def find(i):
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:  # path compression
+                parent[i], i = root, parent[i]
+            return root
+
+        def union(i, j):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                if root_i < root_j:
+                    parent[root_j] = root_i
+                else:
+                    parent[root_i] = root_j
+
+        # map every edge to the first face using it. Edges with the same hash code
+        # are verified with isSame, to be safe from hash collisions
+        edge_map = {}
+        for face_index, face in enumerate(faces):
+            for edge in face.Edges:
+                bucket = edge_map.setdefault(edge.hashCode(), [])
+                for other_edge, other_index in bucket:
+                    if other_edge.isSame(edge):
+                        union(face_index, other_index)
+                        break
+                else:
+                    bucket.append((edge, face_index))
+
+        components = {}
+        for face_index, face in enumerate(faces):
+            components.setdefault(find(face_index), []).append(face)
 
-        return components
+        return list(components.values())
 
 ##########################################################################################################
 # Gui code
@@ -413,6 +455,7 @@ class ExtrudedCutout:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
 
@@ -496,20 +539,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Extruded Cutout command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddCutout.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Extruded Cutout"),
-                "Accel": "E, C",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Extruded cutout from sketch extrusion\n"
-                    "1. Select a face of the sheet metal part (must not be the thickness face) and\n"
-                    "2. Select a sketch for the extruded cut (the sketch must be closed).\n"
-                    "3. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddCutout")
 
         def Activated(self):
             '''Create a Extruded Cutout object from user selections'''
@@ -562,4 +592,4 @@ if SheetMetalTools.isGuiLoaded():
                 return False
             return True
          
-    Gui.addCommand("SheetMetal_AddCutout", AddExtrudedCutoutCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddCutout", AddExtrudedCutoutCommandClass())
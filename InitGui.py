@@ -53,21 +53,11 @@ class SMWorkbench(Workbench):
 
     def Initialize(self):
         "This function is executed when FreeCAD starts"
-        import SheetMetalCmd  # import here all the needed files that create your FreeCAD commands
-        import SheetMetalExtendCmd
-        import SheetMetalUnfolder
-        import SheetMetalBaseCmd
-        import SheetMetalFoldCmd
-        import SheetMetalRelief
-        import SheetMetalJunction
-        import SheetMetalBend
-        import SketchOnSheetMetalCmd
-        import ExtrudedCutout
-        import SheetMetalCornerReliefCmd
-        import SheetMetalFormingCmd
-        import SheetMetalUnfoldCmd
-        import SheetMetalBaseShapeCmd
-        import os.path
+        # Commands are registered with light proxies, the modules implementing them
+        # are imported only when the command is first used
+        import SheetMetalCommands
+
+        SheetMetalCommands.smRegisterCommands()
 
         self.list = [
             "SheetMetal_AddBase",
@@ -76,6 +66,7 @@ class SMWorkbench(Workbench):
             "SheetMetal_AddFoldWall",
             "SheetMetal_Unfold",
             "SheetMetal_UnfoldUpdate",
+            "SheetMetal_BatchExport",
             "SheetMetal_AddCornerRelief",
             "SheetMetal_AddRelief",
             "SheetMetal_AddJunction",
@@ -84,7 +75,7 @@ class SMWorkbench(Workbench):
             "SheetMetal_AddCutout",
             "SheetMetal_Forming",
             "SheetMetal_BaseShape",
-        ]  # A list of command names created in the line above
+        ]  # A list of command names registered in the line above
         if engineering_mode_enabled():
             self.list.insert(
                 self.list.index("SheetMetal_Unfold") + 1, "SheetMetal_UnattendedUnfold"
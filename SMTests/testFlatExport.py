@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# #######################################################################
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+# #######################################################################
+
+import os
+import tempfile
+import unittest
+import Part
+from FreeCAD import Vector
+from SheetMetalFlatExport import (
+    edgeToPrimitive,
+    dxfEntities,
+    svgGroups,
+    makeFlatPatternFile,
+    writeFlatPatternFile,
+)
+
+
+# 10 x 10 square with a hole and a bend line
+square_layers = {
+    "Outline": [
+        ("line", (0.0, 0.0), (10.0, 0.0)),
+        ("line", (10.0, 0.0), (10.0, 10.0)),
+        ("line", (10.0, 10.0), (0.0, 10.0)),
+        ("line", (0.0, 10.0), (0.0, 0.0)),
+    ],
+    "Holes": [("circle", (5.0, 5.0), 1.0)],
+    "Bends": [("polyline", [(2.0, 0.0), (2.0, 10.0)])],
+}
+
+
+class TestFlatExport(unittest.TestCase):
+    def assertAngle(self, angle, expected):
+        self.assertAlmostEqual((angle - expected + 180.0) % 360.0 - 180.0, 0.0, places=4)
+
+    def test_line(self):
+        edge = Part.makeLine(Vector(1, 2, 0), Vector(4, 6, 0))
+        self.assertEqual(edgeToPrimitive(edge), ("line", (1.0, 2.0), (4.0, 6.0)))
+        self.assertIsNone(edgeToPrimitive(Part.makeLine(Vector(1, 2, 0), Vector(1, 2, 0))))
+
+    def test_circle(self):
+        edge = Part.makeCircle(2.0, Vector(3, 4, 0))
+        kind, center, radius = edgeToPrimitive(edge)
+        self.assertEqual(kind, "circle")
+        self.assertAlmostEqual(center[0], 3.0)
+        self.assertAlmostEqual(center[1], 4.0)
+        self.assertAlmostEqual(radius, 2.0)
+
+    def test_arc_orientation(self):
+        # counter clockwise quarter from +X to +Y
+        ccw = Part.Arc(Vector(1, 0, 0), Vector(0.7071068, 0.7071068, 0), Vector(0, 1, 0))
+        kind, _center, radius, a1, a2 = edgeToPrimitive(ccw.toShape())
+        self.assertEqual(kind, "arc")
+        self.assertAlmostEqual(radius, 1.0)
+        self.assertAngle(a1, 0.0)
+        self.assertAngle(a2, 90.0)
+        # clockwise quarter from +Y to +X is the same arc, it is always counter clockwise
+        cw = Part.Arc(Vector(0, 1, 0), Vector(0.7071068, 0.7071068, 0), Vector(1, 0, 0))
+        _kind, _center, _radius, a1, a2 = edgeToPrimitive(cw.toShape())
+        self.assertAngle(a1, 0.0)
+        self.assertAngle(a2, 90.0)
+        # three quarters, crossing the 0 angle
+        big = Part.Arc(Vector(0, 1, 0), Vector(0, -1, 0), Vector(1, 0, 0))
+        _kind, _center, _radius, a1, a2 = edgeToPrimitive(big.toShape())
+        self.assertAngle(a1, 90.0)
+        self.assertAngle(a2, 0.0)
+
+    def test_dxf_entities(self):
+        lines = dxfEntities({"Outline": [("line", (0.0, 0.0), (10.0, 0.0))]}, (5.0, 1.0), "P1")
+        self.assertEqual(lines[:6], ["0", "LINE", "8", "P1_Outline", "62", "5"])
+        values = dict(zip(lines[6::2], lines[7::2]))
+        self.assertEqual(float(values["10"]), 5.0)
+        self.assertEqual(float(values["20"]), 1.0)
+        self.assertEqual(float(values["11"]), 15.0)
+        lines = dxfEntities({"Outline": [("arc", (0.0, 0.0), 2.0, 270.0, 90.0)]})
+        values = dict(zip(lines[6::2], lines[7::2]))
+        self.assertEqual(lines[1], "ARC")
+        self.assertEqual(float(values["50"]), 270.0)
+        self.assertEqual(float(values["51"]), 90.0)
+        # polylines are written as line segments
+        lines = dxfEntities({"Bends": [("polyline", [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)])]})
+        self.assertEqual(lines.count("LINE"), 2)
+
+    def test_svg_groups(self):
+        # the Y axis is flipped: y = 0 is at the bottom of a 10 high drawing
+        groups = svgGroups({"Outline": [("line", (0.0, 0.0), (10.0, 0.0))]}, 10.0)
+        self.assertIn('d="M 0.000000 10.000000 L 10.000000 10.000000"', groups[0])
+        # counter clockwise arc from the bottom to the top of the right side,
+        # with the flipped Y axis this is sweep flag 0
+        groups = svgGroups({"Outline": [("arc", (10.0, 5.0), 5.0, 270.0, 90.0)]}, 10.0)
+        self.assertIn("M 10.000000 10.000000 A 5.000000 5.000000 0 0 0 10.000000 0.000000",
+                      groups[0])
+        groups = svgGroups({"Outline": [("arc", (0.0, 0.0), 1.0, 0.0, 270.0)]}, 10.0)
+        self.assertIn(" 0 1 0 ", groups[0])  # large arc
+        groups = svgGroups({"Bends": [("line", (0.0, 0.0), (1.0, 0.0))]}, 10.0)
+        self.assertIn("stroke-dasharray", groups[0])
+
+    def test_flat_pattern_file(self):
+        single = makeFlatPatternFile([("A", square_layers, (10.0, 10.0))], "dxf")
+        self.assertTrue(single.startswith("0\nSECTION\n2\nENTITIES\n"))
+        self.assertTrue(single.endswith("0\nENDSEC\n0\nEOF\n"))
+        self.assertIn("\nOutline\n", single)
+        self.assertNotIn("A_Outline", single)
+        # several parts are placed side by side with prefixed layers
+        both = makeFlatPatternFile(
+            [("A", square_layers, (10.0, 10.0)), ("B 2", square_layers, (10.0, 10.0))],
+            "svg", spacing=5.0)
+        self.assertIn('width="25.000mm"', both)
+        self.assertIn('height="10.000mm"', both)
+        self.assertIn('id="A_Outline"', both)
+        self.assertIn('id="B_2_Holes"', both)
+        self.assertIn('<circle cx="20.000000" cy="5.000000" r="1.000000"/>', both)
+
+    def test_write_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "part.svg")
+            writeFlatPatternFile(path, [("A", square_layers, (10.0, 10.0))], "svg")
+            with open(path, encoding="utf-8") as file:
+                self.assertIn("<svg", file.read())
+            with self.assertRaises(OSError):
+                writeFlatPatternFile(os.path.join(folder, "missing", "part.svg"),
+                                     [("A", square_layers, (10.0, 10.0))], "svg")
@@ -22,15 +22,18 @@
 # #######################################################################
 
 
+import math
 import unittest
 import FreeCAD as App
 import Part
 from SheetMetalBendSolid import (
     get_point_on_cylinder,
+    get_points_on_cylinder,
     wrap_bspline,
     wrap_face,
     bend_solid,
 )
+from SheetMetalFoldCmd import smFoldLines
 from FreeCAD import Vector
 
 
@@ -130,6 +133,75 @@ class TestFolder(unittest.TestCase):
 
             self.assertEqual(result, d["expected"])
 
+    def test_get_points_on_cylinder(self):
+        # the batch mapping must give the same result as the single point one
+        zero_vert = Vector(631.5394914952352, 377.0, 3.17)
+        center = Vector(631.5394914952352, 377.0, 4.17)
+        axis = Vector(0.0, -1.0, 0.0)
+        zero_vert_normal = Vector(-1.0, -0.0, 0.0)
+        radius = 2.585
+        points = [
+            Vector(631.5394914952352, 377.0, 3.17),
+            Vector(631.5394914952352, -123.0, 3.17),
+            Vector(630.2, 200.0, 3.17),
+            Vector(629.0, 0.0, 3.17),
+        ]
+
+        results = get_points_on_cylinder(
+            zero_vert, points, radius, center, axis, zero_vert_normal
+        )
+        self.assertEqual(len(results), len(points))
+        for point, result in zip(points, results):
+            expected = get_point_on_cylinder(
+                zero_vert, Vector(point), radius, center, axis, zero_vert_normal
+            )
+            self.assertTrue(result.isEqual(expected, 1e-9))
+
+    def fold_lines(self, plate, lines, invertbend):
+        # 2 mm plate, 1 mm radius, 90 degrees up, K-factor 0.5 keeps the volume
+        top = next(face for face in plate.Faces if face.normalAt(0, 0).z > 0.5)
+        result = smFoldLines(1.0, 90.0, 0.5, invertbend, False, "forward", lines, top, plate)
+        self.assertAlmostEqual(result.Volume, plate.Volume, delta=plate.Volume * 1e-3)
+        box = result.optimalBoundingBox()
+        return tuple(round(v, 1) for v in (box.XMin, box.XMax, box.YMin, box.YMax,
+                                           box.ZMin, box.ZMax))
+
+    def assert_fold_sides(self, plate, lines, expected):
+        # invertbend selects the fixed side of the first line, the drawing direction
+        # of the lines does not
+        folds = [self.fold_lines(plate, lines, False), self.fold_lines(plate, lines, True)]
+        self.assertCountEqual(folds, expected)
+        reversed_lines = [Part.makeLine(line.Vertexes[1].Point, line.Vertexes[0].Point)
+                          for line in lines]
+        self.assertEqual(self.fold_lines(plate, reversed_lines, False), folds[0])
+
+    def test_fold_parallel_lines(self):
+        plate = Part.makeBox(100, 60, 2)
+        lines = [Part.makeLine(Vector(30, -10, 2), Vector(30, 70, 2)),
+                 Part.makeLine(Vector(70, -10, 2), Vector(70, 70, 2))]
+        expected = [
+            # left flange fixed: the middle rises and the right one folds back over it
+            (0.0, 33.0, 0.0, 60.0, 0.0, round(46.0 - math.pi, 1)),
+            # middle fixed: both outer flanges rise
+            (27.0, 73.0, 0.0, 60.0, 0.0, round(33.0 - math.pi, 1)),
+        ]
+        self.assert_fold_sides(plate, lines, expected)
+
+    def test_fold_perpendicular_lines(self):
+        # L shaped plate, one line across each arm
+        plate = Part.makeBox(100, 40, 2).fuse(
+            Part.makeBox(40, 60, 2, Vector(60, 40, 0))).removeSplitter()
+        lines = [Part.makeLine(Vector(30, -10, 2), Vector(30, 50, 2)),
+                 Part.makeLine(Vector(50, 70, 2), Vector(110, 70, 2))]
+        expected = [
+            # end of the bottom arm fixed: the rest rises, the end of the other arm
+            # folds around a vertical axis
+            (0.0, 33.0, 0.0, 73.0, 0.0, round(73.0 - math.pi, 1)),
+            # corner fixed: both arm ends rise
+            (27.0, 100.0, 0.0, 73.0, 0.0, round(33.0 - math.pi, 1)),
+        ]
+        self.assert_fold_sides(plate, lines, expected)
+
     @classmethod
     def tearDownClass(cls):
         # Cleanup code that runs after all tests are complete.
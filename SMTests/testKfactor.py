@@ -20,9 +20,12 @@
 #
 # #######################################################################
 
+import os
+import json
+import tempfile
 import unittest
 import FreeCAD
-from SheetMetalKfactor import KFactorLookupTable
+from SheetMetalKfactor import KFactorLookupTable, getKFactorLookupTable, MaterialLibrary
 
 
 class TestKFactor(unittest.TestCase):
@@ -57,6 +60,53 @@ class TestKFactor(unittest.TestCase):
         self.assertTrue(c.k_factor_lookup[99] == 0.5)
         self.assertTrue(c.k_factor_standard == "ansi")
 
+    def test_01_shared_table(self):
+        doc = FreeCAD.newDocument()
+        sheet = doc.addObject("Spreadsheet::Sheet", "material_bar")
+
+        sheet.set("A1", "Radius / Thickness")
+        sheet.set("B1", "K-factor (DIN)")
+        sheet.set("A2", "1")
+        sheet.set("B2", "0.6")
+        sheet.recompute()
+
+        c1 = getKFactorLookupTable(sheet.Label)
+        c2 = getKFactorLookupTable(sheet.Label)
+        self.assertIs(c1, c2)
+        self.assertTrue(c1.k_factor_standard == "din")
+        # the shared table is read only
+        with self.assertRaises(TypeError):
+            c1.k_factor_lookup[2] = 0.5
+
+        # changing the sheet drops the cached table
+        sheet.set("B2", "0.7")
+        sheet.recompute()
+        c3 = getKFactorLookupTable(sheet.Label)
+        self.assertIsNot(c1, c3)
+        self.assertTrue(c3.k_factor_lookup[1] == 0.7)
+        FreeCAD.closeDocument(doc.Name)
+
+    def test_02_material_library(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "shop.json"), "w") as f:
+                json.dump({"materials": [{
+                    "name": "S235",
+                    "k_factor_standard": "ansi",
+                    "k_factors": [[1, 0.38], [3, 0.43]],
+                    "thicknesses": [
+                        {"thickness": 1.5, "gauge": "16", "k_factors": [[1, 0.4]]},
+                        {"thickness": 2.0, "gauge": "14", "radius": 2.0},
+                    ],
+                }]}, f)
+            library = MaterialLibrary(path)
+            self.assertEqual(library.get_references(), ["lib:shop/S235"])
+            material = library.get_material("lib:shop/S235")
+            self.assertEqual(material.get_k_factor_lookup(1.5), {1.0: 0.4})
+            self.assertEqual(material.get_k_factor_lookup(2.0), {1.0: 0.38, 3.0: 0.43})
+            self.assertEqual(material.get_gauge(2.0), "14")
+            self.assertEqual(material.get_default_radius(2.0), 2.0)
+            self.assertIsNone(material.get_gauge(3.0))
+
 
 if __name__ == "__main__":
     unittest.main()
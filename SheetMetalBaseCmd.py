@@ -180,6 +180,7 @@ class SMBaseBend:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     ##########################################################################################################
     # View Provider
@@ -256,19 +257,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Base Wall command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddBase.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": translate("SheetMetal", "Make Base Wall"),
-                "Accel": "C, B",
-                "ToolTip": translate(
-                    "SheetMetal",
-                    "Create a sheetmetal wall from a sketch\n"
-                    "1. Select a Sketch to create bends with walls.\n"
-                    "2. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddBase")
 
         def Activated(self):
             selobj = Gui.Selection.getSelectionEx()[0].Object
@@ -294,4 +283,4 @@ if SheetMetalTools.isGuiLoaded():
             return True
 
 
-    Gui.addCommand("SheetMetal_AddBase", AddBaseCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddBase", AddBaseCommandClass())
@@ -23,7 +23,7 @@
 #
 ###################################################################################
 
-import FreeCAD, Part, os, SheetMetalTools
+import FreeCAD, Part, math, os, SheetMetalTools
 from SheetMetalCmd import smBend
 
 icons_path = SheetMetalTools.icons_path
@@ -37,6 +37,8 @@ origin_location_buttons = ["BL", "CL", "TL", "BC", "CC", "TC", "BR", "CR", "TR"]
 # IMPORTANT: please remember to change the element map version in case of any
 # changes in modeling logic
 smElementMapVersion = 'sm1.'
+# shapes built by smCreateDirectBaseShape have a different topology
+smDirectElementMapVersion = 'sm2.'
 
 
 ##########################################################################################################
@@ -51,7 +53,8 @@ def GetOriginShift(dimension, type, bendCompensation):
         return -dimension / 2.0
     return bendCompensation
 
-def smCreateBaseShape(type, thickness, radius, width, length, height, flangeWidth, fillGaps, origin):
+def getBaseShapeLayout(type, thickness, radius, width, length, height, flangeWidth, origin):
+    ''' Dimensions of the base flat box and the walls, for the given outer dimensions '''
     bendCompensation = thickness + radius
     height -= bendCompensation
     compx = 0
@@ -82,6 +85,62 @@ def smCreateBaseShape(type, thickness, radius, width, length, height, flangeWidt
     offsy = GetOriginShift(width, originY, compy)
     if type == "L-Shape" and originY == "+Y":
         offsy -= bendCompensation
+    return numfolds, width, length, height, flangeWidth, offsx, offsy
+
+def smCreateDirectBaseShape(type, thickness, radius, width, length, height, flangeWidth, origin):
+    ''' Build the shapes that have a constant cross section (L and U shapes) directly, by
+        extruding the bent profile. Returns None for shapes that need to be built
+        with smBend. Only the geometry is built, the unfolders analyse the result
+        like any other shape '''
+    if type not in ["L-Shape", "U-Shape"] or radius < SheetMetalTools.smEpsilon:
+        return None
+    _n, width, length, height, _f, offsx, offsy = getBaseShapeLayout(
+        type, thickness, radius, width, length, height, flangeWidth, origin)
+    t = thickness
+    r = radius
+    z0 = t + r # height of the bend centers
+    ztop = z0 + height
+
+    def point(y, z):
+        return FreeCAD.Vector(offsx, y, z)
+
+    def arc(yc, rad, a0, a1):
+        angles = [math.radians(a) for a in (a0, (a0 + a1) / 2.0, a1)]
+        pts = [point(yc + rad * math.cos(a), z0 + rad * math.sin(a)) for a in angles]
+        return Part.Arc(*pts).toShape()
+
+    def line(y1, z1, y2, z2):
+        return Part.makeLine(point(y1, z1), point(y2, z2))
+
+    y0 = offsy
+    y1 = offsy + width
+    edges = [line(y0, 0, y1, 0)]
+    # right wall, counter clockwise from the bottom of the base
+    edges += [
+        arc(y1, r + t, -90.0, 0.0),
+        line(y1 + r + t, z0, y1 + r + t, ztop),
+        line(y1 + r + t, ztop, y1 + r, ztop),
+        line(y1 + r, ztop, y1 + r, z0),
+        arc(y1, r, 0.0, -90.0),
+    ]
+    edges.append(line(y1, t, y0, t))
+    if type == "U-Shape":
+        edges += [
+            arc(y0, r, -90.0, -180.0),
+            line(y0 - r, z0, y0 - r, ztop),
+            line(y0 - r, ztop, y0 - r - t, ztop),
+            line(y0 - r - t, ztop, y0 - r - t, z0),
+            arc(y0, r + t, 180.0, 270.0),
+        ]
+    else:
+        edges.append(line(y0, t, y0, 0))
+    face = Part.Face(Part.Wire(edges))
+    return face.extrude(FreeCAD.Vector(length, 0, 0))
+
+def smCreateBaseShape(type, thickness, radius, width, length, height, flangeWidth, fillGaps, origin):
+    bendCompensation = thickness + radius
+    numfolds, width, length, height, flangeWidth, offsx, offsy = getBaseShapeLayout(
+        type, thickness, radius, width, length, height, flangeWidth, origin)
     box = Part.makeBox(length, width, thickness, FreeCAD.Vector(offsx, offsy, 0))
     #box.translate(FreeCAD.Vector(offsx, offsy, 0))
     if numfolds == 0:
@@ -118,6 +177,8 @@ class SMBaseShape:
     def __init__(self, obj):
         '''"Add a base sheetmetal shape" '''
         self.addVerifyProperties(obj)
+        # new objects use the direct build, existing ones keep their topology
+        obj.directBuild = True
         obj.Proxy = self
 
     def addVerifyProperties(self, obj):
@@ -179,9 +240,19 @@ class SMBaseShape:
             ),
             True,
         )
+        SheetMetalTools.smAddBoolProperty(
+            obj,
+            "directBuild",
+            FreeCAD.Qt.translate(
+                "SMBaseShape", "Build L and U shapes directly from their profile", "Property"
+            ),
+            False,
+        )
 
-    def getElementMapVersion(self, _fp, ver, _prop, restored):
+    def getElementMapVersion(self, fp, ver, _prop, restored):
         if not restored:
+            if getattr(fp, "directBuild", False):
+                return smDirectElementMapVersion + ver
             return smElementMapVersion + ver
 
     def onChanged(self, fp, prop):
@@ -194,7 +265,15 @@ class SMBaseShape:
 
     def execute(self, fp):
         self.addVerifyProperties(fp)
-        s = smCreateBaseShape(type = fp.shapeType, thickness = fp.thickness.Value,
+        s = None
+        if fp.directBuild:
+            s = smCreateDirectBaseShape(type = fp.shapeType,
+                              thickness = fp.thickness.Value, radius = fp.radius.Value,
+                              width = fp.width.Value, length = fp.length.Value,
+                              height = fp.height.Value, flangeWidth = fp.flangeWidth.Value,
+                              origin = fp.originLoc)
+        if s is None:
+            s = smCreateBaseShape(type = fp.shapeType, thickness = fp.thickness.Value,
                               radius = fp.radius.Value, width = fp.width.Value,
                               length = fp.length.Value, height = fp.height.Value,
                               flangeWidth = fp.flangeWidth.Value, fillGaps = fp.fillGaps,
@@ -215,6 +294,7 @@ class SMBaseShape:
 if SheetMetalTools.isGuiLoaded():
     from PySide import QtCore, QtGui
     from FreeCAD import Gui
+    import SheetMetalCommands
     from SheetMetalLogger import SMLogger
 
     mw = Gui.getMainWindow()
@@ -418,17 +498,7 @@ if SheetMetalTools.isGuiLoaded():
             # add translations path
             Gui.addLanguagePath(language_path)
             Gui.updateLocale()
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddBaseShape.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Add base shape"),
-                "Accel": "H",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Add basic sheet metal object."
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_BaseShape")
 
         def Activated(self):
             doc = FreeCAD.ActiveDocument
@@ -445,4 +515,4 @@ if SheetMetalTools.isGuiLoaded():
         def IsActive(self):
             return FreeCAD.ActiveDocument is not None
 
-    Gui.addCommand("SheetMetal_BaseShape", SMBaseshapeCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_BaseShape", SMBaseshapeCommandClass())
@@ -38,13 +38,52 @@ smElementMapVersion = "sm1."
 smAddBendDefaultVars = [("radius", "defaultRadius")]
 
 
+class SMEdgeIndex:
+    """ Edges of a shape by their end vertices, and faces of a shape by vertex.
+        Built once and used for all the selected edges """
+    def __init__(self, shape):
+        self.edgesByVerts = {}
+        for edge in shape.Edges:
+            verts = edge.Vertexes
+            if len(verts) != 2:
+                continue
+            key = self._key(verts[0], verts[1])
+            self.edgesByVerts.setdefault(key, []).append(edge)
+        self.facesByVert = {}
+        for face in shape.Faces:
+            for v in face.Vertexes:
+                self.facesByVert.setdefault(v.hashCode(), []).append((v, face))
+
+    def _key(self, vert1, vert2):
+        h1 = vert1.hashCode()
+        h2 = vert2.hashCode()
+        return (h1, h2) if h1 <= h2 else (h2, h1)
+
+    def findEdge(self, vert1, vert2):
+        for edge in self.edgesByVerts.get(self._key(vert1, vert2), []):
+            ev1, ev2 = edge.Vertexes
+            if ((vert1.isSame(ev1) and vert2.isSame(ev2)) or
+                    (vert1.isSame(ev2) and vert2.isSame(ev1))):
+                return edge
+        return None
+
+    def vertexFaces(self, vert):
+        faces = []
+        for v, face in self.facesByVert.get(vert.hashCode(), []):
+            if v.isSame(vert) and not any(face.isSame(f) for f in faces):
+                faces.append(face)
+        return faces
+
+
 def smGetClosestVert(vert, face):
     closestVert = None
     closestDist = 99999999
+    point = vert.Point
     for v in face.Vertexes:
         if vert.isSame(v):
             continue
-        d = vert.distToShape(v)[0]
+        # distance between vertices is the distance between their points
+        d = (v.Point - point).Length
         if d < closestDist:
             closestDist = d
             closestVert = v
@@ -53,11 +92,14 @@ def smGetClosestVert(vert, face):
 
 # we look for a matching inner edge to the selected outer one
 # this function finds a single vertex of that edge
-def smFindMatchingVert(shape, edge, vertid):
+def smFindMatchingVert(shape, edge, vertid, edgeIndex=None):
     facelist = shape.ancestorsOfType(edge, Part.Face)
     edgeVerts = edge.Vertexes
     v = edgeVerts[vertid]
-    vfacelist = shape.ancestorsOfType(v, Part.Face)
+    if edgeIndex is not None:
+        vfacelist = edgeIndex.vertexFaces(v)
+    else:
+        vfacelist = shape.ancestorsOfType(v, Part.Face)
 
     # find the face that is not in facelist
     for vface in vfacelist:
@@ -67,31 +109,28 @@ def smFindMatchingVert(shape, edge, vertid):
     return smGetClosestVert(v, vface)
 
 
-def smFindEdgeByVerts(shape, vert1, vert2):
-    for edge in shape.Edges:
-        if vert1.isSame(edge.Vertexes[0]) and vert2.isSame(edge.Vertexes[1]):
-            break
-        if vert1.isSame(edge.Vertexes[1]) and vert2.isSame(edge.Vertexes[0]):
-            break
-    else:
-        edge = None
-    return edge
+def smFindEdgeByVerts(shape, vert1, vert2, edgeIndex=None):
+    if edgeIndex is None:
+        edgeIndex = SMEdgeIndex(shape)
+    return edgeIndex.findEdge(vert1, vert2)
 
 
 def smSolidBend(radius=1.0, selEdgeNames="", MainObject=None):
     InnerEdgesToBend = []
     OuterEdgesToBend = []
+    edgeIndex = SMEdgeIndex(MainObject)
     for selEdgeName in selEdgeNames:
         edge = MainObject.getElement(SheetMetalTools.getElementFromTNP(selEdgeName))
 
         # find matching inner edge to selected outer one
-        v1 = smFindMatchingVert(MainObject, edge, 0)
-        v2 = smFindMatchingVert(MainObject, edge, 1)
-        matchingEdge = smFindEdgeByVerts(MainObject, v1, v2)
+        v1 = smFindMatchingVert(MainObject, edge, 0, edgeIndex)
+        v2 = smFindMatchingVert(MainObject, edge, 1, edgeIndex)
+        matchingEdge = edgeIndex.findEdge(v1, v2)
         if matchingEdge is not None:
             InnerEdgesToBend.append(matchingEdge)
             OuterEdgesToBend.append(edge)
 
+    resultSolid = MainObject
     if len(InnerEdgesToBend) > 0:
         # find thickness of sheet by distance from v1 to one of the edges coming out of edge[0]
         # we assume all corners have same thickness
@@ -101,6 +140,8 @@ def smSolidBend(radius=1.0, selEdgeNames="", MainObject=None):
 
         thickness = v1.distToShape(dedge)[0]
 
+        # makeFillet takes a single radius for all edges, so the inner and outer
+        # edges, which have different radii, still need two passes
         resultSolid = MainObject.makeFillet(radius, InnerEdgesToBend)
         resultSolid = resultSolid.makeFillet(radius + thickness, OuterEdgesToBend)
 
@@ -149,6 +190,7 @@ class SMSolidBend:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
 
@@ -196,19 +238,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Solid Bend command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddBend.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Make Bend"),
-                "Accel": "S, B",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Create Bend where two walls come together on solids\n"
-                    "1. Select edge(s) to create bend on corner edge(s).\n"
-                    "2. Use Property editor to modify parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddBend")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -231,4 +261,4 @@ if SheetMetalTools.isGuiLoaded():
                     return False
             return True
 
-    Gui.addCommand("SheetMetal_AddBend", AddBendCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddBend", AddBendCommandClass())
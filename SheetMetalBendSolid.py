@@ -23,7 +23,16 @@
 #
 ##############################################################################
 
-import Part, math
+import Part, math, FreeCAD
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# maximum deviation of discretized curves from the original, before wrapping
+wrap_tolerance = 0.01
+wrap_min_points = 4
 
 
 def get_point_on_cylinder(zero_vert, point, radius, center, axis, zero_vert_normal):
@@ -69,6 +78,51 @@ def get_point_on_cylinder(zero_vert, point, radius, center, axis, zero_vert_norm
     return final_point
 
 
+def get_points_on_cylinder(zero_vert, points, radius, center, axis, zero_vert_normal):
+    """
+    Calculate points on a cylinder's surface projected from a list of points.
+    Same as get_point_on_cylinder, but all points are mapped at once.
+
+    Parameters:
+    - zero_vert: The reference vertex on the cylinder.
+    - points: The list of points to project onto the cylinder.
+    - radius: The radius of the cylinder.
+    - center: The center point of the cylinder's base.
+    - axis: The axis along which the cylinder extends.
+    - zero_vert_normal: A normal vector to the plane defined by zero_vert.
+
+    Returns:
+    - A list of points on the cylinder surface.
+    """
+    if np is None or len(points) < 2:
+        return [
+            get_point_on_cylinder(
+                zero_vert, FreeCAD.Vector(point), radius, center, axis, zero_vert_normal
+            )
+            for point in points
+        ]
+
+    pts = np.array([(p.x, p.y, p.z) for p in points], dtype=float)
+    zero = np.array((zero_vert.x, zero_vert.y, zero_vert.z))
+    cent = np.array((center.x, center.y, center.z))
+    norm = np.array((zero_vert_normal.x, zero_vert_normal.y, zero_vert_normal.z))
+    inverted_axis = -np.array((axis.x, axis.y, axis.z))
+
+    # signed distance of zero_vert from the planes through the points
+    distance = (zero - pts) @ norm / np.linalg.norm(norm)
+    # projection of the points onto the plane of zero_vert
+    projected = pts - np.outer((pts - zero) @ norm / norm.dot(norm), norm)
+    angle = (distance / radius)[:, np.newaxis]
+    cos_a = np.cos(angle)
+    vectors = projected - cent
+    rotated = (
+        vectors * cos_a
+        + np.outer(vectors @ inverted_axis, inverted_axis) * (1 - cos_a)
+        + np.cross(vectors, inverted_axis) * np.sin(angle)
+    )
+    return [FreeCAD.Vector(*point) for point in (rotated + cent)]
+
+
 def wrap_bspline(bspline, radius, zero_vert, center, axis, zero_vert_normal):
     """
     Wraps a B-Spline curve onto the surface of a cylinder.
@@ -84,14 +138,9 @@ def wrap_bspline(bspline, radius, zero_vert, center, axis, zero_vert_normal):
     Returns:
     - The wrapped B-Spline curve as a Part.Shape object.
     """
-    poles = bspline.getPoles()
-    new_poles = []
-
-    for point in poles:
-        wrapped_point = get_point_on_cylinder(
-            zero_vert, point, radius, center, axis, zero_vert_normal
-        )
-        new_poles.append(wrapped_point)
+    new_poles = get_points_on_cylinder(
+        zero_vert, bspline.getPoles(), radius, center, axis, zero_vert_normal
+    )
 
     new_bspline = bspline
     new_bspline.buildFromPolesMultsKnots(
@@ -106,7 +155,55 @@ def wrap_bspline(bspline, radius, zero_vert, center, axis, zero_vert_normal):
     return new_bspline.toShape()
 
 
-def wrap_face(face, radius, axis, normal, zero_vert, center, zero_vert_normal):
+def wrap_discretized(edge, radius, zero_vert, center, axis, zero_vert_normal,
+                     tolerance=wrap_tolerance):
+    """
+    Wraps any edge onto the surface of a cylinder, by interpolating a B-Spline
+    through wrapped points of the edge. The number of points is driven by the
+    tolerance, so small or straight edges produce light curves.
+    """
+    points = edge.discretize(Deflection=tolerance)
+    if len(points) < wrap_min_points:
+        points = edge.discretize(Number=wrap_min_points)
+    bspline = Part.BSplineCurve()
+    bspline.interpolate(points, PeriodicFlag=False)
+    return wrap_bspline(bspline, radius, zero_vert, center, axis, zero_vert_normal)
+
+
+def wrap_line_on_surface(start_point, end_point, surface, radius, zero_vert, center,
+                         axis, zero_vert_normal):
+    """
+    Wraps a straight line onto a cylindrical surface. The wrapped line is a helix
+    segment, which is a straight line in the surface parameter space, so it is
+    made exactly as a 2D line on the surface.
+    """
+    point1 = get_point_on_cylinder(
+        zero_vert, FreeCAD.Vector(start_point), radius, center, axis, zero_vert_normal
+    )
+    point2 = get_point_on_cylinder(
+        zero_vert, FreeCAD.Vector(end_point), radius, center, axis, zero_vert_normal
+    )
+    u1, v1 = surface.parameter(point1)
+    u2, v2 = surface.parameter(point2)
+    # pick the periodic u value matching the expected wrap angle
+    delta = abs(start_point.distanceToPlane(end_point, zero_vert_normal)) / radius
+    u2 = min(
+        (u2 + k * 2 * math.pi for k in (-1, 0, 1)),
+        key=lambda u: abs(abs(u - u1) - delta),
+    )
+    line2d = Part.Geom2d.Line2dSegment(
+        FreeCAD.Base.Vector2d(u1, v1), FreeCAD.Base.Vector2d(u2, v2)
+    )
+    edge = line2d.toShape(surface)
+    if (edge.Vertexes[0].Point - point1).Length > wrap_tolerance or (
+        edge.Vertexes[-1].Point - point2
+    ).Length > wrap_tolerance:
+        return None
+    return edge
+
+
+def wrap_face(face, radius, axis, normal, zero_vert, center, zero_vert_normal,
+              surface=None, tolerance=wrap_tolerance):
     """
     Wraps a face onto the surface of a cylinder by wrapping its edges.
 
@@ -118,21 +215,17 @@ def wrap_face(face, radius, axis, normal, zero_vert, center, zero_vert_normal):
     - zero_vert: The reference vertex on the cylinder.
     - center: The center point of the cylinder's base.
     - zero_vert_normal: A normal vector to the plane defined by zero_vert.
+    - surface: The cylindrical surface the edges are wrapped onto. If given,
+      generic lines are wrapped exactly as helix segments on it.
+    - tolerance: Maximum deviation used to discretize curves without an
+      exact mapping.
 
     Returns:
     - A list of Part.Shape objects representing the wrapped edges of the face.
     """
     edges = []
     for e in face.Edges:
-        if isinstance(e.Curve, (Part.Circle, Part.ArcOfCircle)):
-            poles = e.discretize(Number=50)
-            bspline = Part.BSplineCurve()
-            bspline.interpolate(poles)
-            edges.append(
-                wrap_bspline(bspline, radius, zero_vert, center, axis, zero_vert_normal)
-            )
-
-        elif isinstance(e.Curve, Part.BSplineCurve):
+        if isinstance(e.Curve, Part.BSplineCurve):
             edges.append(
                 wrap_bspline(e.Curve, radius, zero_vert, center, axis, zero_vert_normal)
             )
@@ -153,53 +246,138 @@ def wrap_face(face, radius, axis, normal, zero_vert, center, zero_vert_normal):
                 == 0.0
             ):
                 # Handling for specific geometric conditions
-                point1 = get_point_on_cylinder(
-                    zero_vert, start_point, radius, center, axis, zero_vert_normal
-                )
-                point2 = get_point_on_cylinder(
-                    zero_vert, mid_point, radius, center, axis, zero_vert_normal
-                )
-                point3 = get_point_on_cylinder(
-                    zero_vert, end_point, radius, center, axis, zero_vert_normal
+                point1, point2, point3 = get_points_on_cylinder(
+                    zero_vert, [start_point, mid_point, end_point],
+                    radius, center, axis, zero_vert_normal
                 )
                 arc = Part.Arc(point1, point2, point3)
                 edges.append(arc.toShape())
 
-            elif line_normal.dot(axis) in [1.0, -1.0]:
-                # Direct line along the axis
-                point1 = get_point_on_cylinder(
-                    zero_vert, start_point, radius, center, axis, zero_vert_normal
-                )
-                point2 = get_point_on_cylinder(
-                    zero_vert, end_point, radius, center, axis, zero_vert_normal
-                )
-                edges.append(Part.makeLine(point1, point2))
-
-            elif line_normal.dot(normal) in [1.0, -1.0]:
-                # Direct line along the normal
-                point1 = get_point_on_cylinder(
-                    zero_vert, start_point, radius, center, axis, zero_vert_normal
-                )
-                point2 = get_point_on_cylinder(
-                    zero_vert, end_point, radius, center, axis, zero_vert_normal
+            elif line_normal.dot(axis) in [1.0, -1.0] or line_normal.dot(normal) in [1.0, -1.0]:
+                # Direct line along the axis or along the normal
+                point1, point2 = get_points_on_cylinder(
+                    zero_vert, [start_point, end_point],
+                    radius, center, axis, zero_vert_normal
                 )
                 edges.append(Part.makeLine(point1, point2))
 
             else:
-                # Generic case for any other line type
-                poles = e.discretize(Number=50)
-                bspline = Part.BSplineCurve()
-                bspline.interpolate(poles, PeriodicFlag=False)
-                edges.append(
-                    wrap_bspline(
-                        bspline, radius, zero_vert, center, axis, zero_vert_normal
+                # Generic case for any other line: a helix segment
+                edge = None
+                if surface is not None:
+                    edge = wrap_line_on_surface(
+                        start_point, end_point, surface, radius,
+                        zero_vert, center, axis, zero_vert_normal
+                    )
+                if edge is None:
+                    edge = wrap_discretized(
+                        e, radius, zero_vert, center, axis, zero_vert_normal, tolerance
                     )
+                edges.append(edge)
+
+        else:
+            # circles, arcs and any other curve type
+            edges.append(
+                wrap_discretized(
+                    e, radius, zero_vert, center, axis, zero_vert_normal, tolerance
                 )
+            )
 
     return edges
 
 
-def bend_solid(sel_face, sel_edge, bend_r, thickness, neutral_radius, axis, flipped):
+def wrap_wire(wire, radius, axis, normal, zero_vert, center, zero_vert_normal, surface=None):
+    """
+    Wraps a wire onto the surface of a cylinder.
+
+    Returns:
+    - The wrapped Part.Wire.
+    """
+    wrapped_edges = wrap_face(
+        wire, radius, axis, normal, zero_vert, center, zero_vert_normal, surface
+    )
+    return Part.Wire(Part.__sortEdges__(wrapped_edges))
+
+
+def wrap_wire_worker(wire_brep, surface_brep, radius, axis, normal, zero_vert, center,
+                     zero_vert_normal):
+    """
+    Process pool version of wrap_wire. Shapes are passed as BREP strings and
+    vectors as tuples.
+    """
+    import SheetMetalParallel
+
+    wire = SheetMetalParallel.brepToShape(wire_brep).Wires[0]
+    surface = SheetMetalParallel.brepToShape(surface_brep).Faces[0].Surface
+    wrapped = wrap_wire(
+        wire, radius, FreeCAD.Vector(axis), FreeCAD.Vector(normal),
+        FreeCAD.Vector(zero_vert), FreeCAD.Vector(center),
+        FreeCAD.Vector(zero_vert_normal), surface
+    )
+    return SheetMetalParallel.shapeToBrep(wrapped)
+
+
+def wrap_wires(wires, radius, axis, normal, zero_vert, center, zero_vert_normal,
+               surface_face, parallel=False):
+    """
+    Wraps a list of wires onto the cylindrical surface of surface_face.
+    If parallel is set, the wires are wrapped in the process pool.
+    """
+    if parallel and len(wires) > 1:
+        import SheetMetalParallel
+
+        vectors = [tuple(v) for v in (axis, normal, zero_vert, center, zero_vert_normal)]
+        surface_brep = SheetMetalParallel.shapeToBrep(surface_face)
+        results = SheetMetalParallel.parallelMap(
+            wrap_wire_worker,
+            [(SheetMetalParallel.shapeToBrep(wire), surface_brep, radius, *vectors)
+             for wire in wires],
+        )
+        if results is not None:
+            return [SheetMetalParallel.brepToShape(brep).Wires[0] for brep in results]
+    return [
+        wrap_wire(wire, radius, axis, normal, zero_vert, center, zero_vert_normal,
+                  surface_face.Surface)
+        for wire in wires
+    ]
+
+
+def make_wrapped_face_by_cut(surface, wires):
+    """
+    Make a face from the outer wire and cut a face of each inner wire out of it.
+    Slow, used only if the direct face build fails.
+    """
+    OuterFace = Part.Face(surface, wires[0])
+    OuterFace.validate()
+    OuterFace.check(True) # No output = good
+    for wire in wires[1:]:
+        InnerFace = Part.Face(surface, wire)
+        InnerFace.validate()
+        InnerFace.check(True) # No output = good
+        OuterFace = OuterFace.cut(InnerFace)
+    return OuterFace
+
+
+def make_wrapped_face(surface, wires):
+    """
+    Make a face on the surface bounded by wires. The first wire is the outer one,
+    all others are holes. The face is built at once with all of its holes.
+    """
+    if len(wires) == 1:
+        return make_wrapped_face_by_cut(surface, wires)
+    try:
+        face = Part.Face(surface, wires)
+        face.validate()
+        face.check(True)  # raise exception if not valid
+        if not face.isValid() or len(face.Wires) != len(wires):
+            raise Part.OCCError("Wrapped face is not valid")
+        return face
+    except Exception:
+        return make_wrapped_face_by_cut(surface, wires)
+
+
+def bend_solid(sel_face, sel_edge, bend_r, thickness, neutral_radius, axis, flipped,
+               parallel=False):
     """
     Bends a solid along a specified axis and radius.
 
@@ -211,6 +389,7 @@ def bend_solid(sel_face, sel_edge, bend_r, thickness, neutral_radius, axis, flip
     - neutral_radius: The neutral radius of bending.
     - axis: The axis along which to bend.
     - flipped: Boolean indicating if the bend is inverted.
+    - parallel: Wrap the face wires in parallel processes.
 
     Returns:
     - A Part.Shape object representing the bent solid.
@@ -229,31 +408,15 @@ def bend_solid(sel_face, sel_edge, bend_r, thickness, neutral_radius, axis, flip
 
     face_elt = shape.Face1
 
+    # outer wire first, then all the holes
     outWire = sel_face.OuterWire
-    #Part.show(outWire, "outWire")    
-    wrap_wire = wrap_face(outWire, neutral_radius, axis, normal, zero_vert, center, zero_vert_normal)
-    edge_list = Part.__sortEdges__(wrap_wire)
-    wire = Part.Wire(edge_list)
-    #Part.show(myWire, "myWire")
-    OuterFace = Part.Face(face_elt.Surface, wire)
-    #f.check(True)
-    OuterFace.validate()
-    #Part.show(OuterFace, "OuterFace")
-    OuterFace.check(True) # No output = good
+    wires = [outWire] + [fWire for fWire in sel_face.Wires if not outWire.isEqual(fWire)]
+    wrapped_wires = wrap_wires(
+        wires, neutral_radius, axis, normal, zero_vert, center, zero_vert_normal,
+        face_elt, parallel
+    )
+    OuterFace = make_wrapped_face(face_elt.Surface, wrapped_wires)
     #Part.show(OuterFace, "OuterFace")
-    for fWire in sel_face.Wires :
-        if not outWire.isEqual(fWire) :
-            wrap_wire = wrap_face(fWire, neutral_radius, axis, normal, zero_vert, center, zero_vert_normal)
-            edge_list = Part.__sortEdges__(wrap_wire)
-            wire = Part.Wire(edge_list)
-            #Part.show(myWire, "myWire")
-            InnerFace = Part.Face(face_elt.Surface, wire)
-            #f.check(True)
-            InnerFace.validate()
-            #Part.show(InnerFace, "InnerFace")
-            InnerFace.check(True) # No output = good
-            #Part.show(InnerFace, "InnerFace")
-            OuterFace = OuterFace.cut(InnerFace)
 
     if not flipped:
         bent_solid = OuterFace.makeOffsetShape(thickness, 0.0, fill = True)
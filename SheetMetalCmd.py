@@ -558,12 +558,7 @@ def smRestrict(var, fromVal, toVal):
 
 def smModifiedFace(Face, obj):
     # find face Modified During loop
-    for face in obj.Faces:
-        face_common = face.common(Face)
-        if face_common.Faces:
-            if face.Area == face_common.Faces[0].Area:
-                break
-    return face
+    return SheetMetalTools.smModifiedFace(Face, obj)
 
 
 def LineAngle(edge1, edge2):
@@ -827,10 +822,9 @@ def smEdge(selFaceName, MainObject):
     return seledge, selFace, thk, revAxisV, thkDir
 
 
-def getBendetail(selItemNames, MainObject, bendR, bendA, isflipped, offset, gap1, gap2):
-    mainlist = []
-    edgelist = []
-    nogap_edgelist = []
+def getBendEdgeDetail(selItemNames, MainObject):
+    # analysis of the selected edges that depends only on the base shape
+    detaillist = []
     for selItemName in selItemNames:
         lenEdge, selFace, thk, revAxisV, thkDir = smEdge(selItemName, MainObject)
 
@@ -853,13 +847,53 @@ def getBendetail(selItemNames, MainObject, bendR, bendA, isflipped, offset, gap1
         if (thkDir.cross(revAxisV).normalize() - FaceDir).Length < smEpsilon:
             revAxisV = revAxisV * -1
 
+        isEdge = type(MainObject.getElement(
+            SheetMetalTools.getElementFromTNP(selItemName))) == Part.Edge
+        detaillist.append([Cface, selFace, thk, lenEdge, revAxisV, thkDir, FaceDir, isEdge])
+    return detaillist
+
+
+def getBendTrimEdges(detaillist, offset, gap1, gap2):
+    # produce the trimmed length edges of the walls
+    edgelist = []
+    nogap_edgelist = []
+    for Cface, selFace, _thk, lenEdge, _revAxisV, _thkDir, FaceDir, _isEdge in detaillist:
+        if offset < 0.0:
+            dist = lenEdge.valueAt(lenEdge.FirstParameter).distanceToPlane(
+                FreeCAD.Vector(0, 0, 0), FaceDir
+            )
+            # print(dist)
+            slice_wire = Cface.slice(FaceDir, dist + offset)
+            # print(slice_wire)
+            trimLenEdge = slice_wire[0].Edges[0]
+        else:
+            # Produce Offset Edge
+            trimLenEdge = lenEdge.copy()
+            trimLenEdge.translate(selFace.normalAt(0, 0) * offset)
+        # Part.show(trimLenEdge,'trimLenEdge1')
+        nogap_edgelist.append(trimLenEdge)
+        trimLenEdge = LineExtend(trimLenEdge, -gap1, -gap2)
+        # Part.show(trimLenEdge,'trimLenEdge2')
+        edgelist.append(trimLenEdge)
+    trimedgelist = InsideEdge(edgelist)
+    nogaptrimedgelist = InsideEdge(nogap_edgelist)
+    return trimedgelist, nogaptrimedgelist
+
+
+def getBendetail(selItemNames, MainObject, bendR, bendA, isflipped, offset, gap1, gap2,
+                 detaillist=None, trimEdges=None):
+    # detaillist and trimEdges can be given if already calculated for the same base shape
+    if detaillist is None:
+        detaillist = getBendEdgeDetail(selItemNames, MainObject)
+    mainlist = []
+    for Cface, selFace, thk, lenEdge, revAxisV, thkDir, FaceDir, isEdge in detaillist:
         flipped = isflipped
         # restrict angle
         if bendA < 0:
             bendA = -bendA
             flipped = not flipped
 
-        if type(MainObject.getElement(SheetMetalTools.getElementFromTNP(selItemName))) == Part.Edge:
+        if isEdge:
             flipped = not flipped
 
         if not (flipped):
@@ -882,26 +916,10 @@ def getBendetail(selItemNames, MainObject, bendR, bendA, isflipped, offset, gap1
                 flipped,
             ]
         )
-        if offset < 0.0:
-            dist = lenEdge.valueAt(lenEdge.FirstParameter).distanceToPlane(
-                FreeCAD.Vector(0, 0, 0), FaceDir
-            )
-            # print(dist)
-            slice_wire = Cface.slice(FaceDir, dist + offset)
-            # print(slice_wire)
-            trimLenEdge = slice_wire[0].Edges[0]
-        else:
-            # Produce Offset Edge
-            trimLenEdge = lenEdge.copy()
-            trimLenEdge.translate(selFace.normalAt(0, 0) * offset)
-        # Part.show(trimLenEdge,'trimLenEdge1')
-        nogap_edgelist.append(trimLenEdge)
-        trimLenEdge = LineExtend(trimLenEdge, -gap1, -gap2)
-        # Part.show(trimLenEdge,'trimLenEdge2')
-        edgelist.append(trimLenEdge)
     # print(mainlist)
-    trimedgelist = InsideEdge(edgelist)
-    nogaptrimedgelist = InsideEdge(nogap_edgelist)
+    if trimEdges is None:
+        trimEdges = getBendTrimEdges(detaillist, offset, gap1, gap2)
+    trimedgelist, nogaptrimedgelist = trimEdges
     return mainlist, trimedgelist, nogaptrimedgelist
 
 
@@ -1249,7 +1267,11 @@ def smBend(
     PerforationInitialLength=5.0,
     PerforationMaxLength=5.0,
     NonperforationMaxLength=5.0,
+    analysisCache=None,
 ):
+    # analysisCache is an optional SheetMetalTools.SMShapeCache that is valid for
+    # MainObject. It is used to reuse the edge analysis on parameter only changes
+
     # if sketch is as wall
     sketches = False
     if sketch:
@@ -1289,8 +1311,19 @@ def smBend(
 
     nogaptrimedgelist = []
     if not (sketches):
+        bendDetail, trimEdges = None, None
+        if analysisCache is not None:
+            bendDetail = analysisCache.get(
+                "bendDetail", lambda: getBendEdgeDetail(selFaceNames, MainObject)
+            )
+            trimEdges = analysisCache.get(
+                "trimEdges",
+                lambda: getBendTrimEdges(bendDetail, offset, gap1, gap2),
+                (offset, gap1, gap2),
+            )
         mainlist, trimedgelist, nogaptrimedgelist = getBendetail(
-            selFaceNames, MainObject, bendR, bendA, flipped, offset, gap1, gap2
+            selFaceNames, MainObject, bendR, bendA, flipped, offset, gap1, gap2,
+            bendDetail, trimEdges
         )
         (
             miterA1List,
@@ -2032,9 +2065,14 @@ class SMBendWall:
         # print face
 
         # pass selected object shape
-        Main_Object = fp.baseObject[0].Shape.copy()
+        # analysis of the base object is cached, so parameter only changes
+        # will skip it and rebuild just the walls
+        baseShape = fp.baseObject[0].Shape
         face = fp.baseObject[1]
-        thk, thkDir = sheet_thk(Main_Object, face[0])
+        cache = SheetMetalTools.smGetRecomputeCache(self)
+        cache.validate((SheetMetalTools.smGetShapeFingerprint(baseShape), tuple(face)))
+        Main_Object = cache.get("baseShape", baseShape.copy)
+        thk, thkDir = cache.get("thickness", lambda: sheet_thk(Main_Object, face[0]))
 
         if fp.Sketch:
             WireList = fp.Sketch.Shape.Wires[0]
@@ -2068,7 +2106,8 @@ class SMBendWall:
         if fp.AngleFaceReference is not None:
             smObj, smSelItemName = fp.baseObject
             smSelItemName = smSelItemName[0]
-            smFace, refEdge, thkFace = GetSMComparisonFace(smObj,smSelItemName) # Get the sheet metal reference face
+            smFace, refEdge, thkFace = cache.get("comparisonFace",
+                lambda: GetSMComparisonFace(smObj,smSelItemName)) # Get the sheet metal reference face
             refObj, refFace = fp.AngleFaceReference
 
             if "Plane" in refObj.TypeId:
@@ -2078,7 +2117,9 @@ class SMBendWall:
                 refFace = refObj.Shape.getElement(refFace)
 
             # Angle calculation
-            angleParFace = relatAngleCalc(thkFace,refEdge,refFace,smFace)
+            angleParFace = cache.get("refAngle",
+                lambda: relatAngleCalc(thkFace,refEdge,refFace,smFace),
+                SheetMetalTools.smGetShapeFingerprint(refFace))
 
 
             angle = angleParFace + fp.RelativeAngleToRef.Value
@@ -2095,7 +2136,8 @@ class SMBendWall:
         if fp.BendType == "Offset" and fp.OffsetFaceReference is not None:
             smObj, smSelItemName = fp.baseObject
             smSelItemName = smSelItemName[0]
-            smFace, refEdge, thkFace = GetSMComparisonFace(smObj,smSelItemName) # Get the sheet metal reference face and edge
+            smFace, refEdge, thkFace = cache.get("comparisonFace",
+                lambda: GetSMComparisonFace(smObj,smSelItemName)) # Get the sheet metal reference face and edge
             refObj, refFace = fp.OffsetFaceReference
 
             if "Plane" in refObj.TypeId:
@@ -2103,9 +2145,11 @@ class SMBendWall:
             else:
                 refFace = refFace[0]
                 refFace = refObj.Shape.getElement(refFace)
+            refFaceKey = SheetMetalTools.smGetShapeFingerprint(refFace)
             
             # Angle calculation
-            angleParFace = relatAngleCalc(thkFace,refEdge,refFace,smFace)
+            angleParFace = cache.get("refOffsetAngle",
+                lambda: relatAngleCalc(thkFace,refEdge,refFace,smFace), refFaceKey)
             
             if fp.invert:
                 angleParFace = 180 - angleParFace
@@ -2144,8 +2188,11 @@ class SMBendWall:
 
                 distWall = distWall + distInvertComp
 
-            offsetValue = offsetFaceDistance(smFace, refFace, refEdge, thkFace) - distWall
+            offsetValue = cache.get("refOffsetDistance",
+                lambda: offsetFaceDistance(smFace, refFace, refEdge, thkFace), refFaceKey) - distWall
 
+        # reliefs, perforations and auto-miter are skipped in preview mode
+        preview = SheetMetalTools.smIsPreview(fp)
         for i, Length in enumerate(LengthList):
             s, f = smBend(
                 thk,
@@ -2160,27 +2207,28 @@ class SMBendWall:
                 reliefType=fp.reliefType,
                 gap1=gap1_list[i],
                 gap2=gap2_list[i],
-                reliefW=fp.reliefw.Value,
-                reliefD=fp.reliefd.Value,
+                reliefW=0.0 if preview else fp.reliefw.Value,
+                reliefD=0.0 if preview else fp.reliefd.Value,
                 minReliefgap=fp.minReliefGap.Value,
                 extend1=extend1_list[i],
                 extend2=extend2_list[i],
                 kfactor=fp.kfactor,
                 offset=offsetValue,
                 ReliefFactor=fp.ReliefFactor,
-                UseReliefFactor=fp.UseReliefFactor,
-                automiter=fp.AutoMiter,
+                UseReliefFactor=fp.UseReliefFactor and not preview,
+                automiter=fp.AutoMiter and not preview,
                 selFaceNames=face,
                 MainObject=Main_Object,
                 sketch=fp.Sketch,
                 mingap=fp.minGap.Value,
                 maxExtendGap=fp.maxExtendDist.Value,
                 LengthSpec=fp.LengthSpec,
-                Perforate=fp.Perforate,
+                Perforate=fp.Perforate and not preview,
                 PerforationAngle=fp.PerforationAngle.Value,
                 PerforationInitialLength=fp.PerforationInitialLength.Value,
                 PerforationMaxLength=fp.PerforationMaxLength.Value,
                 NonperforationMaxLength=fp.NonperforationMaxLength.Value,
+                analysisCache=cache if i == 0 else None,
             )
             faces = smGetFace(f, s)
             face = faces
@@ -2196,6 +2244,7 @@ class SMBendWall:
 if SheetMetalTools.isGuiLoaded():
     import os
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
     smEpsilon = SheetMetalTools.smEpsilon
@@ -2350,19 +2399,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Wall command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddWall.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Make Wall"),
-                "Accel": "W",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Extends one or more face, connected by a bend on existing sheet metal.\n"
-                    "1. Select edges to create bends with walls.\n"
-                    "2. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddWall")
 
         def Activated(self):
             doc = FreeCAD.ActiveDocument
@@ -2462,4 +2499,4 @@ if SheetMetalTools.isGuiLoaded():
             if not False in geomTest and geomTest != None:
                 return True
 
-    Gui.addCommand("SheetMetal_AddWall", AddWallCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddWall", AddWallCommandClass())
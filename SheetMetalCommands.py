@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  SheetMetalCommands.py
+#
+#  Copyright 2025 Shai Seger <shaise at gmail dot com>
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+###################################################################################
+
+# Lazy registration of the workbench commands.
+# The commands are registered with light proxies, the module implementing a command
+# is imported only when the command is first activated. Command resources are kept
+# here so the toolbar and menus can be built without importing the command modules.
+# This module must stay light, do not import any command module at the top level.
+
+import os
+import importlib
+import FreeCAD
+import SheetMetalTools
+
+translate = FreeCAD.Qt.translate
+
+icons_path = SheetMetalTools.icons_path
+
+# command name: module implementing the command
+smCommandModules = {
+    "SheetMetal_AddBase": "SheetMetalBaseCmd",
+    "SheetMetal_AddWall": "SheetMetalCmd",
+    "SheetMetal_Extrude": "SheetMetalExtendCmd",
+    "SheetMetal_AddFoldWall": "SheetMetalFoldCmd",
+    "SheetMetal_Unfold": "SheetMetalUnfoldCmd",
+    "SheetMetal_UnattendedUnfold": "SheetMetalUnfoldCmd",
+    "SheetMetal_UnfoldUpdate": "SheetMetalUnfoldCmd",
+    "SheetMetal_BatchExport": "SheetMetalUnfoldCmd",
+    "SheetMetal_AddCornerRelief": "SheetMetalCornerReliefCmd",
+    "SheetMetal_AddRelief": "SheetMetalRelief",
+    "SheetMetal_AddJunction": "SheetMetalJunction",
+    "SheetMetal_AddBend": "SheetMetalBend",
+    "SheetMetal_SketchOnSheet": "SketchOnSheetMetalCmd",
+    "SheetMetal_AddCutout": "ExtrudedCutout",
+    "SheetMetal_Forming": "SheetMetalFormingCmd",
+    "SheetMetal_BaseShape": "SheetMetalBaseShapeCmd",
+}
+
+
+def smGetCommandResources(name):
+    ''' Resources (icon, menu text, shortcut and tooltip) of a workbench command '''
+    if name == "SheetMetal_AddBase":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddBase.svg"),
+            "MenuText": translate("SheetMetal", "Make Base Wall"),
+            "Accel": "C, B",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Create a sheetmetal wall from a sketch\n"
+                "1. Select a Sketch to create bends with walls.\n"
+                "2. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_AddWall":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddWall.svg"),
+            "MenuText": translate("SheetMetal", "Make Wall"),
+            "Accel": "W",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Extends one or more face, connected by a bend on existing sheet metal.\n"
+                "1. Select edges to create bends with walls.\n"
+                "2. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_Extrude":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_Extrude.svg"),
+            "MenuText": translate("SheetMetal", "Extend Face"),
+            "Accel": "E",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Extends one or more face, on existing sheet metal.\n"
+                "1. Select edges or thickness side faces to create walls.\n"
+                "2. Select a sketch in property editor to create tabs. \n"
+                "3. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_AddFoldWall":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddFoldWall.svg"),
+            "MenuText": translate("SheetMetal", "Fold a Wall"),
+            "Accel": "C, F",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Fold a wall of metal sheet\n"
+                "1. Select a flat face on sheet metal and\n"
+                "2. Select a bend line (sketch) on same face (ends of sketch bend lines must"
+                " extend beyond edges of face) to create sheetmetal fold.\n"
+                "   A sketch with several bend lines folds all of them at once.\n"
+                "3. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_Unfold":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_Unfold.svg"),
+            "MenuText": translate("SheetMetal", "Unfold"),
+            "Accel": "U",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Flatten folded sheet metal object.\n"
+                "1. Select flat face on sheetmetal shape.\n"
+                "2. Change parameters from task Panel to create unfold Shape & Flatten drawing.",
+            ),
+        }
+    if name == "SheetMetal_UnattendedUnfold":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_UnfoldUnattended.svg"),
+            "MenuText": translate("SheetMetal", "Unattended Unfold"),
+            "Accel": "U",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Flatten folded sheet metal object with default options\n"
+                "1. Select flat face on sheetmetal shape.\n"
+                "2. Click this command to unfold the object with last used parameters.",
+            ),
+        }
+    if name == "SheetMetal_UnfoldUpdate":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_UnfoldUpdate.svg"),
+            "MenuText": translate("SheetMetal", "Unfold Update"),
+            "Accel": "UU",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Update all unfold objects.\n"
+            ),
+        }
+    if name == "SheetMetal_BatchExport":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_UnfoldExport.svg"),
+            "MenuText": translate("SheetMetal", "Export Flat Patterns"),
+            "ToolTip": translate(
+                "SheetMetal",
+                "Export the flat patterns of the unfold objects to DXF or SVG files.\n"
+                "1. Select the unfold objects to export, or nothing to export all of them.\n"
+                "2. Choose the file format and the destination folder.",
+            ),
+        }
+    if name == "SheetMetal_AddCornerRelief":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddCornerRelief.svg"),
+            "MenuText": translate("SheetMetal", "Add Corner Relief"),
+            "Accel": "C, R",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Corner Relief to metal sheet corner.\n"
+                "1. Select 2 Edges (on flat face that shared with bend faces) to create Relief on sheetmetal.\n"
+                "2. Use Property editor to modify default parameters",
+            ),
+        }
+    if name == "SheetMetal_AddRelief":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddRelief.svg"),
+            "MenuText": translate("SheetMetal", "Make Relief"),
+            "Accel": "S, R",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Modify an Individual solid corner to create Relief.\n"
+                "1. Select Vertex(es) to create Relief on Solid corner Vertex(es).\n"
+                "2. Use Property editor to modify default parameters",
+            ),
+        }
+    if name == "SheetMetal_AddJunction":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddJunction.svg"),
+            "MenuText": translate("SheetMetal", "Make Junction"),
+            "Accel": "S, J",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Create a rip where two walls come together on solids.\n"
+                "1. Select edge(s) to create rip on corner edge(s).\n"
+                "2. Use Property editor to modify parameters",
+            ),
+        }
+    if name == "SheetMetal_AddBend":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddBend.svg"),
+            "MenuText": translate("SheetMetal", "Make Bend"),
+            "Accel": "S, B",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Create Bend where two walls come together on solids\n"
+                "1. Select edge(s) to create bend on corner edge(s).\n"
+                "2. Use Property editor to modify parameters",
+            ),
+        }
+    if name == "SheetMetal_SketchOnSheet":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_SketchOnSheet.svg"),
+            "MenuText": translate("SheetMetal", "Wrap Cutout"),
+            "Accel": "M, S",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Wrap cutout from a Sketch On Sheet metal faces\n"
+                "1. Select a flat face on sheet metal and\n"
+                "2. Select a sketch on same face to create sheetmetal wrapped cut.\n"
+                "3. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_AddCutout":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddCutout.svg"),
+            "MenuText": translate("SheetMetal", "Extruded Cutout"),
+            "Accel": "E, C",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Extruded cutout from sketch extrusion\n"
+                "1. Select a face of the sheet metal part (must not be the thickness face) and\n"
+                "2. Select a sketch for the extruded cut (the sketch must be closed).\n"
+                "3. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_Forming":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_Forming.svg"),
+            "MenuText": translate("SheetMetal", "Make Forming in Wall"),
+            "Accel": "M, F",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Make a forming using tool in metal sheet\n"
+                "1. Select a flat face on sheet metal and\n"
+                "2. Select face(s) on forming tool Shape to create Formed sheetmetal.\n"
+                "3. Use Suppress in Property editor to disable during unfolding\n"
+                "4. Use Property editor to modify other parameters",
+            ),
+        }
+    if name == "SheetMetal_BaseShape":
+        return {
+            "Pixmap": os.path.join(icons_path, "SheetMetal_AddBaseShape.svg"),
+            "MenuText": translate("SheetMetal", "Add base shape"),
+            "Accel": "H",
+            "ToolTip": translate(
+                "SheetMetal",
+                "Add basic sheet metal object."
+            ),
+        }
+    return {}
+
+
+class SMLazyCommand:
+    ''' Command proxy, the real command is created on first use '''
+    def __init__(self, name):
+        self.name = name
+        self.command = None
+
+    def load(self):
+        if self.command is None:
+            # the module registers the real command with smAddCommand when imported
+            importlib.import_module(smCommandModules[self.name])
+            if self.command is None:
+                raise RuntimeError(f"Command {self.name} was not found")
+        return self.command
+
+    def GetResources(self):
+        return smGetCommandResources(self.name)
+
+    def Activated(self):
+        command = self.load()
+        # IsActive was only approximated before the command was loaded
+        if not command.IsActive():
+            return
+        command.Activated()
+
+    def IsActive(self):
+        if self.command is not None:
+            return self.command.IsActive()
+        if self.name == "SheetMetal_UnfoldUpdate":
+            return len(SheetMetalTools.smObjectsToRecompute) > 0
+        return FreeCAD.ActiveDocument is not None
+
+
+smLazyCommands = {}
+
+
+def smRegisterCommands():
+    ''' Register all the workbench commands without importing their modules '''
+    from FreeCAD import Gui
+    for name in smCommandModules:
+        if name not in smLazyCommands:
+            smLazyCommands[name] = SMLazyCommand(name)
+            Gui.addCommand(name, smLazyCommands[name])
+
+
+def smAddCommand(name, command):
+    ''' Register a command. Used by the command modules instead of Gui.addCommand, so
+        if the command was already registered lazily the proxy forwards to it '''
+    lazyCommand = smLazyCommands.get(name)
+    if lazyCommand is not None:
+        lazyCommand.command = command
+        return
+    from FreeCAD import Gui
+    Gui.addCommand(name, command)
+
@@ -28,7 +28,7 @@ import os
 import FreeCAD
 import Part
 import SheetMetalTools
-import SheetMetalBendSolid
+import SheetMetalProfileMap
 
 smEpsilon = SheetMetalTools.smEpsilon
 
@@ -53,35 +53,6 @@ def makeSketch(relieftype, size, ratio, cent, normal, addvector):
     # Part.show(sketch,'sketch')
     return sketch
 
-def bendAngle(theFace, edge_vec):
-    # Start to investigate the angles at self.__Shape.Faces[face_idx].ParameterRange[0]
-    # Part.show(theFace,"theFace")
-    # valuelist =  theFace.ParameterRange
-    # print(valuelist)
-    angle_0 = theFace.ParameterRange[0]
-    angle_1 = theFace.ParameterRange[1]
-
-    # idea: identify the angle at edge_vec = P_edge.Vertexes[0].copy().Point
-    # This will be = angle_start
-    # calculate the tan_vec from valueAt
-    edgeAngle, edgePar = theFace.Surface.parameter(edge_vec)
-    # print('the angles: ', angle_0, ' ', angle_1, ' ', edgeAngle, ' ', edgeAngle - 2*math.pi)
-
-    if SheetMetalTools.smIsEqualAngle(angle_0, edgeAngle):
-        angle_start = angle_0
-        angle_end = angle_1
-    else:
-        angle_start = angle_1
-        angle_end = angle_0
-    bend_angle = angle_end - angle_start
-    #  angle_tan = angle_start + bend_angle/6.0 # need to have the angle_tan before correcting the sign
-
-    if bend_angle < 0.0:
-        bend_angle = -bend_angle
-    # print(math.degrees(bend_angle))
-    return math.degrees(bend_angle)
-
-
 def getCornerPoint(edge1, edge2):
     pt1 = edge1.valueAt(edge1.FirstParameter)
     pt2 = edge1.valueAt(edge1.LastParameter)
@@ -109,10 +80,10 @@ def LineExtend(edge, distance):
     return ExtLine
 
 
-def getBendDetail(obj, edge1, edge2, kfactor):
+def getBendDetail(profileMap, edge1, edge2, kfactor):
     import BOPTools.JoinFeatures
     # To get adjacent face list from edges
-    facelist1 = obj.ancestorsOfType(edge1, Part.Face)
+    facelist1 = profileMap.facesOfEdge(edge1)
     #  facelist2 = obj.ancestorsOfType(edge2, Part.Face)
     cornerPoint = getCornerPoint(edge1, edge2)
 
@@ -135,16 +106,13 @@ def getBendDetail(obj, edge1, edge2, kfactor):
             break
     # To get thk of sheet, top face normal, bend angle
     #  normal = largeface.normalAt(0,0)
-    thk = SheetMetalTools.smGetThickness(obj, largeface)
-    bendA = bendAngle(cylface, cornerPoint)
+    thk = profileMap.getThickness(largeface)
+    bendA = SheetMetalProfileMap.bendAngle(cylface, cornerPoint)
     # print([thk, bendA])
 
     # To check bend direction
-    offsetface = cylface.makeOffsetShape(-thk, 0.0, fill=False)
-    # Part.show(offsetface,"offsetface")
-    if offsetface.Area < cylface.Area:
+    if SheetMetalProfileMap.isOuterBendFace(cylface):
         bendR = cylface.Surface.Radius - thk
-    #    size = size + thk
     else:
         bendR = cylface.Surface.Radius
     # To arrive unfold Length, neutralRadius
@@ -198,12 +166,13 @@ def smCornerR(
 ):
 
     import BOPTools.SplitAPI
-    resultSolid = MainObject.Shape.copy()
+    profileMap = SheetMetalProfileMap.smGetProfileMap(MainObject.Shape)
+    resultSolid = profileMap.shape
     REdgelist = []
     for selEdgeName in selEdgeNames:
         REdge = resultSolid.getElement(SheetMetalTools.getElementFromTNP(selEdgeName))
         REdgelist.append(REdge)
-    DetailList = getBendDetail(resultSolid, REdgelist[0], REdgelist[1], kfactor)
+    DetailList = getBendDetail(profileMap, REdgelist[0], REdgelist[1], kfactor)
     cornerPoint, centerPoint, LargeFace, thk, unfoldLength, neutralRadius = DetailList
     normal = LargeFace.normalAt(0, 0)
 
@@ -226,7 +195,7 @@ def smCornerR(
     else:
         if sketch is None:
             FreeCAD.Console.PrintError("Sketch object is missing, please select one\n")
-            return resultSolid
+            return resultSolid.copy()
         reliefFace = Part.Face(sketch.Shape.Wires[0]).translate(FreeCAD.Vector(xoffset, yoffset, 0))
     # Part.show(reliefFace,'reliefFace')
 
@@ -252,128 +221,14 @@ def smCornerR(
         Flatsolid = First_face.extrude(normal * -thk)
         # Part.show(Flatsolid,"Flatsolid")
         solidlist.append(Flatsolid)
-    if SplitFaces.Faces:
-        for BalanceFace in SplitFaces.Faces:
-            # Part.show(BalanceFace,"BalanceFace")
-            TopFace = LargeFace
-            # Part.show(TopFace,"TopFace")
-            while BalanceFace.Faces:
-                BendEdgelist = SheetMetalTools.smGetAllIntersectingEdges(BalanceFace, TopFace)
-                for BendEdge in BendEdgelist:
-                    # Part.show(BendEdge,"BendEdge")
-                    edge_facelist = resultSolid.ancestorsOfType(BendEdge, Part.Face)
-                    for cyl_face in edge_facelist:
-                        # print(type(cyl_face.Surface))
-                        if issubclass(type(cyl_face.Surface), Part.Cylinder):
-                            break
-                    if issubclass(type(cyl_face.Surface), Part.Cylinder):
-                        break
-                # Part.show(BendEdge,"BendEdge")
-                facelist = resultSolid.ancestorsOfType(BendEdge, Part.Face)
-
-                # To get bend radius, bend angle
-                for cylface in facelist:
-                    if issubclass(type(cylface.Surface), Part.Cylinder):
-                        break
-                if not (issubclass(type(cylface.Surface), Part.Cylinder)):
-                    break
-                # Part.show(cylface,"cylface")
-                for planeface in facelist:
-                    if issubclass(type(planeface.Surface), Part.Plane):
-                        break
-                # Part.show(planeface,"planeface")
-                normal = planeface.normalAt(0, 0)
-                revAxisV = cylface.Surface.Axis
-                revAxisP = cylface.Surface.Center
-                bendA = bendAngle(cylface, revAxisP)
-                # print([bendA, revAxisV, revAxisP, cylface.Orientation])
-
-                # To check bend direction
-                offsetface = cylface.makeOffsetShape(-thk, 0.0, fill=False)
-                # Part.show(offsetface,"offsetface")
-                if offsetface.Area < cylface.Area:
-                    bendR = cylface.Surface.Radius - thk
-                    flipped = True
-                else:
-                    bendR = cylface.Surface.Radius
-                    flipped = False
-                # To arrive unfold Length, neutralRadius
-                unfoldLength = (bendR + kfactor * thk) * abs(bendA) * math.pi / 180.0
-                neutralRadius = bendR + kfactor * thk
-                # print([unfoldLength,neutralRadius])
-
-                # To get faceNormal, bend face
-                faceNormal = normal.cross(revAxisV).normalize()
-                # print(faceNormal)
-                if bendR < cylface.Surface.Radius:
-                    offsetSolid = cylface.makeOffsetShape(bendR / 2.0, 0.0, fill=True)
-                else:
-                    offsetSolid = cylface.makeOffsetShape(-bendR / 2.0, 0.0, fill=True)
-                # Part.show(offsetSolid,"offsetSolid")
-                tool = BendEdge.copy()
-                FaceArea = tool.extrude(faceNormal * -unfoldLength)
-                # Part.show(FaceArea,"FaceArea")
-                # Part.show(BalanceFace,"BalanceFace")
-                SolidFace = offsetSolid.common(FaceArea)
-                if not (SolidFace.Faces):
-                    faceNormal = faceNormal * -1
-                    FaceArea = tool.extrude(faceNormal * -unfoldLength)
-                BendSolidFace = BalanceFace.common(FaceArea)
-                # Part.show(FaceArea,"FaceArea")
-                # Part.show(BendSolidFace,"BendSolidFace")
-                # print([bendR, bendA, revAxisV, revAxisP, normal, flipped, BendSolidFace.Faces[0].normalAt(0,0)])
-
-                bendsolid = SheetMetalBendSolid.bend_solid(
-                    BendSolidFace.Faces[0],
-                    BendEdge,
-                    bendR,
-                    thk,
-                    neutralRadius,
-                    revAxisV,
-                    flipped,
-                )
-                # Part.show(bendsolid,"bendsolid")
-                solidlist.append(bendsolid)
-
-                if flipped == True:
-                    bendA = -bendA
-                if not (SolidFace.Faces):
-                    revAxisV = revAxisV * -1
-                sketch_face = BalanceFace.cut(BendSolidFace)
-                sketch_face.translate(faceNormal * unfoldLength)
-                # Part.show(sketch_face,"sketch_face")
-                sketch_face.rotate(revAxisP, -revAxisV, bendA)
-                # Part.show(sketch_face,"Rsketch_face")
-                CylEdge = SheetMetalTools.smGetIntersectingEdge(sketch_face, cylface)
-                # Part.show(CylEdge,"CylEdge")
-                edgefacelist = resultSolid.ancestorsOfType(CylEdge, Part.Face)
-                for TopFace in edgefacelist:
-                    if not (issubclass(type(TopFace.Surface), Part.Cylinder)):
-                        break
-                # Part.show(TopFace,"TopFace")
-
-                # To get top face normal, flatsolid
-                normal = TopFace.normalAt(0, 0)
-                Flatface = sketch_face.common(TopFace)
-                BalanceFace = sketch_face.cut(Flatface)
-                # Part.show(BalanceFace,"BalanceFace")
-                if Flatface.Faces:
-                    BalanceFace = sketch_face.cut(Flatface)
-                    # Part.show(BalanceFace,"BalanceFace")
-                    Flatsolid = Flatface.extrude(normal * -thk)
-                    # Part.show(Flatsolid,"Flatsolid")
-                    solidlist.append(Flatsolid)
-                else:
-                    BalanceFace = sketch_face
+    # Follow the relief across the bends
+    for BalanceFace in SplitFaces.Faces:
+        solidlist += profileMap.mapProfile(BalanceFace, LargeFace, thk, kfactor)
     # To get relief Solid fused
-    if len(solidlist) > 1:
-        SMSolid = solidlist[0].multiFuse(solidlist[1:])
-        # Part.show(SMSolid,"SMSolid")
-        SMSolid = SMSolid.removeSplitter()
-    else:
-        SMSolid = solidlist[0]
+    SMSolid = SheetMetalProfileMap.smFuseProfileSolids(solidlist)
     # Part.show(SMSolid,"SMSolid")
-    resultSolid = resultSolid.cut(SMSolid)
+    if SMSolid is not None:
+        resultSolid = resultSolid.cut(SMSolid)
     return resultSolid
 
 
@@ -443,6 +298,7 @@ class SMCornerRelief:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
     icons_path = SheetMetalTools.icons_path
 
     # add translations path
@@ -541,19 +397,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Corner Relief command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddCornerRelief.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Add Corner Relief"),
-                "Accel": "C, R",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Corner Relief to metal sheet corner.\n"
-                    "1. Select 2 Edges (on flat face that shared with bend faces) to create Relief on sheetmetal.\n"
-                    "2. Use Property editor to modify default parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddCornerRelief")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -579,4 +423,4 @@ if SheetMetalTools.isGuiLoaded():
             return True
 
 
-    Gui.addCommand("SheetMetal_AddCornerRelief", AddCornerReliefCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddCornerRelief", AddCornerReliefCommandClass())
@@ -354,7 +354,7 @@ class SMExtrudeWall:
             gap2=fp.gap2.Value,
             subtraction=fp.UseSubtraction,
             offset=fp.Offset.Value,
-            refine=fp.Refine,
+            refine=fp.Refine and not SheetMetalTools.smIsPreview(fp),
             sketch=fp.Sketch,
             selFaceNames=face,
             selObject=Main_Object,
@@ -368,6 +368,7 @@ class SMExtrudeWall:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
     from PySide import QtCore, QtGui
 
     icons_path = SheetMetalTools.icons_path
@@ -417,20 +418,7 @@ if SheetMetalTools.isGuiLoaded():
         """Extrude face"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_Extrude.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Extend Face"),
-                "Accel": "E",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Extends one or more face, on existing sheet metal.\n"
-                    "1. Select edges or thickness side faces to create walls.\n"
-                    "2. Select a sketch in property editor to create tabs. \n"
-                    "3. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_Extrude")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -457,4 +445,4 @@ if SheetMetalTools.isGuiLoaded():
                     return False
             return True
 
-    Gui.addCommand("SheetMetal_Extrude", SMExtrudeCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_Extrude", SMExtrudeCommandClass())
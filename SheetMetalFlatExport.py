@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  SheetMetalFlatExport.py
+#
+#  Copyright 2025 Shai Seger <shaise at gmail dot com>
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+###################################################################################
+
+# Conversion of flat patterns to DXF and SVG files, without going through sketches.
+# The flat pattern is first converted to plain python primitives, per layer:
+#   ("line", (x1, y1), (x2, y2))
+#   ("circle", (cx, cy), r)
+#   ("arc", (cx, cy), r, startAngle, endAngle)  counter clockwise, in degrees
+#   ("polyline", [(x, y), ...])
+# so the conversion can run in a worker process and the results can be written by
+# the main process. This module is imported by the worker processes, so it must not
+# import any FreeCAD gui module.
+
+import math
+import re
+
+eps = 1e-6
+
+# layer name: (DXF color index, SVG color)
+smFlatLayers = {
+    "Outline": (5, "#000080"),
+    "Inner": (6, "#ff5733"),
+    "Holes": (6, "#ff5733"),
+    "Bends": (1, "#c00000"),
+}
+
+
+def getFlatPatternPrimitives(selectedFace, unfoldedShape, bendLines, rootNormal):
+    ''' Flat pattern layers of a V2 unfold result, aligned to the XY plane origin the same
+        way as the unfold sketches. Returns ({layer: [primitives]}, (width, height)) '''
+    import Part
+    from SheetMetalNewUnfolder import SketchExtraction
+    profile, innerWires, holeWires = SketchExtraction.extract_manually(
+        unfoldedShape, rootNormal)
+    align = SketchExtraction.move_to_origin(profile, selectedFace)
+    layers = {"Outline": profile.transformed(align).Edges}
+    if innerWires:
+        layers["Inner"] = Part.makeCompound(innerWires).transformed(align).Edges
+    if holeWires:
+        layers["Holes"] = Part.makeCompound(holeWires).transformed(align).Edges
+    if bendLines and bendLines.Edges:
+        layers["Bends"] = bendLines.transformed(align).Edges
+    box = Part.makeCompound([edge for edges in layers.values() for edge in edges]).BoundBox
+    primitives = {name: [p for p in map(edgeToPrimitive, edges) if p is not None]
+                  for name, edges in layers.items()}
+    return primitives, (box.XMax, box.YMax)
+
+
+def _angle(center, point):
+    return math.degrees(math.atan2(point.y - center.y, point.x - center.x)) % 360.0
+
+
+def edgeToPrimitive(edge):
+    start = edge.firstVertex().Point
+    end = edge.lastVertex().Point
+    curveType = edge.Curve.TypeId
+    if curveType == "Part::GeomLine":
+        if start.distanceToPoint(end) < eps:
+            return None
+        return ("line", (start.x, start.y), (end.x, end.y))
+    if curveType == "Part::GeomCircle":
+        center = edge.Curve.Center
+        radius = edge.Curve.Radius
+        if start.distanceToPoint(end) < eps:
+            return ("circle", (center.x, center.y), radius)
+        pmin, pmax = edge.ParameterRange
+        mid = edge.valueAt(pmin + 0.5 * (pmax - pmin))
+        a1, a2, am = _angle(center, start), _angle(center, end), _angle(center, mid)
+        if (am - a1) % 360.0 > (a2 - a1) % 360.0:
+            a1, a2 = a2, a1  # clockwise edge
+        return ("arc", (center.x, center.y), radius, a1, a2)
+    points = edge.discretize(Deflection=0.01)
+    return ("polyline", [(p.x, p.y) for p in points])
+
+
+def _layerName(prefix, layer):
+    if not prefix:
+        return layer
+    return re.sub(r"[^A-Za-z0-9_\-]", "_", f"{prefix}_{layer}")
+
+
+def _arcPoint(center, radius, angle):
+    angle = math.radians(angle)
+    return (center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle))
+
+
+##########################################################################################################
+# DXF
+##########################################################################################################
+
+def _dxfEntity(kind, layer, color, codes):
+    lines = ["0", kind, "8", layer, "62", str(color)]
+    for code, value in codes:
+        lines.append(str(code))
+        lines.append(f"{value:.6f}" if isinstance(value, float) else str(value))
+    return lines
+
+
+def _dxfLine(layer, color, p1, p2):
+    return _dxfEntity("LINE", layer, color, (
+        (10, float(p1[0])), (20, float(p1[1])), (30, 0.0),
+        (11, float(p2[0])), (21, float(p2[1])), (31, 0.0)))
+
+
+def dxfEntities(layers, offset = (0.0, 0.0), prefix = ""):
+    ''' DXF R12 entity lines of the given primitive layers '''
+    dx, dy = offset
+    lines = []
+    for name, primitives in layers.items():
+        color = smFlatLayers.get(name, (7, ""))[0]
+        layer = _layerName(prefix, name)
+        for primitive in primitives:
+            kind = primitive[0]
+            if kind == "line":
+                p1, p2 = primitive[1], primitive[2]
+                lines += _dxfLine(layer, color, (p1[0] + dx, p1[1] + dy),
+                                  (p2[0] + dx, p2[1] + dy))
+            elif kind == "circle" or kind == "arc":
+                center = primitive[1]
+                codes = [(10, center[0] + dx), (20, center[1] + dy), (30, 0.0),
+                         (40, float(primitive[2]))]
+                if kind == "arc":
+                    codes += [(50, float(primitive[3])), (51, float(primitive[4]))]
+                lines += _dxfEntity(kind.upper(), layer, color, codes)
+            else:
+                points = primitive[1]
+                for p1, p2 in zip(points, points[1:]):
+                    lines += _dxfLine(layer, color, (p1[0] + dx, p1[1] + dy),
+                                      (p2[0] + dx, p2[1] + dy))
+    return lines
+
+
+def makeDxf(entityLines):
+    lines = ["0", "SECTION", "2", "ENTITIES"] + entityLines + ["0", "ENDSEC", "0", "EOF"]
+    return "\n".join(lines) + "\n"
+
+
+##########################################################################################################
+# SVG
+##########################################################################################################
+
+def svgGroups(layers, height, offset = (0.0, 0.0), prefix = ""):
+    ''' SVG group elements of the given primitive layers. The Y axis is flipped, height
+        is the height of the whole drawing '''
+    dx, dy = offset
+
+    def pt(p):
+        return f"{p[0] + dx:.6f} {height - p[1] - dy:.6f}"
+
+    groups = []
+    for name, primitives in layers.items():
+        color = smFlatLayers.get(name, (7, "#000000"))[1]
+        elements = []
+        for primitive in primitives:
+            kind = primitive[0]
+            if kind == "line":
+                elements.append(f'<path d="M {pt(primitive[1])} L {pt(primitive[2])}"/>')
+            elif kind == "circle":
+                cx, cy = primitive[1]
+                elements.append(f'<circle cx="{cx + dx:.6f}" cy="{height - cy - dy:.6f}" '
+                                f'r="{primitive[2]:.6f}"/>')
+            elif kind == "arc":
+                center, radius, a1, a2 = primitive[1:]
+                largeArc = 1 if (a2 - a1) % 360.0 > 180.0 else 0
+                # counter clockwise in model space is counter clockwise on screen, with
+                # the flipped Y axis this is the negative angle direction of SVG
+                elements.append(
+                    f'<path d="M {pt(_arcPoint(center, radius, a1))} '
+                    f'A {radius:.6f} {radius:.6f} 0 {largeArc} 0 '
+                    f'{pt(_arcPoint(center, radius, a2))}"/>')
+            else:
+                points = " L ".join(pt(p) for p in primitive[1])
+                elements.append(f'<path d="M {points}"/>')
+        dash = ' stroke-dasharray="2,1,0.5,1"' if name == "Bends" else ""
+        groups.append(f'<g id="{_layerName(prefix, name)}" fill="none" stroke="{color}" '
+                      f'stroke-width="0.1"{dash}>\n' + "\n".join(elements) + "\n</g>")
+    return groups
+
+
+def makeSvg(groups, width, height):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.3f}mm" '
+        f'height="{height:.3f}mm" viewBox="0 0 {width:.6f} {height:.6f}">\n'
+        + "\n".join(groups) + "\n</svg>\n"
+    )
+
+
+##########################################################################################################
+# Files
+##########################################################################################################
+
+def makeFlatPatternFile(parts, fileType, spacing = 10.0):
+    ''' File contents for a list of (name, layers, size) parts. A single part is written
+        with plain layer names, several parts are placed side by side along the X axis
+        with their layers prefixed by the part name '''
+    prefixed = len(parts) > 1
+    width = sum(size[0] for _name, _layers, size in parts) + spacing * (len(parts) - 1)
+    height = max((size[1] for _name, _layers, size in parts), default=0.0)
+    x = 0.0
+    contents = []
+    for name, layers, size in parts:
+        prefix = name if prefixed else ""
+        if fileType == "dxf":
+            contents += dxfEntities(layers, (x, 0.0), prefix)
+        else:
+            contents += svgGroups(layers, height, (x, 0.0), prefix)
+        x += size[0] + spacing
+    if fileType == "dxf":
+        return makeDxf(contents)
+    return makeSvg(contents, width, height)
+
+
+def writeFlatPatternFile(path, parts, fileType, spacing = 10.0):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(makeFlatPatternFile(parts, fileType, spacing))
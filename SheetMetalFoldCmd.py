@@ -32,6 +32,182 @@ smEpsilon = SheetMetalTools.smEpsilon
 # list of properties to be saved as defaults
 BendOnLineDefaultVars = [("radius", "defaultRadius"), ("angle", "defaultFoldAngle")]
 
+def getLineValue(values, index, default):
+    # per bend line value, the feature value is used for lines without one
+    if values is not None and index < len(values):
+        return values[index]
+    return default
+
+
+def getFoldLineDetail(line, foldface, normal, thk, bendR, bendA, kfactor, position,
+                      flipped, facenormal):
+    ''' Geometry of one bend line of a multi line fold, in the frame of the fixed side
+        of the bend. facenormal points from the fixed side to the moving side '''
+    if position == "intersection of planes" :
+        kfactor = (( bendR ) * math.tan(math.radians(bendA / 2.0)) * 180 / (bendA / 2.0) / math.pi - bendR ) / thk
+    unfoldLength = (bendR + kfactor * thk) * bendA * math.pi / 180.0
+    neutralRadius = bendR + kfactor * thk
+
+    # start of the bend zone, relative to the bend line
+    if position == "middle":
+        shift = -unfoldLength / 2.0
+    elif position == "backward":
+        shift = -unfoldLength
+    elif position == "intersection of planes":
+        bendR_flip = bendR + thk if flipped else bendR
+        shift = -bendR_flip * math.tan(math.radians(bendA / 2.0))
+    else:
+        shift = 0.0
+    tool = line.copy()
+    tool.translate(facenormal * shift)
+    bendZone = tool.extrude(normal * -thk).extrude(facenormal * unfoldLength)
+    bendEdges = foldface.common(tool)
+    if not bendEdges.Edges:
+        return None
+    bendEdge = bendEdges.Edges[0]
+
+    if not flipped:
+        revAxisP = bendEdge.valueAt(bendEdge.FirstParameter) + normal * bendR
+    else:
+        revAxisP = bendEdge.valueAt(bendEdge.FirstParameter) - normal * (thk + bendR)
+    revAxisV = bendEdge.valueAt(bendEdge.LastParameter) - bendEdge.valueAt(
+        bendEdge.FirstParameter
+    )
+    revAxisV.normalize()
+    if (normal.cross(revAxisV).normalize() - facenormal).Length > smEpsilon:
+        revAxisV = revAxisV * -1
+    if flipped:
+        revAxisV = revAxisV * -1
+
+    # moving side: back over the bend zone, then rotated around the bend axis
+    rotation = FreeCAD.Placement(FreeCAD.Vector(), FreeCAD.Rotation(revAxisV, bendA), revAxisP)
+    translation = FreeCAD.Placement(facenormal * -unfoldLength, FreeCAD.Rotation())
+    return bendZone, bendEdge, neutralRadius, revAxisV, rotation.multiply(translation)
+
+
+def isSingleLine(edges):
+    if not all(isinstance(edge.Curve, Part.Line) for edge in edges):
+        return False
+    point = edges[0].valueAt(edges[0].FirstParameter)
+    direction = edges[0].Curve.Direction
+    for edge in edges[1:]:
+        if direction.cross(edge.Curve.Direction).Length > smEpsilon:
+            return False
+        for vert in edge.Vertexes:
+            if (vert.Point - point).cross(direction).Length > smEpsilon:
+                return False
+    return True
+
+
+def smPlaceShape(shape, placement):
+    if placement.isIdentity():
+        return shape
+    shape = shape.copy()
+    shape.transformShape(placement.toMatrix())
+    return shape
+
+
+def smFoldLines(
+    bendR, bendA, kfactor, invertbend, flipped, position, lines, foldface, FoldShape,
+    bendRList=None, bendAList=None, flippedList=None, parallel=False,
+):
+    ''' Fold a flat sheet along several bend lines at once. The flat is split by all
+        lines in one pass, the split regions form a tree connected by the bends and
+        every region is placed by the product of the bend transforms from the root '''
+    import BOPTools.SplitAPI
+
+    normal = foldface.normalAt(0, 0)
+    thk = SheetMetalTools.smGetThickness(FoldShape, foldface)
+    for line in lines:
+        if not isinstance(line.Curve, Part.Line):
+            raise SheetMetalTools.SMException("Bend lines must be straight lines")
+    lineNormals = []
+    for line in lines:
+        lineDir = line.valueAt(line.LastParameter) - line.valueAt(line.FirstParameter)
+        lineNormals.append(normal.cross(lineDir).normalize())
+
+    toolFaces = []
+    for line in lines:
+        toolFaces += line.extrude(normal * -thk).Faces
+    regions = BOPTools.SplitAPI.slice(FoldShape, toolFaces, "Standard", 0.0).Solids
+
+    def sideOf(region, i):
+        offset = region.CenterOfMass - lines[i].valueAt(lines[i].FirstParameter)
+        return 1 if offset.dot(lineNormals[i]) > 0 else -1
+
+    # regions on each side of every line
+    lineRegions = [[] for _ in lines]
+    for i, line in enumerate(lines):
+        box = line.BoundBox
+        box.enlarge(smEpsilon)
+        for r, region in enumerate(regions):
+            if box.intersect(region.BoundBox) and region.common(line).Length > smEpsilon:
+                lineRegions[i].append(r)
+    if not lineRegions[0]:
+        raise SheetMetalTools.SMException("The first bend line does not cross the selected face")
+
+    # the fixed side of the first line is chosen as in the single line fold: the
+    # first solid of the slice by that line, or the second one if invertbend is set
+    halves = BOPTools.SplitAPI.slice(
+        FoldShape, lines[0].extrude(normal * -thk).Faces, "Standard", 0.0
+    ).childShapes()
+    rootSide = sideOf(halves[1 if invertbend and len(halves) > 1 else 0], 0)
+    root = next((r for r in lineRegions[0] if sideOf(regions[r], 0) == rootSide),
+                lineRegions[0][0])
+    placements = {root: FreeCAD.Placement()}
+    queue = [root]
+    usedLines = set()
+    bendZones = []
+    solidlist = []
+    while queue:
+        r = queue.pop(0)
+        for i in range(len(lines)):
+            if i in usedLines or r not in lineRegions[i]:
+                continue
+            usedLines.add(i)
+            lineA = getLineValue(bendAList, i, bendA)
+            lineFlipped = getLineValue(flippedList, i, flipped)
+            if lineA < 0:
+                lineA = -lineA
+                lineFlipped = not lineFlipped
+            lineR = getLineValue(bendRList, i, bendR)
+            side = sideOf(regions[r], i)
+            move = FreeCAD.Placement()
+            if lineA > 0.0:
+                detail = getFoldLineDetail(
+                    lines[i], foldface, normal, thk, lineR, lineA, kfactor, position,
+                    lineFlipped, lineNormals[i] * -side,
+                )
+                if detail is None:
+                    raise SheetMetalTools.SMException(
+                        "Bend line " + str(i + 1) + " does not cross the selected face")
+                bendZone, bendEdge, neutralRadius, revAxisV, move = detail
+                bendZones.append(bendZone)
+                for flatface in foldface.common(bendZone).Faces:
+                    bendsolid = SheetMetalBendSolid.bend_solid(
+                        flatface, bendEdge, lineR, thk, neutralRadius, revAxisV, lineFlipped,
+                        parallel
+                    )
+                    solidlist.append(smPlaceShape(bendsolid, placements[r]))
+            for other in lineRegions[i]:
+                if other in placements:
+                    continue
+                if sideOf(regions[other], i) == side:
+                    placements[other] = placements[r]
+                else:
+                    placements[other] = placements[r].multiply(move)
+                queue.append(other)
+
+    # flat parts of each region, without the bend zones
+    for r, region in enumerate(regions):
+        placement = placements.get(r, FreeCAD.Placement())
+        zones = [zone for zone in bendZones if zone.BoundBox.intersect(region.BoundBox)]
+        flatpart = region.cut(zones) if zones else region
+        for solid in flatpart.Solids:
+            solidlist.append(smPlaceShape(solid, placement))
+    return solidlist[0].multiFuse(solidlist[1:])
+
+
 def smFold(
     bendR=0.8,
     bendA=90.0,
@@ -43,11 +219,29 @@ def smFold(
     bendlinesketch=None,
     selFaceNames="",
     MainObject=None,
+    bendRList=None,
+    bendAList=None,
+    flippedList=None,
+    parallel=False,
 ):
 
     import BOPTools.SplitFeatures, BOPTools.JoinFeatures
 
     FoldShape = MainObject.Shape
+    bendLines = bendlinesketch.Shape.Edges if bendlinesketch else []
+
+    # sketches with several bend lines are folded in one pass. A bend line drawn
+    # as several collinear segments is still a single bend
+    if len(bendLines) > 1 and not isSingleLine(bendLines):
+        resultsolid = FoldShape
+        if not unfold:
+            foldface = FoldShape.getElement(SheetMetalTools.getElementFromTNP(selFaceNames[0]))
+            resultsolid = smFoldLines(
+                bendR, bendA, kfactor, invertbend, flipped, position, bendLines,
+                foldface, FoldShape, bendRList, bendAList, flippedList, parallel,
+            )
+        SheetMetalTools.smHideObjects(MainObject, bendlinesketch)
+        return resultsolid
 
     # restrict angle
     if bendA < 0:
@@ -205,7 +399,7 @@ def smFold(
             #      bendSolidlist =[]
             for flatface in flatfaces.Faces:
                 bendsolid = SheetMetalBendSolid.bend_solid(
-                    flatface, bendEdge, bendR, thk, neutralRadius, revAxisV, flipped
+                    flatface, bendEdge, bendR, thk, neutralRadius, revAxisV, flipped, parallel
                 )
                 # Part.show(bendsolid,"bendsolid")
                 solidlist.append(bendsolid)
@@ -260,11 +454,41 @@ class SMFoldWall:
             "App::PropertyEnumeration", "Position", "Parameters", _tip_
         ).Position = ["intersection of planes", "middle", "backward", "forward"]
 
+        self.addVerifyProperties(obj)
         SheetMetalTools.taskRestoreDefaults(obj, BendOnLineDefaultVars)
         obj.Proxy = self
 
     def addVerifyProperties(self, obj):
-        pass
+        SheetMetalTools.smAddProperty(
+            obj,
+            "App::PropertyFloatList",
+            "BendRadiusList",
+            FreeCAD.Qt.translate("App::Property", "Bend Radius of each bend line (multi line sketch)"),
+            None,
+            "ParametersMultiLine",
+        )
+        SheetMetalTools.smAddProperty(
+            obj,
+            "App::PropertyFloatList",
+            "BendAngleList",
+            FreeCAD.Qt.translate("App::Property", "Bend Angle of each bend line (multi line sketch)"),
+            None,
+            "ParametersMultiLine",
+        )
+        SheetMetalTools.smAddProperty(
+            obj,
+            "App::PropertyBoolList",
+            "InvertList",
+            FreeCAD.Qt.translate("App::Property", "Invert Bend Direction of each bend line (multi line sketch)"),
+            None,
+            "ParametersMultiLine",
+        )
+        SheetMetalTools.smAddBoolProperty(
+            obj,
+            "parallel",
+            FreeCAD.Qt.translate("App::Property", "Wrap the bend faces in parallel processes"),
+            False,
+        )
 
     def execute(self, fp):
         '''"Print a short message when doing a recomputation, this method is mandatory"'''
@@ -274,6 +498,7 @@ class SMFoldWall:
             fp.addProperty(
                 "App::PropertyEnumeration", "Position", "Parameters", _tip_
             ).Position = ["intersection of planes", "middle", "backward", "forward"]
+        self.addVerifyProperties(fp)
         s = smFold(
             bendR=fp.radius.Value,
             bendA=fp.angle.Value,
@@ -285,6 +510,10 @@ class SMFoldWall:
             invertbend=fp.invertbend,
             selFaceNames=fp.baseObject[1],
             MainObject=fp.baseObject[0],
+            bendRList=fp.BendRadiusList,
+            bendAList=fp.BendAngleList,
+            flippedList=fp.InvertList,
+            parallel=fp.parallel,
         )
         fp.Shape = s
 
@@ -295,6 +524,7 @@ class SMFoldWall:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
 
@@ -355,21 +585,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Fold Wall command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_AddFoldWall.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Fold a Wall"),
-                "Accel": "C, F",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Fold a wall of metal sheet\n"
-                    "1. Select a flat face on sheet metal and\n"
-                    "2. Select a bend line (sketch) on same face (ends of sketch bend lines must"
-                    " extend beyond edges of face) to create sheetmetal fold.\n"
-                    "3. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddFoldWall")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()
@@ -401,4 +617,4 @@ if SheetMetalTools.isGuiLoaded():
             return True
 
 
-    Gui.addCommand("SheetMetal_AddFoldWall", AddFoldWallCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddFoldWall", AddFoldWallCommandClass())
@@ -76,12 +76,10 @@ def combine_solids(base, cut_tool, form_tool):
     return base.fuse(form_tool)
 
 
-def makeforming(tool, base, base_face, thk, tool_faces=None, point=FreeCAD.Vector(0, 0, 0), angle=0.0):
-    # create a shell from all faces but the selected ones
-    cutSolid = tool.copy()
-    cutSolid_tran = transform_tool(
-        cutSolid, base_face, tool_faces[0], point, angle)
-    base = base.copy()
+def makeFormingTool(tool, tool_faces, thk, alternate=False):
+    # create the forming solid from a shell of all the tool faces but the selected ones
+    if alternate:
+        return tool.makeThickness(tool_faces, thk, 0.0001, False, False, 0, 0)
     try:
         faces = []
         for face in tool.Faces:
@@ -94,23 +92,49 @@ def makeforming(tool, base, base_face, thk, tool_faces=None, point=FreeCAD.Vecto
                 faces.append(face)
         tool_shell = Part.makeShell(faces)
 
-        offsetshell = tool_shell.makeOffsetShape(
+        return tool_shell.makeOffsetShape(
             thk, 0.0, inter=False, self_inter=False, offsetMode=0, join=2, fill=True)
-        offsetshell_tran = transform_tool(
-            offsetshell, base_face, tool_faces[0], point, angle)
-        base = combine_solids(base, cutSolid_tran, offsetshell_tran)
+    except:
+        return None
+
+
+def applyFormingTool(tool, base, base_face, form_tool, tool_faces, points, angle):
+    # place a copy of the tools at each point, then apply all of them together
+    cut_tools = []
+    form_tools = []
+    for point in points:
+        cut_tools.append(transform_tool(
+            tool.copy(), base_face, tool_faces[0], point, angle))
+        form_tools.append(transform_tool(
+            form_tool.copy(), base_face, tool_faces[0], point, angle))
+    return combine_solids(base, SheetMetalTools.smFuseShapes(cut_tools),
+                          SheetMetalTools.smFuseShapes(form_tools))
+
+
+def makeFormingPattern(tool, base, base_face, thk, tool_faces, points, angle=0.0, form_tool=None):
+    '''Form the base at all given points with one combined cut and one combined fuse.
+       form_tool is the forming solid made by makeFormingTool, it is calculated
+       if not given'''
+    base = base.copy()
+    if form_tool is None:
+        form_tool = makeFormingTool(tool, tool_faces, thk)
+    try:
+        if form_tool is None:
+            raise SheetMetalTools.SMException("Forming tool offset failed")
+        base = applyFormingTool(tool, base, base_face, form_tool, tool_faces, points, angle)
     except:
         FreeCAD.Console.PrintWarning("Forming faild. Trying alternate way.")
-        offsetshell = tool.makeThickness(
-            tool_faces, thk, 0.0001, False, False, 0, 0)
-        offsetshell_tran = transform_tool(
-            offsetshell, base_face, tool_faces[0], point, angle)
-        base = combine_solids(base, cutSolid_tran, offsetshell_tran)
+        form_tool = makeFormingTool(tool, tool_faces, thk, alternate=True)
+        base = applyFormingTool(tool, base, base_face, form_tool, tool_faces, points, angle)
 
     # Part.show(base, "base")
     return base
 
 
+def makeforming(tool, base, base_face, thk, tool_faces=None, point=FreeCAD.Vector(0, 0, 0), angle=0.0):
+    return makeFormingPattern(tool, base, base_face, thk, tool_faces, [point], angle)
+
+
 class SMBendWall:
     def __init__(self, obj, selobj, selobj_items, seltool, seltool_items):
         '''"Add Forming Wall" '''
@@ -202,11 +226,18 @@ class SMBendWall:
             offsetlist.append(FreeCAD.Vector(fp.OffsetX, fp.OffsetY, 0))
 
         if not (fp.SuppressFeature):
-            for offset in offsetlist:
-                a = makeforming(tool, base, base_face, thk,
-                                tool_faces, offset, fp.angle.Value)
-                # Part.show(a)
-                base = a
+            # the forming solid depends only on the tool and thickness, it is
+            # made once and reused for all the pattern instances and recomputes
+            cache = SheetMetalTools.smGetRecomputeCache(self)
+            cache.validate((
+                SheetMetalTools.smGetShapeFingerprint(tool),
+                tuple(SheetMetalTools.smGetShapeFingerprint(face) for face in tool_faces),
+                round(thk, 6)
+            ))
+            form_tool = cache.get("formTool", lambda: makeFormingTool(tool, tool_faces, thk))
+            a = makeFormingPattern(tool, base, base_face, thk, tool_faces,
+                                   offsetlist, fp.angle.Value, form_tool)
+            # Part.show(a)
                 
         else:
             a = base
@@ -221,6 +252,7 @@ class SMBendWall:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
     from PySide import QtCore, QtGui
 
     icons_path = SheetMetalTools.icons_path
@@ -312,15 +344,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Forming Wall command"""
 
         def GetResources(self):
-            return {'Pixmap': os.path.join(icons_path, 'SheetMetal_Forming.svg'),
-                    'MenuText': translate('SheetMetal', 'Make Forming in Wall'),
-                    'Accel': "M, F",
-                    'ToolTip': translate(
-                        'SheetMetal', 'Make a forming using tool in metal sheet\n'
-                        '1. Select a flat face on sheet metal and\n'
-                        '2. Select face(s) on forming tool Shape to create Formed sheetmetal.\n'
-                        '3. Use Suppress in Property editor to disable during unfolding\n'
-                        '4. Use Property editor to modify other parameters')}
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_Forming")
 
         def Activated(self):
             doc = FreeCAD.ActiveDocument
@@ -362,4 +386,4 @@ if SheetMetalTools.isGuiLoaded():
                     return False
             return True
 
-    Gui.addCommand("SheetMetal_Forming", AddFormingWallCommand())
+    SheetMetalCommands.smAddCommand("SheetMetal_Forming", AddFormingWallCommand())
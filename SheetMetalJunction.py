@@ -27,20 +27,19 @@ import os
 import FreeCAD
 import Part
 import SheetMetalTools
+import SheetMetalParallel
 
 # IMPORTANT: please remember to change the element map version in case of any
 # changes in modeling logic
-smElementMapVersion = 'sm1.'
+smElementMapVersion = 'sm2.'
 
 # list of properties to be saved as defaults
 smJunctionDefaultVars = [("gap", "defaultJunctionGap")]
 
 
-def smJunction(gap=2.0, selEdgeNames='', MainObject=None):
-    import BOPTools.SplitFeatures
-    import BOPTools.JoinFeatures
-
-    resultSolid = MainObject
+def smJunction(gap=2.0, selEdgeNames='', MainObject=None, parallel=False):
+    # all tools are built from the base shape, and cut from it at once
+    facePairs = []
     for selEdgeName in selEdgeNames:
         edge = MainObject.getElement(
             SheetMetalTools.getElementFromTNP(selEdgeName))
@@ -48,26 +47,13 @@ def smJunction(gap=2.0, selEdgeNames='', MainObject=None):
         facelist = MainObject.ancestorsOfType(edge, Part.Face)
         # for face in facelist :
         #  Part.show(face,'face')
+        facePairs.append((facelist[0], facelist[1]))
 
-        joinface = facelist[0].fuse(facelist[1])
-        # Part.show(joinface,'joinface')
-        filletedface = joinface.makeFillet(gap, joinface.Edges)
-        # Part.show(filletedface,'filletedface')
-
-        cutface1 = facelist[0].cut(filletedface)
-        # Part.show(cutface1,'cutface1')
-        offsetsolid1 = cutface1.makeOffsetShape(-gap, 0.0, fill=True)
-        # Part.show(offsetsolid1,'offsetsolid1')
-
-        cutface2 = facelist[1].cut(filletedface)
-        # Part.show(cutface2,'cutface2')
-        offsetsolid2 = cutface2.makeOffsetShape(-gap, 0.0, fill=True)
-        # Part.show(offsetsolid2,'offsetsolid2')
-        cutsolid = offsetsolid1.fuse(offsetsolid2)
-        # Part.show(cutsolid,'cutsolid')
-        resultSolid = resultSolid.cut(cutsolid)
-        # Part.show(resultsolid,'resultsolid')
-
+    cutsolids = SheetMetalParallel.makeJunctionTools(facePairs, gap, parallel)
+    if not cutsolids:
+        return MainObject
+    resultSolid = MainObject.cut(cutsolids)
+    # Part.show(resultsolid,'resultsolid')
     return resultSolid
 
 
@@ -82,10 +68,16 @@ class SMJunction:
         obj.addProperty("App::PropertyLinkSub", "baseObject", "Parameters",
                         _tip_).baseObject = (selobj, sel_items)
         obj.Proxy = self
+        self.addVerifyProperties(obj)
         SheetMetalTools.taskRestoreDefaults(obj, smJunctionDefaultVars)
     
     def addVerifyProperties(self, obj):
-        pass
+        SheetMetalTools.smAddBoolProperty(
+            obj,
+            "parallel",
+            FreeCAD.Qt.translate("App::Property", "Build the junction tools in parallel processes"),
+            False,
+        )
 
     def getElementMapVersion(self, _fp, ver, _prop, restored):
         if not restored:
@@ -94,9 +86,11 @@ class SMJunction:
     def execute(self, fp):
         '''"Print a short message when doing a recomputation, this method is mandatory" '''
         # pass selected object shape
+        self.addVerifyProperties(fp)
         Main_Object = fp.baseObject[0].Shape.copy()
         s = smJunction(gap=fp.gap.Value,
-                       selEdgeNames=fp.baseObject[1], MainObject=Main_Object)
+                       selEdgeNames=fp.baseObject[1], MainObject=Main_Object,
+                       parallel=fp.parallel)
         fp.Shape = s
         SheetMetalTools.smHideObjects(fp.baseObject[0])
 
@@ -107,6 +101,7 @@ class SMJunction:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
     from PySide import QtCore, QtGui
 
     icons_path = SheetMetalTools.icons_path
@@ -163,12 +158,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Junction command"""
 
         def GetResources(self):
-            return {'Pixmap': os.path.join(icons_path, 'SheetMetal_AddJunction.svg'),  # the name of a svg file available in the resources
-                    'MenuText': FreeCAD.Qt.translate('SheetMetal', 'Make Junction'),
-                    'Accel': "S, J",
-                    'ToolTip': FreeCAD.Qt.translate('SheetMetal', 'Create a rip where two walls come together on solids.\n'
-                                                    '1. Select edge(s) to create rip on corner edge(s).\n'
-                                                    '2. Use Property editor to modify parameters')}
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddJunction")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -191,4 +181,4 @@ if SheetMetalTools.isGuiLoaded():
                     return False
             return True
 
-    Gui.addCommand("SheetMetal_AddJunction", AddJunctionCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddJunction", AddJunctionCommandClass())
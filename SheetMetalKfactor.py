@@ -24,7 +24,12 @@
 #
 ###################################################################################
 
+import os
 import re
+import csv
+import json
+import bisect
+from types import MappingProxyType
 import FreeCAD
 
 
@@ -62,43 +67,157 @@ def _find_objects(objs, _filter):
     return res
 
 
-def getSpreadSheetNames():
-    material_sheet_regex_str = r"material_([a-zA-Z0-9_\-\[\]\.]+)"
-    material_sheet_regex = re.compile(material_sheet_regex_str)
+material_sheet_regex = re.compile(r"material_([a-zA-Z0-9_\-\[\]\.]+)")
+cell_name_regex = re.compile(r"^([A-Z]+)([0-9]+)$")
 
-    spreadsheets = findObjectsByTypeRecursive(
-        FreeCAD.ActiveDocument, "Spreadsheet::Sheet"
+
+class SheetCells:
+    """Read only snapshot of the non empty cells of a spreadsheet, read in one pass.
+    Offers the part of the spreadsheet interface used by the material parsers"""
+
+    def __init__(self, sheet):
+        self.Label = sheet.Label
+        self.PropertiesList = tuple(sorted(
+            filter(cell_name_regex.search, sheet.PropertiesList)
+        ))
+        values = {}
+        contents = {}
+        for cell in self.PropertiesList:
+            try:
+                values[cell] = sheet.get(cell)
+            except Exception:
+                pass
+            contents[cell] = sheet.getContents(cell)
+        self.values = MappingProxyType(values)
+        self.contents = MappingProxyType(contents)
+
+    def get(self, cell):
+        if cell not in self.values:
+            raise ValueError(f"Invalid cell address or property: {cell}")
+        return self.values[cell]
+
+    def getContents(self, cell):
+        return self.contents.get(cell, "")
+
+
+class MaterialRegistry:
+    """Parses each material definition sheet once and shares the result between
+    the unfolders and the task panel. Cached entries are dropped when their
+    spreadsheet changes. The parsers build read only tables, as they are shared"""
+
+    def __init__(self):
+        self.sheets = {}  # (document, sheet) names: {parser: result}
+        self.material_sheets = {}  # document name: list of valid material sheets
+        self.observing = False
+
+    def _observe(self):
+        if not self.observing:
+            FreeCAD.addDocumentObserver(self)
+            self.observing = True
+
+    def _key(self, sheet):
+        return (sheet.Document.Name, sheet.Name)
+
+    def get_cells(self, sheet):
+        return self.get_parsed(sheet, SheetCells)
+
+    def get_parsed(self, sheet, parser):
+        """Result of parser(sheet), computed once per version of the sheet.
+        Parse errors are cached as well and raised again on each call"""
+        self._observe()
+        entry = self.sheets.setdefault(self._key(sheet), {})
+        if parser not in entry:
+            try:
+                source = sheet if parser is SheetCells else self.get_cells(sheet)
+                entry[parser] = (parser(source), None)
+            except ValueError as e:
+                entry[parser] = (None, e)
+        result, error = entry[parser]
+        if error is not None:
+            raise error
+        return result
+
+    def get_material_sheets(self, doc):
+        self._observe()
+        if doc.Name not in self.material_sheets:
+            self.material_sheets[doc.Name] = self._find_material_sheets(doc)
+        return list(self.material_sheets[doc.Name])
+
+    def _find_material_sheets(self, doc):
+        spreadsheets = findObjectsByTypeRecursive(doc, "Spreadsheet::Sheet")
+        candidateSpreadSheets = [
+            o for o in spreadsheets if material_sheet_regex.match(o.Label)
+        ]
+
+        availableMdsObjects = []
+        for candidate in candidateSpreadSheets:
+            try:
+                self.get_parsed(candidate, KFactorLookupTable)
+                availableMdsObjects.append(candidate)
+            except ValueError as e:
+                FreeCAD.Console.PrintWarning(
+                    f"Spreadsheet with name {candidate.Label} is not a valid material definition table.\n"
+                )
+                FreeCAD.Console.PrintWarning(f"Error: {e}\n")
+        return availableMdsObjects
+
+    # document observer slots
+    def slotChangedObject(self, obj, prop):
+        if obj.isDerivedFrom("Spreadsheet::Sheet"):
+            # cell edits can make a sheet a valid material sheet or not
+            self.sheets.pop(self._key(obj), None)
+            self.material_sheets.pop(obj.Document.Name, None)
+
+    def slotCreatedObject(self, obj):
+        self.material_sheets.pop(obj.Document.Name, None)
+
+    def slotDeletedObject(self, obj):
+        self.sheets.pop(self._key(obj), None)
+        self.material_sheets.pop(obj.Document.Name, None)
+
+    def slotDeletedDocument(self, doc):
+        self.material_sheets.pop(doc.Name, None)
+        for key in [key for key in self.sheets if key[0] == doc.Name]:
+            del self.sheets[key]
+
+
+material_registry = MaterialRegistry()
+
+
+def findMaterialSheet(material_sheet, doc=None):
+    """Spreadsheet with the given label in doc, the active document by default"""
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    lookup_sheet = doc.getObjectsByLabel(material_sheet)
+    if len(lookup_sheet) >= 1:
+        return lookup_sheet[0]
+    raise ValueError(
+        "No spreadsheet found containing material definition: %s" % material_sheet
+    )
+
+
+def getKFactorLookupTable(material_sheet, doc=None):
+    """Parsed material definition table of the sheet with the given label.
+    The table is shared and read only"""
+    return material_registry.get_parsed(
+        findMaterialSheet(material_sheet, doc), KFactorLookupTable
     )
-    candidateSpreadSheets = [
-        o for o in spreadsheets if material_sheet_regex.match(o.Label)
-    ]
 
-    availableMdsObjects = []
-    for candidate in candidateSpreadSheets:
-        try:
-            KFactorLookupTable(candidate.Label)
-            availableMdsObjects.append(candidate)
-        except ValueError as e:
-            FreeCAD.Console.PrintWarning(
-                f"Spreadsheet with name {candidate.Label} is not a valid material definition table.\n"
-            )
-            FreeCAD.Console.PrintWarning(f"Error: {e}\n")
 
-    return availableMdsObjects
+def getSpreadSheetNames(doc=None):
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    return material_registry.get_material_sheets(doc)
 
 
 class KFactorLookupTable:
-    cell_regex = re.compile(r"^([A-Z]+)([0-9]+)$")
+    cell_regex = cell_name_regex
 
-    def __init__(self, material_sheet):
-        lookup_sheet = FreeCAD.ActiveDocument.getObjectsByLabel(material_sheet)
-        if len(lookup_sheet) >= 1:
-            lookup_sheet = lookup_sheet[0]
-        else:
-            raise ValueError(
-                "No spreadsheet found containing material definition: %s"
-                % material_sheet
-            )
+    def __init__(self, material_sheet, doc=None):
+        """material_sheet: label of a spreadsheet in doc, or its parsed cells"""
+        if isinstance(material_sheet, str):
+            material_sheet = material_registry.get_cells(findMaterialSheet(material_sheet, doc))
+        lookup_sheet = material_sheet
 
         key_cell = self.find_cell_by_label(lookup_sheet, "Radius / Thickness")
         value_cell, k_factor_standard = self.find_k_factor_cell(lookup_sheet)
@@ -125,7 +244,7 @@ class KFactorLookupTable:
         if k_factor_standard not in ["ansi", "din"]:
             raise ValueError("Invalid K-factor standard: %s" % k_factor_standard)
 
-        self.k_factor_lookup = k_factor_lookup
+        self.k_factor_lookup = MappingProxyType(k_factor_lookup)
         self.k_factor_standard = k_factor_standard
 
     def get_cells(self, sheet):
@@ -194,3 +313,219 @@ class KFactorLookupTable:
         if k_factor_standard is None:
             raise ValueError("'K-factor standard' option is required (ANSI or DIN)")
         return k_factor_standard
+
+
+##########################################################################################################
+# Material library files
+##########################################################################################################
+
+# Material definitions shared between documents, stored as JSON or CSV files in the
+# "SheetMetal/materials" folder of the user config dir. Each file is a library, the
+# materials in it are referenced from SMUnfold.MaterialSheet as "lib:<library>/<material>".
+#
+# JSON:
+#   {"materials": [{"name": "S235", "k_factor_standard": "ansi",
+#                   "k_factors": [[1, 0.38], [3, 0.43], [99, 0.5]],
+#                   "thicknesses": [{"thickness": 1.5, "gauge": "16", "radius": 1.5,
+#                                    "k_factors": [[1, 0.4], [99, 0.5]]}]}]}
+#   "thicknesses" is optional, and so are its "gauge", "radius" and "k_factors" entries.
+#   Thickness specific k_factors replace the material ones for that thickness.
+#
+# CSV, one row per K-factor value:
+#   material,k_factor_standard,thickness,gauge,radius,radius_thickness,k_factor
+#   An empty thickness gives the material wide K-factor curve.
+
+library_prefix = "lib:"
+library_thickness_tolerance = 1e-3
+
+
+def getLibraryPath():
+    if hasattr(FreeCAD, "getUserConfigDir"):
+        base = FreeCAD.getUserConfigDir()
+    else:
+        base = FreeCAD.getUserAppDataDir()
+    return os.path.join(base, "SheetMetal", "materials")
+
+
+def isLibraryReference(material_sheet):
+    return material_sheet.startswith(library_prefix)
+
+
+def makeLibraryReference(library, material):
+    return f"{library_prefix}{library}/{material}"
+
+
+class LibraryThickness:
+    def __init__(self, thickness, gauge=None, radius=None, k_factor_lookup=None):
+        self.thickness = thickness
+        self.gauge = gauge
+        self.radius = radius
+        self.k_factor_lookup = k_factor_lookup or {}
+
+
+class LibraryMaterial:
+    """A material of a library file. K-factor tables are ANSI or DIN as declared by
+    k_factor_standard, like the ones of a material definition sheet"""
+
+    def __init__(self, library, name, k_factor_standard):
+        if k_factor_standard not in ["ansi", "din"]:
+            raise ValueError(
+                f"Invalid K-factor standard for material {name}: {k_factor_standard}"
+            )
+        self.library = library
+        self.name = name
+        self.k_factor_standard = k_factor_standard
+        self.k_factor_lookup = {}
+        self.thickness_values = []  # sorted, for bisect
+        self.thicknesses = []
+
+    @property
+    def reference(self):
+        return makeLibraryReference(self.library, self.name)
+
+    def get_thickness(self, thickness, create=False):
+        i = bisect.bisect_left(self.thickness_values, thickness - library_thickness_tolerance)
+        if (
+            i < len(self.thickness_values)
+            and abs(self.thickness_values[i] - thickness) <= library_thickness_tolerance
+        ):
+            return self.thicknesses[i]
+        if not create:
+            return None
+        entry = LibraryThickness(thickness)
+        self.thickness_values.insert(i, thickness)
+        self.thicknesses.insert(i, entry)
+        return entry
+
+    def get_k_factor_lookup(self, thickness=None):
+        if thickness is not None:
+            entry = self.get_thickness(thickness)
+            if entry is not None and entry.k_factor_lookup:
+                return MappingProxyType(entry.k_factor_lookup)
+        if not self.k_factor_lookup:
+            raise ValueError(f"No K-factor values for material {self.reference}")
+        return MappingProxyType(self.k_factor_lookup)
+
+    def get_gauge(self, thickness):
+        entry = self.get_thickness(thickness)
+        return None if entry is None else entry.gauge
+
+    def get_default_radius(self, thickness):
+        entry = self.get_thickness(thickness)
+        return None if entry is None else entry.radius
+
+
+class MaterialLibrary:
+    """All the materials of the library files, indexed by reference.
+    Files are read once per session, call reload() to read them again"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.materials = None
+
+    def _load(self):
+        if self.materials is not None:
+            return
+        self.materials = {}
+        path = self.path or getLibraryPath()
+        if not os.path.isdir(path):
+            return
+        for filename in sorted(os.listdir(path)):
+            library, ext = os.path.splitext(filename)
+            ext = ext.lower()
+            if ext not in [".json", ".csv"]:
+                continue
+            try:
+                if ext == ".json":
+                    materials = self._read_json(library, os.path.join(path, filename))
+                else:
+                    materials = self._read_csv(library, os.path.join(path, filename))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                FreeCAD.Console.PrintWarning(
+                    f"Material library {filename} could not be read: {e}\n"
+                )
+                continue
+            for material in materials:
+                self.materials[material.reference] = material
+
+    def _read_json(self, library, filename):
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        materials = []
+        for item in data["materials"]:
+            material = LibraryMaterial(
+                library, item["name"], item.get("k_factor_standard", "ansi").lower()
+            )
+            material.k_factor_lookup = {
+                float(rt): float(k) for rt, k in item.get("k_factors", [])
+            }
+            for thk in item.get("thicknesses", []):
+                entry = material.get_thickness(float(thk["thickness"]), True)
+                if thk.get("gauge") is not None:
+                    entry.gauge = str(thk["gauge"])
+                if thk.get("radius") is not None:
+                    entry.radius = float(thk["radius"])
+                entry.k_factor_lookup = {
+                    float(rt): float(k) for rt, k in thk.get("k_factors", [])
+                }
+            materials.append(material)
+        return materials
+
+    def _read_csv(self, library, filename):
+        materials = {}
+        with open(filename, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = row["material"].strip()
+                if not name:
+                    continue
+                material = materials.get(name)
+                if material is None:
+                    standard = (row.get("k_factor_standard") or "ansi").strip().lower()
+                    material = LibraryMaterial(library, name, standard)
+                    materials[name] = material
+                lookup = material.k_factor_lookup
+                if (row.get("thickness") or "").strip():
+                    entry = material.get_thickness(float(row["thickness"]), True)
+                    if (row.get("gauge") or "").strip():
+                        entry.gauge = row["gauge"].strip()
+                    if (row.get("radius") or "").strip():
+                        entry.radius = float(row["radius"])
+                    lookup = entry.k_factor_lookup
+                if (row.get("radius_thickness") or "").strip():
+                    lookup[float(row["radius_thickness"])] = float(row["k_factor"])
+        return list(materials.values())
+
+    def reload(self):
+        self.materials = None
+
+    def get_references(self):
+        self._load()
+        return sorted(self.materials)
+
+    def get_material(self, reference):
+        self._load()
+        material = self.materials.get(reference)
+        if material is None:
+            raise ValueError(f"Material {reference} not found in the material libraries")
+        return material
+
+
+material_library = MaterialLibrary()
+
+
+def getLibraryMaterialNames():
+    return material_library.get_references()
+
+
+def getLibraryMaterial(reference):
+    return material_library.get_material(reference)
+
+
+def getMaterialKFactorLookup(material_sheet, thickness=None, doc=None):
+    """K-factor lookup dictionary and K-factor standard of a material sheet label in doc
+    or a library reference. The lookup is shared and read only"""
+    if isLibraryReference(material_sheet):
+        material = getLibraryMaterial(material_sheet)
+        return material.get_k_factor_lookup(thickness), material.k_factor_standard
+    lookup_table = getKFactorLookupTable(material_sheet, doc)
+    return lookup_table.k_factor_lookup, lookup_table.k_factor_standard
@@ -28,9 +28,11 @@ from itertools import combinations
 from math import degrees, log10, pi, radians, sin, tan
 from operator import mul as multiply_operator
 from statistics import StatisticsError, mode
+from typing import Callable, NamedTuple
 
 import FreeCAD
 import Part
+import SheetMetalKfactor
 import SheetMetalTools
 from FreeCAD import Matrix, Placement, Rotation, Vector
 from TechDraw import projectEx as project_shape_to_plane
@@ -500,10 +502,14 @@ class SketchExtraction:
         object_name: str,
         existing_sketches: list[str] = None,
         color: str = "#00FF00",
+        doc: FreeCAD.Document = None,
     ) -> FreeCAD.DocumentObject:
         """Converts a list of edges to an un-constrained sketch object.
         This allows the user to more easily make small changes to the sheet
-        metal cutting pattern when prepping it for fabrication."""
+        metal cutting pattern when prepping it for fabrication.
+        The sketch is created in doc, the active document by default."""
+        if doc is None:
+            doc = FreeCAD.ActiveDocument
         cleaned_up_edges = edges  # Edge2DCleanup.cleanup_sketch(edges, spline2arc_tol)
         # See if there is an existing sketch with the same name,
         # use it instead of creating a new one.
@@ -513,14 +519,12 @@ class SketchExtraction:
             existing_sketch_name = next(
                 (item for item in existing_sketches if item.startswith(object_name)), ""
             )
-        sketch = FreeCAD.ActiveDocument.getObject(existing_sketch_name)
+        sketch = doc.getObject(existing_sketch_name)
         if sketch is not None:
             sketch.deleteAllGeometry()
         else:
             # if there is not already an existing sketch, create one.
-            sketch = FreeCAD.ActiveDocument.addObject(
-                "Sketcher::SketchObject", object_name
-            )
+            sketch = doc.addObject("Sketcher::SketchObject", object_name)
             sketch.Placement = Placement()
 
         for edge in cleaned_up_edges:
@@ -654,6 +658,20 @@ class BendAllowanceCalculator:
         ]
         return instance
 
+    @classmethod
+    def from_k_factor_lookup(cls, k_factor_lookup: dict, kfactor_standard: str):
+        """k-factors by radius:thickness ratio, as in a material library entry"""
+        instance = cls()
+        instance.k_factor_standard = (
+            cls.KFactorStandard.ANSI
+            if kfactor_standard == "ansi"
+            else cls.KFactorStandard.DIN
+        )
+        ratios = sorted(k_factor_lookup)
+        instance.radius_thickness_values = ratios
+        instance.k_factor_values = [k_factor_lookup[r] for r in ratios]
+        return instance
+
     def get_k_factor(self, radius: float, thickness: float) -> float:
         # if we are below the lowest tabulated value for the radius over
         # thickness relation, return the smallest noted k-factor
@@ -697,6 +715,13 @@ class BendAllowanceCalculator:
 
     @classmethod
     def from_spreadsheet(cls, sheet: FreeCAD.DocumentObject):
+        """parsed once per version of the sheet, the instance is shared"""
+        return SheetMetalKfactor.material_registry.get_parsed(
+            sheet, cls.from_sheet_cells
+        )
+
+    @classmethod
+    def from_sheet_cells(cls, sheet: SheetMetalKfactor.SheetCells):
         instance = cls()
         r_t_header = sheet.getContents("A1")
         r_t_header = "".join(c for c in r_t_header if c not in "' ").lower()
@@ -736,8 +761,9 @@ class BendAllowanceCalculator:
                 )
                 raise ValueError(errmsg)
             k_factor_list.append(float(next_kf_value))
-        instance.radius_thickness_values = radius_thickness_list
-        instance.k_factor_values = k_factor_list
+        # the instance is shared through the material registry
+        instance.radius_thickness_values = tuple(radius_thickness_list)
+        instance.k_factor_values = tuple(k_factor_list)
         return instance
 
     def _convert_to_ansi_kfactor(self, k_factor: float) -> float:
@@ -1215,12 +1241,26 @@ def compute_unbend_transform(
     return alignment_transform, overall_transform, uvref
 
 
+class UnfoldCancelled(Exception):
+    """Raised by a progress callback to stop an unfold operation"""
+
+
+def _no_progress(stage: str, fraction: float) -> None:
+    pass
+
+
 def unfold(
-    shape: Part.Shape, root_face_index: int, bac: BendAllowanceCalculator
+    shape: Part.Shape,
+    root_face_index: int,
+    bac: BendAllowanceCalculator,
+    progress=_no_progress,
 ) -> tuple[list[Part.Edge], list[Part.Edge]]:
     """Given a solid body of a sheet metal part and a reference face, computes
     a solid representation of the unbent object, as well as a compound object
-    containing straight edges for each bend centerline."""
+    containing straight edges for each bend centerline.
+    progress(stage, fraction) is called along the way, with stage one of
+    "graph", "bends" and "placement". It may raise UnfoldCancelled."""
+    progress("graph", 0.0)
     graph_of_sheet_faces = build_graph_of_tangent_faces(shape, root_face_index)
     thickness = EstimateThickness.using_best_method(shape, root_face_index)
     # also build a list of all seam edges, to be filtered out from the unfolded shape
@@ -1248,9 +1288,11 @@ def unfold(
     # the digraph should now have everything we need to unfold the shape,
     # For every edge f1--e1-->f2 where f2 is a cylindrical face, feed f1
     # through our unbending functions with e1 as the stationary edge.
-    for e in [
+    bend_graph_edges = [
         e for e in dg.edges if shape.Faces[e[1]].Surface.TypeId == "Part::GeomCylinder"
-    ]:
+    ]
+    for bend_number, e in enumerate(bend_graph_edges):
+        progress("bends", bend_number / len(bend_graph_edges))
         # the bend face is the end-node of the directed edge
         bend_part = shape.Faces[e[1]]
         # we stored the edge indices as the labels of the graph edges
@@ -1296,7 +1338,9 @@ def unfold(
     # it in-plane with the root face.
     list_of_sketch_lines = []
     list_of_bend_lines = []
-    for face_id, path in nx.shortest_path(dg, source=root_face_index).items():
+    paths_from_root = nx.shortest_path(dg, source=root_face_index)
+    for face_number, (face_id, path) in enumerate(paths_from_root.items()):
+        progress("placement", face_number / len(paths_from_root))
         # the path includes the root face itself, which we don't need
         path_to_face = path[:-1]
         node_data = dg.nodes.data()
@@ -1334,31 +1378,48 @@ def unfold(
     return list_of_sketch_lines, list_of_bend_lines
 
 
-def getUnfold(
-    bac: BendAllowanceCalculator, solid: Part.Feature, facename: str
-) -> tuple[Part.Face, Part.Shape, Part.Compound, Vector]:
-    object_placement = solid.Placement.toMatrix()
-    shp = solid.Shape.transformed(object_placement.inverse())
-    if hasattr(shp, "findSubShape"):
-        # FreeCAD version >= 1.0
-        subshape = shp.getElement(facename)
-        root_face_index = shp.findSubShape(subshape)[1] - 1
-    else:
-        # FreeCAD version <= 0.21
-        try:
-            root_face_index = int(facename[4:]) - 1
-        except ValueError:
-            errmsg = f"Invalid shape name: {facename}"
-            raise RuntimeError(errmsg)
-    sketch_lines, bend_lines = unfold(shp, root_face_index, bac)
+class UnfoldOptions(NamedTuple):
+    """Settings of unfold_shape"""
+
+    # progress(stage, fraction), see unfold. May raise UnfoldCancelled
+    progress: Callable[[str, float], None] = _no_progress
+
+
+class FlatResult(NamedTuple):
+    """Result of unfold_shape, in the coordinate system of the input shape,
+    except for flat_face"""
+
+    root_face: Part.Face
+    unfolded_shape: Part.Shape  # flattened solid, in place on the root face
+    bend_lines: Part.Compound  # bend center lines, trimmed to the flat shape
+    root_normal: Vector
+    flat_face: Part.Face  # flat profile, aligned to the XY plane origin
+    thickness: float
+
+
+def unfold_shape(
+    shape: Part.Shape,
+    face_index: int,
+    bac: BendAllowanceCalculator,
+    options: UnfoldOptions = None,
+) -> FlatResult:
+    """Unfold a sheet metal shape from the face at face_index (0-based).
+    Does not access any document or global state, so it can be called from
+    any thread and for any document."""
+    if options is None:
+        options = UnfoldOptions()
+    progress = options.progress
+    sketch_lines, bend_lines = unfold(shape, face_index, bac, progress)
+    progress("cleanup", 0.0)
+    root_face = shape.Faces[face_index]
     sketch_align_transform = SketchExtraction.move_to_origin(
-        Part.makeCompound(sketch_lines), shp.Faces[root_face_index]
+        Part.makeCompound(sketch_lines), root_face
     )
-    thickness = EstimateThickness.using_best_method(shp, root_face_index)
+    thickness = EstimateThickness.using_best_method(shape, face_index)
     sketch_lines = [e.transformed(sketch_align_transform) for e in sketch_lines]
     bend_lines = [e.transformed(sketch_align_transform) for e in bend_lines]
     sketch_wirelist = Edge2DCleanup.clean_and_structure_geometry(sketch_lines)
-    root_normal = shp.Faces[root_face_index].normalAt(0, 0)
+    root_normal = root_face.normalAt(0, 0)
     face = Part.makeFace(sketch_wirelist, "Part::FaceMakerBullseye")
     unbent_solid = face.extrude(Vector(0.0, 0.0, -1 * thickness))
     inplace_unbend = face.transformed(sketch_align_transform.inverse()).extrude(
@@ -1368,7 +1429,41 @@ def getUnfold(
     trimmed_bend_lines = bend_lines_compound.common(
         unbent_solid.translated(Vector(0.0, 0.0, 0.5 * thickness))
     ).transformed(sketch_align_transform.inverse())
-    return shp.Faces[root_face_index], inplace_unbend, trimmed_bend_lines, root_normal
+    return FlatResult(
+        root_face, inplace_unbend, trimmed_bend_lines, root_normal, face, thickness
+    )
+
+
+def getUnfold(
+    bac: BendAllowanceCalculator, solid: Part.Feature, facename: str
+) -> tuple[Part.Face, Part.Shape, Part.Compound, Vector]:
+    return getUnfoldFromShape(bac, solid.Shape, solid.Placement, facename)
+
+
+def getUnfoldFromShape(
+    bac: BendAllowanceCalculator,
+    shape: Part.Shape,
+    placement: Placement,
+    facename: str,
+    progress=_no_progress,
+) -> tuple[Part.Face, Part.Shape, Part.Compound, Vector]:
+    """Same as getUnfold, without access to the document object, so it can run
+    in a worker thread on a copy of the shape"""
+    object_placement = placement.toMatrix()
+    shp = shape.transformed(object_placement.inverse())
+    if hasattr(shp, "findSubShape"):
+        # FreeCAD version >= 1.0
+        subshape = shp.getElement(facename)
+        root_face_index = shp.findSubShape(subshape)[1] - 1
+    else:
+        # FreeCAD version <= 0.21
+        try:
+            root_face_index = int(facename[4:]) - 1
+        except ValueError:
+            errmsg = f"Invalid shape name: {facename}"
+            raise RuntimeError(errmsg)
+    result = unfold_shape(shp, root_face_index, bac, UnfoldOptions(progress))
+    return result.root_face, result.unfolded_shape, result.bend_lines, result.root_normal
 
 
 def getUnfoldSketches(
@@ -1381,6 +1476,7 @@ def getUnfoldSketches(
     sketch_color: str = "#000080",
     bend_sketch_color: str = "#c00000",
     internal_sketch_color: str = "#ff5733",
+    doc: FreeCAD.Document = None,
 ) -> list[Part.Feature]:
     sketch_profile, inner_wires, hole_wires = SketchExtraction.extract_manually(
         unfolded_shape, root_normal
@@ -1400,7 +1496,7 @@ def getUnfoldSketches(
     sketch_profile = sketch_profile.transformed(sketch_align_transform)
     # organize the unfold sketch layers in a group
     sketch_doc_obj = SketchExtraction.edges_to_sketch_object(
-        sketch_profile.Edges, "Unfold_Sketch", existing_sketches, sketch_color
+        sketch_profile.Edges, "Unfold_Sketch", existing_sketches, sketch_color, doc
     )
     sketch_objects_list = [sketch_doc_obj]
     # bend lines are sometimes not present
@@ -1411,6 +1507,7 @@ def getUnfoldSketches(
             "Unfold_Sketch_Bends",
             existing_sketches,
             bend_sketch_color,
+            doc,
         )
         bend_lines_doc_obj.ViewObject.DrawStyle = "Dashdot"
         sketch_objects_list.append(bend_lines_doc_obj)
@@ -1422,6 +1519,7 @@ def getUnfoldSketches(
             "Unfold_Sketch_Internal",
             existing_sketches,
             internal_sketch_color,
+            doc,
         )
         sketch_objects_list.append(inner_lines_doc_obj)
     if hole_wires:
@@ -1431,6 +1529,7 @@ def getUnfoldSketches(
             "Unfold_Sketch_Holes",
             existing_sketches,
             internal_sketch_color,
+            doc,
         )
         sketch_objects_list.append(hole_lines_doc_obj)
     return sketch_objects_list
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  SheetMetalParallel.py
+#
+#  Copyright 2025 Shai Seger <shaise at gmail dot com>
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+###################################################################################
+
+# Process pool for running independent OCC operations in parallel.
+# OCC calls hold the Python GIL, so threads do not help here. Shapes are passed
+# to the worker processes as BREP strings.
+# This module is imported by the worker processes, so it must not import
+# any FreeCAD gui module at the top level.
+
+import os
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+smPool = None
+smPoolFailed = False
+
+
+def getWorkerCount():
+    import FreeCAD
+    params = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/SheetMetal")
+    count = params.GetInt("ParallelWorkers", 0)  # 0 = automatic
+    if count <= 0:
+        count = max(1, (os.cpu_count() or 2) - 1)
+    return count
+
+
+def _findPythonExecutable():
+    ''' Worker processes are started with a plain python interpreter,
+        not with the FreeCAD executable '''
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    import FreeCAD
+    binPath = os.path.join(FreeCAD.getHomePath(), "bin")
+    for name in ("python.exe", "python3", "python"):
+        path = os.path.join(binPath, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def getPool():
+    ''' Get the process pool, create it on first use.
+        Returns None if a pool can not be used on this system '''
+    global smPool, smPoolFailed
+    if smPool is not None or smPoolFailed:
+        return smPool
+    try:
+        executable = _findPythonExecutable()
+        if executable is None:
+            raise RuntimeError("No python interpreter found for worker processes")
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(executable)
+        smPool = ProcessPoolExecutor(getWorkerCount(), mp_context=context)
+    except Exception as e:
+        import FreeCAD
+        FreeCAD.Console.PrintWarning(
+            f"SheetMetal: parallel processing is not available ({e})\n")
+        smPoolFailed = True
+        smPool = None
+    return smPool
+
+
+def shutdownPool():
+    global smPool
+    if smPool is not None:
+        smPool.shutdown(wait=False)
+        smPool = None
+
+
+def shapeToBrep(shape):
+    return shape.exportBrepToString()
+
+
+def brepToShape(brep):
+    import Part
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    return shape
+
+
+def parallelMap(worker, argsList):
+    ''' Run worker(*args) for every args item in the process pool.
+        Returns the list of results in order, or None if the pool is not
+        available, in which case the caller should run the work serially.
+        Exceptions raised by a worker are propagated to the caller '''
+    global smPoolFailed
+    if len(argsList) < 2:
+        return None
+    pool = getPool()
+    if pool is None:
+        return None
+    try:
+        futures = [pool.submit(worker, *args) for args in argsList]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        import FreeCAD
+        FreeCAD.Console.PrintWarning(
+            "SheetMetal: parallel processing failed, falling back to serial processing\n")
+        shutdownPool()
+        smPoolFailed = True
+        return None
+
+
+def parallelImap(worker, argsList, parallel = True):
+    ''' Run worker(*args) for every args item, yielding (index, result, error) as each
+        worker finishes. Runs serially in this process if parallel is False or the pool is
+        not available. An exception raised by a worker is yielded as its error '''
+    global smPoolFailed
+    pending = set(range(len(argsList)))
+    pool = getPool() if parallel and len(argsList) > 1 else None
+    if pool is not None:
+        try:
+            futures = {pool.submit(worker, *argsList[index]): index for index in pending}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result, error = future.result(), None
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    result, error = None, e
+                pending.discard(index)
+                yield index, result, error
+        except BrokenProcessPool:
+            import FreeCAD
+            FreeCAD.Console.PrintWarning(
+                "SheetMetal: parallel processing failed, falling back to serial processing\n")
+            shutdownPool()
+            smPoolFailed = True
+    for index in sorted(pending):
+        try:
+            yield index, worker(*argsList[index]), None
+        except Exception as e:
+            yield index, None, e
+
+
+##########################################################################################################
+# Workers. Executed in the pool processes
+##########################################################################################################
+
+def offsetShapeWorker(brep, offset, tolerance = 0.0, fill = False):
+    shape = brepToShape(brep)
+    return shapeToBrep(shape.makeOffsetShape(offset, tolerance, fill=fill))
+
+
+def makeOffsetShapes(shapes, offsets, tolerance = 0.0, fill = False, parallel = False):
+    ''' Offset each shape with the matching offset value, in parallel if requested
+        and possible. Returns the list of offset shapes '''
+    if parallel:
+        argsList = [(shapeToBrep(shape), offset, tolerance, fill)
+                    for shape, offset in zip(shapes, offsets)]
+        results = parallelMap(offsetShapeWorker, argsList)
+        if results is not None:
+            return [brepToShape(brep) for brep in results]
+    return [shape.makeOffsetShape(offset, tolerance, fill=fill)
+            for shape, offset in zip(shapes, offsets)]
+
+
+def makeJunctionTool(face1, face2, gap):
+    ''' Tool solid that opens a gap of the given size between two faces meeting at an edge '''
+    joinface = face1.fuse(face2)
+    filletedface = joinface.makeFillet(gap, joinface.Edges)
+    offsetsolid1 = face1.cut(filletedface).makeOffsetShape(-gap, 0.0, fill=True)
+    offsetsolid2 = face2.cut(filletedface).makeOffsetShape(-gap, 0.0, fill=True)
+    return offsetsolid1.fuse(offsetsolid2)
+
+
+def junctionToolWorker(brep1, brep2, gap):
+    return shapeToBrep(makeJunctionTool(brepToShape(brep1), brepToShape(brep2), gap))
+
+
+def makeJunctionTools(facePairs, gap, parallel = False):
+    ''' Junction tool solids for a list of face pairs, in parallel if requested and
+        possible '''
+    if parallel:
+        argsList = [(shapeToBrep(face1), shapeToBrep(face2), gap) for face1, face2 in facePairs]
+        results = parallelMap(junctionToolWorker, argsList)
+        if results is not None:
+            return [brepToShape(brep) for brep in results]
+    return [makeJunctionTool(face1, face2, gap) for face1, face2 in facePairs]
+
+
+def getBendAllowanceArgs(bac):
+    ''' K-factor standard, radius/thickness ratios and K-factors of a bend allowance
+        calculator, as a hashable tuple '''
+    standard = "ansi" if bac.k_factor_standard == bac.KFactorStandard.ANSI else "din"
+    return (standard, tuple(bac.radius_thickness_values), tuple(bac.k_factor_values))
+
+
+def getUnfoldArgs(shape, placement, faceName, bac):
+    ''' Arguments of a V2 unfold that can be passed to a worker process '''
+    return (shapeToBrep(shape), tuple(placement.toMatrix().A), faceName,
+            *getBendAllowanceArgs(bac))
+
+
+def _unfold(brep, matrix, faceName, standard, ratios, kFactors):
+    import FreeCAD
+    import SheetMetalNewUnfolder
+    bac = SheetMetalNewUnfolder.BendAllowanceCalculator.from_k_factor_lookup(
+        dict(zip(ratios, kFactors)), standard)
+    placement = FreeCAD.Placement(FreeCAD.Matrix(*matrix))
+    return SheetMetalNewUnfolder.getUnfoldFromShape(
+        bac, brepToShape(brep), placement, faceName)
+
+
+def unfoldWorker(brep, matrix, faceName, standard, ratios, kFactors):
+    face, unfolded, bendLines, normal = _unfold(
+        brep, matrix, faceName, standard, ratios, kFactors)
+    return (shapeToBrep(face), shapeToBrep(unfolded), shapeToBrep(bendLines),
+            (normal.x, normal.y, normal.z))
+
+
+def flatPatternWorker(flatBreps, normal, unfoldArgs):
+    ''' Flat pattern primitives of a stored unfold result (flatBreps and normal), or of a
+        new unfold (unfoldArgs) '''
+    import FreeCAD
+    import SheetMetalFlatExport
+    if unfoldArgs is not None:
+        face, unfolded, bendLines, normal = _unfold(*unfoldArgs)
+    else:
+        face, unfolded, bendLines = [brepToShape(brep) for brep in flatBreps]
+        normal = FreeCAD.Vector(*normal)
+    return SheetMetalFlatExport.getFlatPatternPrimitives(face, unfolded, bendLines, normal)
+
+
+def makeUnfolds(jobs):
+    ''' V2 unfold of a list of (shape, placement, faceName, bendAllowanceCalculator) jobs
+        in the process pool. Returns the list of (face, unfoldedShape, bendLines, normal)
+        results, or None if the pool is not available '''
+    import FreeCAD
+    argsList = [getUnfoldArgs(*job) for job in jobs]
+    results = parallelMap(unfoldWorker, argsList)
+    if results is None:
+        return None
+    return [(brepToShape(face), brepToShape(unfolded), brepToShape(bendLines),
+             FreeCAD.Vector(*normal)) for face, unfolded, bendLines, normal in results]
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  SheetMetalProfileMap.py
+#
+#  Copyright 2025 Shai Seger <shaise at gmail dot com>
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+###################################################################################
+
+# Maps a planar profile drawn on a flat face of a sheet metal part onto the
+# folded part, following the profile across the bends. Used by the sketch on
+# sheet metal and the corner relief features.
+# The bend analysis of a base shape is computed analytically and cached per base
+# shape, so the features built on the same base share it.
+
+import math
+from collections import OrderedDict
+import Part
+import SheetMetalTools
+import SheetMetalBendSolid
+
+smEpsilon = SheetMetalTools.smEpsilon
+# distance tolerance used to check that a rotated profile lies on a flat face
+smProfileTolerance = 1e-3
+# profile maps of the recently used base shapes
+smProfileMapCacheSize = 8
+smProfileMaps = OrderedDict()
+
+
+def bendAngle(theFace, edge_vec):
+    # Start to investigate the angles at self.__Shape.Faces[face_idx].ParameterRange[0]
+    angle_0 = theFace.ParameterRange[0]
+    angle_1 = theFace.ParameterRange[1]
+
+    # idea: identify the angle at edge_vec = P_edge.Vertexes[0].copy().Point
+    # This will be = angle_start
+    # calculate the tan_vec from valueAt
+    edgeAngle, edgePar = theFace.Surface.parameter(edge_vec)
+
+    if SheetMetalTools.smIsEqualAngle(angle_0, edgeAngle):
+        angle_start = angle_0
+        angle_end = angle_1
+    else:
+        angle_start = angle_1
+        angle_end = angle_0
+    bend_angle = angle_end - angle_start
+
+    if bend_angle < 0.0:
+        bend_angle = -bend_angle
+    return math.degrees(bend_angle)
+
+
+def isOuterBendFace(cylface):
+    ''' True if the cylindrical face is the outer face of a bend, meaning its normal
+        points away from the bend axis. This replaces offsetting the face by the
+        thickness and comparing areas '''
+    u0, u1, v0, v1 = cylface.ParameterRange
+    u = (u0 + u1) / 2.0
+    v = (v0 + v1) / 2.0
+    radial = cylface.valueAt(u, v) - cylface.Surface.Center
+    axis = cylface.Surface.Axis
+    radial = radial - axis * radial.dot(axis)
+    return cylface.normalAt(u, v).dot(radial) > 0.0
+
+
+class SMBendCrossing:
+    ''' Analysis of a bend, seen from the flat face that ends at bendEdge '''
+    def __init__(self, bendEdge, cylface, normal, thk):
+        self.axis = cylface.Surface.Axis
+        self.center = cylface.Surface.Center
+        self.angle = bendAngle(cylface, self.center)
+        self.flipped = isOuterBendFace(cylface)
+        if self.flipped:
+            self.radius = cylface.Surface.Radius - thk
+        else:
+            self.radius = cylface.Surface.Radius
+
+        # In the plane of the flat face, the unfolded bend lies on the side of the
+        # bend edge that the cylindrical face curves to
+        self.faceNormal = normal.cross(self.axis).normalize()
+        self.rotationAxis = self.axis * -1
+        u0, u1, v0, v1 = cylface.ParameterRange
+        bendMid = cylface.valueAt((u0 + u1) / 2.0, (v0 + v1) / 2.0)
+        edgeMid = bendEdge.valueAt((bendEdge.FirstParameter + bendEdge.LastParameter) / 2.0)
+        if (bendMid - edgeMid).dot(self.faceNormal) > 0.0:
+            self.faceNormal = self.faceNormal * -1
+            self.rotationAxis = self.axis
+        self.rotationAngle = -self.angle if self.flipped else self.angle
+
+    def neutralRadius(self, thk, kfactor):
+        return self.radius + kfactor * thk
+
+    def unfoldLength(self, thk, kfactor):
+        return self.neutralRadius(thk, kfactor) * abs(self.angle) * math.pi / 180.0
+
+
+class SMProfileMap:
+    ''' Bend structure of a sheet metal shape. The shape is owned by the map, features
+        using the map should take their faces and edges from profileMap.shape '''
+    def __init__(self, shape):
+        self.shape = shape
+        self.edgeFaces = {}
+        for face in shape.Faces:
+            for edge in face.Edges:
+                self.edgeFaces.setdefault(edge.hashCode(), []).append((edge, face))
+        self.bends = {}
+        self.thicknesses = {}
+
+    def facesOfEdge(self, edge):
+        bucket = self.edgeFaces.get(edge.hashCode(), [])
+        faces = []
+        for bucketEdge, face in bucket:
+            if bucketEdge.isSame(edge) and not any(face.isSame(f) for f in faces):
+                faces.append(face)
+        return faces
+
+    def bendFaceOfEdge(self, edge):
+        for face in self.facesOfEdge(edge):
+            if issubclass(type(face.Surface), Part.Cylinder):
+                return face
+        return None
+
+    def getThickness(self, face):
+        key = face.hashCode()
+        if key not in self.thicknesses:
+            self.thicknesses[key] = SheetMetalTools.smGetThickness(self.shape, face)
+        return self.thicknesses[key]
+
+    def getBend(self, bendEdge, cylface, thk):
+        key = (bendEdge.hashCode(), cylface.hashCode(), round(thk, 6))
+        bend = self.bends.get(key)
+        if bend is None:
+            normal = None
+            for planeface in self.facesOfEdge(bendEdge):
+                if issubclass(type(planeface.Surface), Part.Plane):
+                    normal = planeface.normalAt(0, 0)
+                    break
+            if normal is None:
+                return None
+            bend = SMBendCrossing(bendEdge, cylface, normal, thk)
+            self.bends[key] = bend
+        return bend
+
+    def findBendEdge(self, profile, topFace):
+        ''' Find the edge of topFace, that leads to a bend and is crossed by the profile '''
+        box = profile.BoundBox
+        box.enlarge(smEpsilon)
+        for edge in topFace.Edges:
+            if not box.intersect(edge.BoundBox):
+                continue
+            cylface = self.bendFaceOfEdge(edge)
+            if cylface is None:
+                continue
+            if edge.common(profile).Edges:
+                return edge, cylface
+        return None, None
+
+    def findNextFace(self, cylface, bendEdge, profile):
+        ''' Find the flat face on the other side of the bend, that the profile lies on '''
+        points = [vert.Point for vert in profile.Vertexes]
+        for edge in cylface.Edges:
+            if edge.isSame(bendEdge) or not isinstance(edge.Curve, Part.Line):
+                continue
+            for face in self.facesOfEdge(edge):
+                if face.isSame(cylface) or not issubclass(type(face.Surface), Part.Plane):
+                    continue
+                position = face.Surface.Position
+                axis = face.Surface.Axis
+                if all(abs((p - position).dot(axis)) < smProfileTolerance for p in points):
+                    return face
+        return SheetMetalTools.smGetIntersectingFace(profile, self.shape)
+
+    def mapProfile(self, profile, topFace, thk, kfactor):
+        ''' Follow the parts of a planar profile, that extend beyond topFace, across the
+            bends. Returns a list of solids, for each bend and each flat face reached '''
+        solids = []
+        balance = profile
+        for _ in range(len(self.shape.Faces)):
+            if not balance.Faces:
+                break
+            bendEdge, cylface = self.findBendEdge(balance, topFace)
+            if bendEdge is None:
+                break
+            bend = self.getBend(bendEdge, cylface, thk)
+            if bend is None:
+                break
+            unfoldLength = bend.unfoldLength(thk, kfactor)
+            bendArea = bendEdge.extrude(bend.faceNormal * -unfoldLength)
+            bendFace = balance.common(bendArea)
+            if not bendFace.Faces:
+                break
+            solids.append(SheetMetalBendSolid.bend_solid(
+                bendFace.Faces[0],
+                bendEdge,
+                bend.radius,
+                thk,
+                bend.neutralRadius(thk, kfactor),
+                bend.axis,
+                bend.flipped,
+            ))
+
+            # Bring the rest of the profile to the flat face after the bend
+            nextProfile = balance.cut(bendFace)
+            if not nextProfile.Faces:
+                break
+            nextProfile.translate(bend.faceNormal * unfoldLength)
+            nextProfile.rotate(bend.center, bend.rotationAxis, bend.rotationAngle)
+            topFace = self.findNextFace(cylface, bendEdge, nextProfile)
+            if topFace is None:
+                break
+            flatFace = nextProfile.common(topFace)
+            if flatFace.Faces:
+                balance = nextProfile.cut(flatFace)
+                solids.append(flatFace.extrude(topFace.normalAt(0, 0) * -thk))
+            else:
+                balance = nextProfile
+        return solids
+
+
+def smGetProfileMap(shape) -> SMProfileMap:
+    ''' Get the profile map of a shape, maps of recently used shapes are reused '''
+    key = shape.hashCode()
+    cached = smProfileMaps.get(key)
+    if cached is not None and cached[0].isSame(shape):
+        smProfileMaps.move_to_end(key)
+        return cached[1]
+    profileMap = SMProfileMap(shape.copy())
+    smProfileMaps[key] = (shape, profileMap)
+    if len(smProfileMaps) > smProfileMapCacheSize:
+        smProfileMaps.popitem(last = False)
+    return profileMap
+
+
+def smFuseProfileSolids(solids):
+    ''' Combine the solids of a mapped profile into one cutting tool '''
+    tool = SheetMetalTools.smFuseShapes(solids)
+    if tool is not None and len(solids) > 1:
+        tool = tool.removeSplitter()
+    return tool
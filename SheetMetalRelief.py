@@ -30,7 +30,7 @@ import SheetMetalTools
 
 # IMPORTANT: please remember to change the element map version in case of any
 # changes in modeling logic
-smElementMapVersion = 'sm1.'
+smElementMapVersion = 'sm2.'
 smEpsilon = SheetMetalTools.smEpsilon
 smSolidCornerReliefDefaultVars = [("relief", "defaultCornerRelief")]
 
@@ -89,7 +89,8 @@ def smMakeFace(vertex, face, edges, relief):
 
 def smRelief(relief=2.0, selVertexNames=' ', MainObject=None):
 
-    resultSolid = MainObject
+    # all tools are built from the base shape, and cut from it at once
+    cutsolids = []
     for selVertexName in selVertexNames:
         vertex = MainObject.getElement(
             SheetMetalTools.getElementFromTNP(selVertexName))
@@ -108,10 +109,12 @@ def smRelief(relief=2.0, selVertexNames=' ', MainObject=None):
 
         cutsolid = extsolidlist[0].multiFuse(extsolidlist[1:])
         # Part.show(cutsolid,'cutsolid')
-        cutsolid = cutsolid.removeSplitter()
-        resultSolid = resultSolid.cut(cutsolid)
-        # Part.show(resultsolid,'resultsolid')
+        cutsolids.append(cutsolid.removeSplitter())
 
+    if not cutsolids:
+        return MainObject
+    resultSolid = MainObject.cut(cutsolids)
+    # Part.show(resultsolid,'resultsolid')
     return resultSolid
 
 
@@ -151,6 +154,7 @@ class SMRelief:
 if SheetMetalTools.isGuiLoaded():
     from PySide import QtCore, QtGui
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
 
@@ -201,12 +205,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Relief command"""
 
         def GetResources(self):
-            return {'Pixmap': os.path.join(icons_path, 'SheetMetal_AddRelief.svg'),  # the name of a svg file available in the resources
-                    'MenuText': FreeCAD.Qt.translate('SheetMetal', 'Make Relief'),
-                    'Accel': "S, R",
-                    'ToolTip': FreeCAD.Qt.translate('SheetMetal', 'Modify an Individual solid corner to create Relief.\n'
-                                                    '1. Select Vertex(es) to create Relief on Solid corner Vertex(es).\n'
-                                                    '2. Use Property editor to modify default parameters')}
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_AddRelief")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -228,4 +227,4 @@ if SheetMetalTools.isGuiLoaded():
                     return False
             return True
 
-    Gui.addCommand("SheetMetal_AddRelief", AddReliefCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_AddRelief", AddReliefCommandClass())
@@ -23,10 +23,13 @@
 #
 ##############################################################################
 
+import bisect
 import math
 import os
 import re
 import importlib
+import weakref
+from collections import OrderedDict
 import FreeCAD
 import importDXF
 import importSVG
@@ -42,6 +45,8 @@ params = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/SheetMetal")
 smEpsilon = FreeCAD.Base.Precision.approximation()
 smForceRecompute = False
 smObjectsToRecompute = set()
+smPreviewMode = False
+smPreviewObjects = []
 translatedPreviewText = translate("SheetMetalTools", "Preview")
 cancelText = translate("SheetMetalTools", "Cancel...")
 clearText = translate("SheetMetalTools", "Clear...")
@@ -391,47 +396,92 @@ if isGuiLoaded():
         button.setChecked(not sp.SelectState)
         return sp
 
-    def _taskRecomputeObject(obj):
+    class SMRecomputeScheduler:
+        """ Coalesces the recomputes requested by task panel edits. Each request restarts
+            the idle timer, when it expires every pending object is recomputed once.
+            The callbacks given with the requests run after the recompute, with the
+            latest value of each, so they see the recomputed state """
+        def __init__(self):
+            self.pending = []
+            self.callbacks = []
+            self.timer = None
+
+        def _getTimer(self):
+            if self.timer is None:
+                self.timer = QtCore.QTimer()
+                self.timer.setSingleShot(True)
+                self.timer.timeout.connect(self.flush)
+            return self.timer
+
+        def schedule(self, obj, callback = None, value = None):
+            delay = params.GetInt("RecomputeDelay", 300)
+            if delay <= 0:
+                try:  # avoid intermitant changes
+                    _taskDoRecomputeObject(obj)
+                except:
+                    pass
+                if callback is not None:
+                    callback(value)
+                return
+            if not any(obj is pendingObj for pendingObj in self.pending):
+                self.pending.append(obj)
+            if callback is not None:
+                self.callbacks = [item for item in self.callbacks if item[0] != callback]
+                self.callbacks.append((callback, value))
+            self._getTimer().start(delay)
+
+        def flush(self):
+            pending, callbacks = self.cancel()
+            for obj in pending:
+                try:  # the object may have been deleted meanwhile
+                    _taskDoRecomputeObject(obj)
+                except Exception:
+                    pass
+            _taskRunCallbacks(callbacks)
+
+        def cancel(self):
+            ''' Drop the pending requests, returns the pending objects and callbacks '''
+            if self.timer is not None:
+                self.timer.stop()
+            pending, self.pending = self.pending, []
+            callbacks, self.callbacks = self.callbacks, []
+            return pending, callbacks
+
+    smRecomputeScheduler = SMRecomputeScheduler()
+
+    def _taskDoRecomputeObject(obj):
         if hasattr(obj, "ManualRecompute") and obj.ManualRecompute:
             return
         if hasattr(obj, "recompute"):
             obj.recompute()
 
+    def _taskRunCallbacks(callbacks):
+        for callback, value in callbacks:
+            callback(value)
+
+    def _taskRecomputeObject(obj, callback = None, value = None):
+        smRecomputeScheduler.schedule(obj, callback, value)
+
     def _taskRecomputeDocument(obj = None):
-        if obj is not None:
-            if hasattr(obj, "ManualRecompute") and obj.ManualRecompute:
-                return
-            obj.Document.recompute()
-        else:
+        _pending, callbacks = smRecomputeScheduler.cancel()
+        if obj is None:
             FreeCAD.ActiveDocument.recompute()
+        elif not (hasattr(obj, "ManualRecompute") and obj.ManualRecompute):
+            obj.Document.recompute()
+        _taskRunCallbacks(callbacks)
 
     def _taskUpdateValue(value, obj, propName, callback):
         setattr(obj, propName, value)
-        try:  # avoid intermitant changes
-            _taskRecomputeObject(obj)
-        except:
-            pass
-        if callback is not None:
-            callback(value)
+        _taskRecomputeObject(obj, callback, value)
 
     def _taskUpdateSubValue(value, obj, prop, subPropName, callback):
         setattr(prop, subPropName, value)
-        try:  # avoid intermitant changes
-            _taskRecomputeObject(obj)
-        except:
-            pass
-        if callback is not None:
-            callback(value)
+        _taskRecomputeObject(obj, callback, value)
 
     def _taskUpdateColor(formvar, obj, objvar, callback):
         value = formvar.property("color").name()
         setattr(obj, objvar, value)
-        try:  # avoid intermitant changes
-            _taskRecomputeObject(obj)
-        except:
-            pass
-        if callback is not None:
-            callback(value)
+        _taskRecomputeObject(obj, callback, value)
 
     def _taskEditFinished(obj):
         if hasattr(obj, "Object"):
@@ -478,6 +528,8 @@ if isGuiLoaded():
         formvar.changed.connect(lambda: _taskUpdateColor(formvar, obj, propName, callback))
 
     def taskAccept(task):
+        smRecomputeScheduler.cancel()
+        smSetPreviewMode(False)
         for varname in vars(task).keys():
             var = getattr(task, varname)
             if isinstance(var, SMSelectionParameters) and not var.SelectState and not var.ToggleMode:
@@ -492,6 +544,8 @@ if isGuiLoaded():
         return True
 
     def taskReject(task):
+        smRecomputeScheduler.cancel()
+        smSetPreviewMode(False)
         smSelectNormal()
         smSingleSelObserver.selParams = None
         FreeCAD.ActiveDocument.abortTransaction()
@@ -573,6 +627,7 @@ if isGuiLoaded():
         FreeCAD.ActiveDocument.recompute()
         if taskPanel is not None:
             dialog = taskPanel(newObj)
+            smSetPreviewMode(True)
             Gui.Control.showDialog(dialog)
         return
     
@@ -663,10 +718,14 @@ if isGuiLoaded():
             if smIsPartDesign(self.Object):
                 self.Object.ViewObject.Visibility = True
             FreeCAD.ActiveDocument.openTransaction(self.Object.Name)
+            smSetPreviewMode(True)
             Gui.Control.showDialog(taskd)
             return True
 
         def unsetEdit(self, _vobj, _mode):
+            smRecomputeScheduler.cancel()
+            if smSetPreviewMode(False):
+                self.Object.Document.recompute()
             Gui.Control.closeDialog()
             if hasattr(self.Object, "baseObject"):
                 self.Object.baseObject[0].ViewObject.Visibility = False
@@ -685,6 +744,34 @@ else:
 def smStripTrailingNumber(item):
     return re.sub(r'\d+$', '', item)
 
+def smIsPreview(obj = None):
+    ''' True while a task panel is open and features should be computed at low fidelity,
+        skipping refinement, reliefs, perforations and sketches. obj is remembered and
+        recomputed in full when the preview ends '''
+    if not smPreviewMode:
+        return False
+    if obj is not None and not any(obj is o for o in smPreviewObjects):
+        smPreviewObjects.append(obj)
+    return True
+
+def smSetPreviewMode(enabled):
+    ''' Start or end the preview mode. When it ends, the objects computed in preview mode
+        are touched. Returns True if any object needs a recompute '''
+    global smPreviewMode, smPreviewObjects
+    if enabled:
+        smPreviewMode = params.GetBool("LowFidelityPreview", True)
+        return False
+    smPreviewMode = False
+    objects, smPreviewObjects = smPreviewObjects, []
+    touched = False
+    for obj in objects:
+        try:  # the object may have been deleted by an aborted transaction
+            obj.touch()
+            touched = True
+        except Exception:
+            pass
+    return touched
+
 def smAddToRecompute(obj):
     smObjectsToRecompute.add(obj)
 
@@ -906,32 +993,239 @@ def smGetFaceByEdge(selItem, obj):
         selFace = selItem
     return selFace
 
+# tolerance of the geometric prefilters of SMShapeQueryIndex. It only has to be loose
+# enough to never reject a real match, the exact check is still done by OCC
+smQueryTolerance = 1e-3
+smQueryIndexCacheSize = 8
+smQueryIndexes = OrderedDict()
+
+def _smPlaneOf(shape):
+    # (normal, distance) plane equation of a planar face, None for anything else
+    if not isinstance(shape, Part.Face) or not issubclass(type(shape.Surface), Part.Plane):
+        return None
+    normal = shape.Surface.Axis
+    return normal, normal.dot(shape.Surface.Position)
+
+def _smLineOf(shape):
+    # (point, direction) of a straight edge, None for anything else
+    if not isinstance(shape, Part.Edge) or not isinstance(shape.Curve, Part.Line):
+        return None
+    return shape.Vertexes[0].Point, shape.Curve.Direction
+
+def _smIsConicEdge(edge):
+    # lines and conics can only share a length with a plane or a line when their
+    # sample points lie on it, other curves are always kept as candidates
+    return isinstance(edge.Curve, (Part.Line, Part.Circle, Part.Ellipse))
+
+def _smEdgeSamplePoints(edge):
+    points = [vert.Point for vert in edge.Vertexes]
+    points.append(edge.valueAt((edge.FirstParameter + edge.LastParameter) / 2.0))
+    return points
+
+
+class SMShapeQueryIndex:
+    ''' Index of the faces and edges of a shape, used to find the faces or edges that
+        overlap a query shape without running a boolean on every one of them.
+        Candidates are selected by bounding box (boxes are sorted by XMin, so a query
+        only visits boxes that can overlap on X) and by a plane equation check, and
+        only the remaining candidates are checked with an OCC common() '''
+    def __init__(self, shape):
+        self.shape = shape
+        self.tolerance = max(smQueryTolerance, shape.getTolerance(1))
+        self.faces = shape.Faces
+        self.edges = shape.Edges
+        self.faceBoxes = self._buildBoxes(self.faces)
+        self.edgeBoxes = self._buildBoxes(self.edges)
+        self.facePlanes = [_smPlaneOf(face) for face in self.faces]
+
+    def _buildBoxes(self, shapes):
+        boxes = []
+        for shape in shapes:
+            box = shape.BoundBox
+            box.enlarge(self.tolerance)
+            boxes.append(box)
+        order = sorted(range(len(boxes)), key = lambda i: boxes[i].XMin)
+        return boxes, order, [boxes[i].XMin for i in order]
+
+    def _boxCandidates(self, indexBoxes, query):
+        boxes, order, xmins = indexBoxes
+        box = query.BoundBox
+        box.enlarge(self.tolerance)
+        last = bisect.bisect_right(xmins, box.XMax)
+        # return candidates in the shape order, so the first match stays the same
+        return sorted(i for i in order[:last] if boxes[i].intersect(box))
+
+    def _isOnPlane(self, points, plane):
+        normal, dist = plane
+        return all(abs(normal.dot(p) - dist) < self.tolerance for p in points)
+
+    def _isSamePlane(self, plane1, plane2):
+        normal1, dist1 = plane1
+        normal2, dist2 = plane2
+        dot = normal1.dot(normal2)
+        if abs(dot) < 1.0 - smQueryTolerance:
+            return False
+        return abs(dist1 - dist2 * dot) < self.tolerance
+
+    def _isOnLine(self, edge, line):
+        point, direction = line
+        for p in _smEdgeSamplePoints(edge):
+            if (p - point).cross(direction).Length > self.tolerance:
+                return False
+        return True
+
+    def _queryPlane(self, query):
+        # plane equation of a query made only of coplanar faces
+        if not query.Faces:
+            return None
+        planes = [_smPlaneOf(face) for face in query.Faces]
+        if all(planes) and all(self._isSamePlane(planes[0], p) for p in planes[1:]):
+            return planes[0]
+        return None
+
+    def candidateFaces(self, query):
+        ''' Faces that may share an area with the query shape '''
+        candidates = self._boxCandidates(self.faceBoxes, query)
+        queryPlane = self._queryPlane(query)
+        if queryPlane is not None:
+            # faces on other surface types, like planar BSplines, are kept
+            candidates = [i for i in candidates if self.facePlanes[i] is None
+                          or self._isSamePlane(self.facePlanes[i], queryPlane)]
+        return [self.faces[i] for i in candidates]
+
+    def candidateEdges(self, query):
+        ''' Edges that may share a length with the query shape '''
+        candidates = self._boxCandidates(self.edgeBoxes, query)
+        queryPlane = self._queryPlane(query)
+        queryLine = _smLineOf(query)
+        if queryPlane is not None:
+            candidates = [i for i in candidates if not _smIsConicEdge(self.edges[i])
+                          or self._isOnPlane(_smEdgeSamplePoints(self.edges[i]), queryPlane)]
+        elif queryLine is not None:
+            candidates = [i for i in candidates if not _smIsConicEdge(self.edges[i])
+                          or self._isOnLine(self.edges[i], queryLine)]
+        return [self.edges[i] for i in candidates]
+
+    def intersectingFace(self, query):
+        for face in self.candidateFaces(query):
+            if face.common(query).Faces:
+                return face
+        return None
+
+    def intersectingEdges(self, query, firstOnly = False):
+        edgelist = []
+        for edge in self.candidateEdges(query):
+            if edge.common(query).Edges:
+                edgelist.append(edge)
+                if firstOnly:
+                    break
+        return edgelist
+
+    def modifiedFace(self, query):
+        ''' Face of the shape that lies completely inside the query face '''
+        for face in self.candidateFaces(query):
+            face_common = face.common(query)
+            if face_common.Faces and face.Area == face_common.Faces[0].Area:
+                return face
+        return None
+
+
+def smGetShapeQueryIndex(shape) -> SMShapeQueryIndex:
+    '''Get the query index of a shape, indexes of recently used shapes are reused'''
+    key = shape.hashCode()
+    index = smQueryIndexes.get(key)
+    if index is not None and index.shape.isSame(shape):
+        smQueryIndexes.move_to_end(key)
+        return index
+    index = SMShapeQueryIndex(shape)
+    smQueryIndexes[key] = index
+    if len(smQueryIndexes) > smQueryIndexCacheSize:
+        smQueryIndexes.popitem(last = False)
+    return index
+
+# The lookups below return the last face/edge of obj when nothing overlaps, as the
+# original linear scans did
+
 def smGetIntersectingFace(Face, obj):
     # find Faces that overlap
-    face = None
-    for face in obj.Faces:
-        face_common = face.common(Face)
-        if face_common.Faces:
-            break
+    face = smGetShapeQueryIndex(obj).intersectingFace(Face)
+    if face is None and obj.Faces:
+        face = obj.Faces[-1]
     return face
 
 def smGetIntersectingEdge(Face, obj):
     # find an Edge that overlap
-    edge = None
-    for edge in obj.Edges:
-        face_common = edge.common(Face)
-        if face_common.Edges:
-            break
-    return edge
+    edgelist = smGetShapeQueryIndex(obj).intersectingEdges(Face, firstOnly = True)
+    if edgelist:
+        return edgelist[0]
+    return obj.Edges[-1] if obj.Edges else None
 
 def smGetAllIntersectingEdges(Face, obj):
     # find Edges that overlap
-    edgelist = []
-    for edge in obj.Edges:
-        face_common = edge.common(Face)
-        if face_common.Edges:
-            edgelist.append(edge)
-    return edgelist
+    return smGetShapeQueryIndex(obj).intersectingEdges(Face)
+
+def smModifiedFace(Face, obj):
+    # find face Modified During loop
+    face = smGetShapeQueryIndex(obj).modifiedFace(Face)
+    if face is None and obj.Faces:
+        face = obj.Faces[-1]
+    return face
+
+def smGetOverlapGroups(shapes, tolerance = smEpsilon):
+    '''Group shapes by overlapping bounding boxes. Returns a list of index lists,
+       shapes that are not in the same group are guaranteed not to touch'''
+    boxes = []
+    for shape in shapes:
+        box = shape.BoundBox
+        box.enlarge(tolerance)
+        boxes.append(box)
+    parent = list(range(len(shapes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # sort and sweep along the X axis
+    active = []
+    for i in sorted(range(len(boxes)), key = lambda n: boxes[n].XMin):
+        box = boxes[i]
+        active = [j for j in active if boxes[j].XMax >= box.XMin]
+        for j in active:
+            if box.intersect(boxes[j]):
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+        active.append(i)
+
+    groups = {}
+    for i in range(len(shapes)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+def smFuseShapes(shapes):
+    '''Fuse a list of shapes with a single general fuse operation.
+       Shapes that do not touch any other shape are not fused at all, they are
+       just added to the result compound, which is a valid boolean tool'''
+    shapes = [shape for shape in shapes if shape is not None and not shape.isNull()]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+    isolated = []
+    overlapping = []
+    for group in smGetOverlapGroups(shapes):
+        if len(group) == 1:
+            isolated.append(shapes[group[0]])
+        else:
+            overlapping += [shapes[i] for i in group]
+    if overlapping:
+        fused = overlapping[0].multiFuse(overlapping[1:])
+        if not isolated:
+            return fused
+        isolated.append(fused)
+    return Part.makeCompound(isolated)
 
 def smIsEqualAngle(ang1, ang2, p=5):
     # compares two angles with a given precision
@@ -956,6 +1250,83 @@ def smGetSubElementName(elementName : str) -> tuple:
     return FreeCAD.ActiveDocument.getObject(elementNames[0]), elementNames[1]
 
 
+def smGetShapeFingerprint(shape, precision = 6):
+    '''Get a hashable fingerprint of the shape geometry, to be used as a cache key.
+       Two shapes with the same topology counts, mass properties, bounding box and
+       vertex positions are considered identical'''
+    if shape is None or shape.isNull():
+        return None
+    box = shape.BoundBox
+    verts = sorted((round(v.X, precision), round(v.Y, precision), round(v.Z, precision))
+                   for v in shape.Vertexes)
+    return (
+        shape.ShapeType,
+        len(shape.Solids), len(shape.Faces), len(shape.Edges), len(verts),
+        round(shape.Volume, precision), round(shape.Area, precision),
+        round(box.XMin, precision), round(box.YMin, precision), round(box.ZMin, precision),
+        round(box.XMax, precision), round(box.YMax, precision), round(box.ZMax, precision),
+        hash(tuple(verts)),
+    )
+
+
+def smGetPartSignature(shape, placement, faceName, precision = 6):
+    '''Get a hashable signature of a part and one of its faces, independent of the part
+       placement. Copies of a part placed differently get the same signature, so their
+       unfolds from the same face are identical'''
+    if shape is None or shape.isNull():
+        return None
+    localShape = shape.transformed(placement.toMatrix().inverse())
+    fingerprint = smGetShapeFingerprint(localShape, precision)
+    face = localShape.getElement(faceName)
+    center = face.CenterOfMass
+    normal = face.normalAt(0, 0)
+    faceId = (
+        face.Surface.TypeId, round(face.Area, precision),
+        round(center.x, precision), round(center.y, precision), round(center.z, precision),
+        round(normal.x, precision), round(normal.y, precision), round(normal.z, precision),
+    )
+    return (fingerprint, faceId)
+
+
+class SMShapeCache:
+    ''' Keeps intermediate results of a feature recompute that depend only on its
+        base shape. All entries are dropped once the base key changes, each entry
+        can be further qualified by a sub key (e.g. a parameter it depends on) '''
+    def __init__(self):
+        self.key = None
+        self.entries = {}
+
+    def validate(self, key):
+        if key is None or key != self.key:
+            self.entries = {}
+        self.key = key
+
+    def get(self, slot, builder, subkey = None):
+        entry = self.entries.get(slot)
+        if self.key is not None and entry is not None and entry[0] == subkey:
+            return entry[1]
+        value = builder()
+        self.entries[slot] = (subkey, value)
+        return value
+
+    def clear(self):
+        self.key = None
+        self.entries = {}
+
+
+# caches are attached to feature proxies weakly so they are never serialized
+# with the document and go away together with the object
+smRecomputeCaches = weakref.WeakKeyDictionary()
+
+def smGetRecomputeCache(proxy) -> SMShapeCache:
+    '''Get the recompute cache attached to a feature proxy, create it if needed'''
+    cache = smRecomputeCaches.get(proxy)
+    if cache is None:
+        cache = SMShapeCache()
+        smRecomputeCaches[proxy] = cache
+    return cache
+
+
 def smConvertPlaneToFace(planeShape):
     '''Create a reference rectangular face to use instead of a datum/origin plane'''
     datump1 = FreeCAD.Vector(0, 0, 0) # Vertexes of the ref face
@@ -26,9 +26,13 @@
 
 import os
 import sys
+import time
+import weakref
 import Part
 import FreeCAD
+import SheetMetalFlatExport
 import SheetMetalKfactor
+import SheetMetalParallel
 import SheetMetalTools
 import SheetMetalUnfolder
 
@@ -78,6 +82,16 @@ smUnfoldNonSavedDefaultVars = [
 ]
 
 
+# unfold results computed in the task panel worker thread or in the bulk update
+# worker processes, by SMUnfold proxy. Used by the next recompute if the inputs did
+# not change meanwhile
+smBackgroundUnfolds = weakref.WeakKeyDictionary()
+# inputs of the last completed recompute, by SMUnfold proxy
+smUnfoldInputKeys = weakref.WeakKeyDictionary()
+# inputs and root face normal of the flat pattern stored with the document, by SMUnfold
+# proxy. The root face and bend lines are kept in the FlatPatternData property
+smStoredUnfolds = weakref.WeakKeyDictionary()
+
 GENSKETCHCOLOR = "#000080"
 OUTLINESKETCHCOLOR = "#c00000"
 BENDLINESKETCHCOLOR = "#ff5733"
@@ -87,6 +101,126 @@ KFACTOR = 0.40
 ##########################################################################################################
 # Helper functions
 ##########################################################################################################
+def _smKeyFromJson(value):
+    ''' Keys are tuples, json restores them as lists '''
+    if isinstance(value, list):
+        return tuple(_smKeyFromJson(item) for item in value)
+    return value
+
+
+def _smIsUpToDate(obj):
+    return not any("Touched" in o.State for o in [obj] + obj.OutListRecursive)
+
+
+def _smGetUnfoldJob(obj):
+    ''' Base object, root face and bend allowance of an unfold object '''
+    proxy = obj.Proxy
+    baseObj, baseFace = proxy.getBaseFace(obj)
+    return baseObj, baseFace, proxy.getBendAllowance(obj, baseObj, baseFace)
+
+
+def _smGroupIdenticalParts(objs, failed = None):
+    ''' Group the unfold objects of identical parts with the same material, the unfold of
+        a group is computed once and shared by its objects. Returns a list of
+        (objects, (baseObj, baseFace, bac)) groups, in the order of their first object.
+        Objects that can not be unfolded are added to failed as (object, error) '''
+    groups = {}
+    for obj in objs:
+        try:
+            job = _smGetUnfoldJob(obj)
+        except Exception as e:
+            if failed is not None:
+                failed.append((obj, e))
+            continue
+        baseObj, baseFace, bac = job
+        try:
+            signature = SheetMetalTools.smGetPartSignature(
+                baseObj.Shape, baseObj.Placement, baseFace)
+        except Exception:
+            signature = None  # not shared, errors are reported by the unfold itself
+        if signature is None:
+            key = obj
+        else:
+            key = (signature, SheetMetalParallel.getBendAllowanceArgs(bac))
+        groups.setdefault(key, ([], job))[0].append(obj)
+    return list(groups.values())
+
+
+def _smUnfoldJob(job):
+    baseObj, baseFace, bac = job
+    try:
+        return SheetMetalNewUnfolder.getUnfoldFromShape(
+            bac, baseObj.Shape, baseObj.Placement, baseFace)
+    except Exception:
+        return None  # errors are reported by the recompute
+
+
+def _smPrecomputeUnfolds(objs, stats, parallel):
+    ''' Unfold the given objects ahead of their recompute, each result is kept for the
+        next recompute of its object. Identical parts are unfolded once, in the process
+        pool if there is more than one unfold to do '''
+    groups = _smGroupIdenticalParts(
+        [obj for obj in objs if _smIsUpToDate(obj.Proxy.getBaseFace(obj)[0])])
+    stats.unique -= sum(len(members) - 1 for members, _job in groups)
+    jobs = [(baseObj.Shape, baseObj.Placement, baseFace, bac)
+            for _members, (baseObj, baseFace, bac) in groups]
+    results = None
+    if parallel and len(jobs) > 1:
+        try:
+            results = SheetMetalParallel.makeUnfolds(jobs)
+        except Exception as e:
+            FreeCAD.Console.PrintWarning(f"SheetMetal: parallel unfold failed ({e})\n")
+    if results is None:
+        # single unfolds are left to the recompute, only the shared ones are worth it
+        results = [_smUnfoldJob(job) if len(members) > 1 else None
+                   for members, job in groups]
+    for (members, _job), result in zip(groups, results):
+        if result is None:
+            continue
+        stats.unfolded += 1
+        for obj in members:
+            try:
+                baseObj, baseFace = obj.Proxy.getBaseFace(obj)
+                key = obj.Proxy.getUnfoldKey(obj, baseObj, baseFace)
+            except Exception:
+                continue  # errors are reported by the recompute
+            obj.Proxy.setBackgroundUnfold(key, result)
+
+
+def smUpdateUnfolds(objs, parallel = True):
+    ''' Recompute the given unfold objects, skipping the ones whose inputs did not change
+        since their last recompute. Only the stale unfolds and their dependencies are
+        recomputed, identical parts are unfolded once. Returns a SMBatchStats '''
+    startTime = time.perf_counter()
+    stats = SMBatchStats()
+    stale = []
+    for obj in objs:
+        baseObj, baseFace = obj.Proxy.getBaseFace(obj)
+        if _smIsUpToDate(baseObj) and not "Touched" in obj.State:
+            key = obj.Proxy.getUpdateKey(obj, baseObj, baseFace)
+            if key is not None and key == smUnfoldInputKeys.get(obj.Proxy):
+                SheetMetalTools.smRemoveFromRecompute(obj)
+                stats.skipped += 1
+                continue
+        stale.append(obj)
+    stats.parts = stats.unique = len(stale)
+    if stale and NewUnfolderAvailable and not SheetMetalTools.use_old_unfolder():
+        _smPrecomputeUnfolds(stale, stats, parallel)
+    docs = {}
+    for obj in stale:
+        docs.setdefault(obj.Document.Name, []).append(obj)
+    SheetMetalTools.smForceRecompute = True
+    try:
+        for docObjs in docs.values():
+            for obj in docObjs:
+                obj.touch()
+            docObjs[0].Document.recompute(docObjs)
+    finally:
+        SheetMetalTools.smForceRecompute = False
+    stats.seconds = time.perf_counter() - startTime
+    return stats
+
+
 def smUnfoldExportSketches(obj, useDialog = True):
     if len(obj.UnfoldSketches) == 0:
         return
@@ -105,6 +239,133 @@ def smUnfoldExportSketches(obj, useDialog = True):
     SheetMetalTools.smGuiExportSketch(sketches, exptype, filename, useDialog)
 
 
+def smGetUnfoldObjects(doc):
+    return [obj for obj in doc.Objects if isinstance(getattr(obj, "Proxy", None), SMUnfold)]
+
+
+def _smFlatPatternArgs(members, job):
+    ''' Arguments of SheetMetalParallel.flatPatternWorker for a group of identical parts.
+        A stored flat pattern of one of them is used if it is up to date, otherwise the
+        worker unfolds. Returns (args, isStored) '''
+    for obj in members:
+        proxy = obj.Proxy
+        baseObj, baseFace = proxy.getBaseFace(obj)
+        stored = proxy.getStoredUnfold(obj, proxy.getUnfoldKey(obj, baseObj, baseFace))
+        if stored is not None:
+            face, unfolded, bendLines, normal = stored
+            breps = [SheetMetalParallel.shapeToBrep(s) for s in (face, unfolded, bendLines)]
+            return (breps, tuple(normal), None), True
+    baseObj, baseFace, bac = job
+    unfoldArgs = SheetMetalParallel.getUnfoldArgs(
+        baseObj.Shape, baseObj.Placement, baseFace, bac)
+    return (None, None, unfoldArgs), False
+
+
+class SMBatchStats:
+    ''' Statistics of a batch run over unfold objects '''
+    def __init__(self):
+        self.parts = 0      # unfold objects processed
+        self.unique = 0     # distinct parts among them, identical parts are unfolded once
+        self.unfolded = 0
+        self.reused = 0     # stored flat patterns used
+        self.skipped = 0    # up to date objects, not processed
+        self.exported = 0
+        self.files = []
+        self.failed = []
+        self.seconds = 0.0
+
+    @property
+    def dedupRatio(self):
+        return self.parts / self.unique if self.unique > 0 else 1.0
+
+    def __str__(self):
+        text = (f"{self.parts} parts ({self.unique} unique, dedup ratio "
+                f"{self.dedupRatio:.2f}), {self.unfolded} unfolded, {self.reused} stored")
+        if self.skipped:
+            text += f", {self.skipped} up to date"
+        if self.files:
+            text += f", {self.exported} exported to {len(self.files)} files"
+        if self.failed:
+            text += ", failed: " + ", ".join(label for label, _error in self.failed)
+        return text + f", {self.seconds:.2f} s"
+
+
+def smExportFlatPatterns(objs, folder, fileType = "dxf", singleFile = False,
+                         fileName = None, parallel = True, progress = None):
+    ''' Export the flat patterns of the given unfold objects to DXF or SVG files, without
+        creating sketches. Writes one file per object, named after the document and the
+        object, or a single file holding all the parts side by side with a set of layers
+        per part. The flat patterns are computed in the process pool, once per set of
+        identical parts, and each file is written as soon as its part is ready.
+        progress(obj, path, error) is called for each object. Only the V2 unfolder is
+        supported. Returns a SMBatchStats '''
+    if not NewUnfolderAvailable:
+        raise RuntimeError("Batch export requires the V2 unfolder")
+    startTime = time.perf_counter()
+    stats = SMBatchStats()
+    docName = None
+    if objs:
+        doc = objs[0].Document
+        docName = os.path.splitext(os.path.basename(doc.FileName))[0] or doc.Name
+    failed = []
+    groups = []
+    argsList = []
+    for members, job in _smGroupIdenticalParts(objs, failed):
+        try:
+            args, isStored = _smFlatPatternArgs(members, job)
+        except Exception as e:
+            failed += [(obj, e) for obj in members]
+            continue
+        groups.append((members, job))
+        argsList.append(args)
+        if isStored:
+            stats.reused += 1
+        else:
+            stats.unfolded += 1
+    stats.parts = len(objs)
+    stats.unique = len(groups) + len(failed)
+    for obj, error in failed:
+        stats.failed.append((obj.Label, error))
+        if progress is not None:
+            progress(obj, None, error)
+    results = [None] * len(objs)
+    positions = {obj: position for position, obj in enumerate(objs)}
+    for index, result, error in SheetMetalParallel.parallelImap(
+            SheetMetalParallel.flatPatternWorker, argsList, parallel):
+        for obj in groups[index][0]:
+            path = None
+            if error is None:
+                layers, size = result
+                part = (obj.Label, layers, size)
+                results[positions[obj]] = part
+                if not singleFile:
+                    path = os.path.join(folder, f"{docName}-{obj.Name}.{fileType}")
+                    try:
+                        SheetMetalFlatExport.writeFlatPatternFile(path, [part], fileType)
+                    except OSError as e:
+                        path, error = None, e
+                    else:
+                        stats.files.append(path)
+            if error is None:
+                stats.exported += 1
+            else:
+                stats.failed.append((obj.Label, error))
+            if progress is not None:
+                progress(obj, path, error)
+    parts = [result for result in results if result is not None]
+    if singleFile and parts:
+        path = os.path.join(folder, fileName or f"{docName}-flat.{fileType}")
+        try:
+            SheetMetalFlatExport.writeFlatPatternFile(path, parts, fileType)
+        except OSError as e:
+            stats.failed.append((path, e))
+            stats.exported = 0
+        else:
+            stats.files.append(path)
+    stats.seconds = time.perf_counter() - startTime
+    return stats
+
+
 ##########################################################################################################
 # Object class
 ##########################################################################################################
@@ -187,6 +448,15 @@ class SMUnfold:
             "Hidden",
             attribs = 8, # Output only - no recompute if changed
         )
+        SheetMetalTools.smAddProperty(
+            obj,
+            "Part::PropertyPartShape",
+            "FlatPatternData",
+            translate("SheetMetal", "Root face and bend lines of the stored flat pattern"),
+            None,
+            "Hidden",
+            attribs = 8, # Output only - no recompute if changed
+        )
         # SheetMetalTools.smAddProperty(
         #     obj,
         #     "App::PropertyBool",
@@ -196,6 +466,34 @@ class SMUnfold:
         #     False
         # )
 
+    def __getstate__(self):
+        return self.dumps()
+
+    def __setstate__(self, state):
+        self.loads(state)
+
+    # dumps and loads replace __getstate__ and __setstate__ post v. 0.21.2
+    def dumps(self):
+        state = dict(self.__dict__)
+        stored = smStoredUnfolds.get(self)
+        if stored is not None:
+            state["StoredUnfold"] = stored
+        inputKey = smUnfoldInputKeys.get(self)
+        if inputKey is not None:
+            state["InputKey"] = inputKey
+        return state
+
+    def loads(self, state):
+        if state is None:
+            return
+        stored = state.pop("StoredUnfold", None)
+        inputKey = state.pop("InputKey", None)
+        self.__dict__.update(state)
+        if stored is not None:
+            smStoredUnfolds[self] = _smKeyFromJson(stored)
+        if inputKey is not None:
+            smUnfoldInputKeys[self] = _smKeyFromJson(inputKey)
+
     def getElementMapVersion(self, _fp, ver, _prop, restored):
         if not restored:
             return smElementMapVersion + ver
@@ -216,20 +514,105 @@ class SMUnfold:
             if not isVisible:
                 obj.Proxy.visibleSketches = visibleSketches
 
+    def getThickness(self, baseObject, baseFace):
+        ''' Sheet thickness, used to pick thickness specific library values '''
+        face = baseObject.Shape.getElement(baseFace)
+        return SheetMetalTools.smGetThickness(baseObject.Shape, face)
+
+    def skipSketches(self, obj):
+        ''' Sketches are not generated in preview mode, unless asked for explicitly '''
+        return obj.GenerateSketch and not SheetMetalTools.smForceRecompute and \
+            SheetMetalTools.smIsPreview(obj)
+
+    def getBendAllowance(self, obj, baseObject, baseFace):
+        if obj.MaterialSheet in ["_manual", "_none"]:
+            return BendAllowanceCalculator.from_single_value(obj.KFactor, obj.KFactorStandard)
+        if SheetMetalKfactor.isLibraryReference(obj.MaterialSheet):
+            lookup, standard = SheetMetalKfactor.getMaterialKFactorLookup(
+                obj.MaterialSheet, self.getThickness(baseObject, baseFace), obj.Document)
+            return BendAllowanceCalculator.from_k_factor_lookup(lookup, standard)
+        sheet = obj.Document.getObject(obj.MaterialSheet)
+        return BendAllowanceCalculator.from_spreadsheet(sheet)
+
+    def getBaseFace(self, obj):
+        baseObj, baseFace = SheetMetalTools.smGetSubElementName(obj.baseObject[1][0])
+        if baseObj is None:
+            baseObj = obj.baseObject[0]
+        return baseObj, baseFace
+
+    def getMaterialKey(self, obj):
+        if obj.MaterialSheet in ["_manual", "_none"]:
+            return None
+        try:
+            lookup, standard = SheetMetalKfactor.getMaterialKFactorLookup(
+                obj.MaterialSheet, doc=obj.Document)
+        except ValueError:
+            return None
+        return (tuple(sorted(lookup.items())), standard)
+
+    def getUnfoldKey(self, obj, baseObject, baseFace):
+        ''' Identifies the inputs of an unfold, None if they can not be identified '''
+        fingerprint = SheetMetalTools.smGetShapeFingerprint(baseObject.Shape)
+        if fingerprint is None:
+            return None
+        return (fingerprint, tuple(baseObject.Placement.toMatrix().A), baseFace,
+                obj.MaterialSheet, self.getMaterialKey(obj), obj.KFactor, obj.KFactorStandard)
+
+    def getUpdateKey(self, obj, baseObject, baseFace):
+        ''' Identifies all the inputs of a recompute, including the sketch options '''
+        key = self.getUnfoldKey(obj, baseObject, baseFace)
+        if key is None:
+            return None
+        return key + (obj.GenerateSketch, obj.SeparateSketchLayers,
+                      SheetMetalTools.use_old_unfolder())
+
+    def setBackgroundUnfold(self, key, result):
+        smBackgroundUnfolds[self] = (key, result)
+
+    def getStoredUnfold(self, obj, key):
+        ''' The flat pattern stored with the document, if it was made from the same inputs '''
+        stored = smStoredUnfolds.get(self)
+        if key is None or stored is None or stored[0] != key:
+            return None
+        data = obj.FlatPatternData
+        if data.isNull() or obj.Shape.isNull():
+            return None
+        sel_face, bend_lines = data.childShapes()
+        return sel_face, obj.Shape, bend_lines, FreeCAD.Vector(*stored[1])
+
+    def storeUnfold(self, obj, key, result):
+        sel_face, unfolded_shape, bend_lines, root_normal = result
+        if key is None or unfolded_shape is None:
+            self.clearStoredUnfold(obj)
+            return
+        obj.FlatPatternData = Part.makeCompound([sel_face, bend_lines])
+        smStoredUnfolds[self] = (key, tuple(root_normal))
+
+    def clearStoredUnfold(self, obj):
+        if smStoredUnfolds.pop(self, None) is not None:
+            obj.FlatPatternData = Part.Shape()
+
     def newUnfolder(self, obj, baseObject, baseFace):
         ''' Use new unfolder system '''
         FreeCAD.Console.PrintMessage("Using V2 unfolding system\n")
-        if obj.MaterialSheet in ["_manual", "_none"]:
-            bac = BendAllowanceCalculator.from_single_value(obj.KFactor, obj.KFactorStandard)
+        key = self.getUnfoldKey(obj, baseObject, baseFace)
+        background = smBackgroundUnfolds.pop(self, None)
+        if background is not None and background[0] is not None and background[0] == key:
+            result = background[1]
         else:
-            sheet = FreeCAD.ActiveDocument.getObject(obj.MaterialSheet)
-            bac = BendAllowanceCalculator.from_spreadsheet(sheet)
-        sel_face, unfolded_shape, bend_lines, root_normal = SheetMetalNewUnfolder.getUnfold(
-            bac, baseObject, baseFace
-        )
+            result = self.getStoredUnfold(obj, key)
+            if result is not None:
+                FreeCAD.Console.PrintMessage("Using stored flat pattern\n")
+            else:
+                bac = self.getBendAllowance(obj, baseObject, baseFace)
+                result = SheetMetalNewUnfolder.getUnfold(bac, baseObject, baseFace)
+        self.storeUnfold(obj, key, result)
+        sel_face, unfolded_shape, bend_lines, root_normal = result
 
         sketches = []
-        if obj.GenerateSketch and unfolded_shape is not None:
+        if self.skipSketches(obj):
+            sketches = None
+        elif obj.GenerateSketch and unfolded_shape is not None:
             sketches = SheetMetalNewUnfolder.getUnfoldSketches(
                 sel_face,
                 unfolded_shape, 
@@ -240,23 +623,31 @@ class SMUnfold:
                 obj.Proxy.SketchColor,
                 obj.Proxy.InternalColor,
                 obj.Proxy.BendLineColor,
+                obj.Document,
             )
         return unfolded_shape, sketches
 
     def oldUnfolder(self, obj, baseObject, baseFace):
         ''' Use old unfolder system '''
         FreeCAD.Console.PrintMessage("Using V1 unfolding system\n")
+        self.clearStoredUnfold(obj)
         kFactorTable = {1: obj.KFactor}
-        if obj.MaterialSheet != "_manual" and obj.MaterialSheet != "_none":
-            lookupTable = SheetMetalKfactor.KFactorLookupTable(obj.MaterialSheet)
+        kFactorStandard = obj.KFactorStandard
+        if SheetMetalKfactor.isLibraryReference(obj.MaterialSheet):
+            kFactorTable, kFactorStandard = SheetMetalKfactor.getMaterialKFactorLookup(
+                obj.MaterialSheet, self.getThickness(baseObject, baseFace), obj.Document)
+        elif obj.MaterialSheet != "_manual" and obj.MaterialSheet != "_none":
+            lookupTable = SheetMetalKfactor.getKFactorLookupTable(obj.MaterialSheet, obj.Document)
             kFactorTable = lookupTable.k_factor_lookup
 
         shape, foldComp, norm, _thename, _err_cd, _fSel, _obN = SheetMetalUnfolder.getUnfold(
-            kFactorTable, baseObject, baseFace, obj.KFactorStandard
+            kFactorTable, baseObject, baseFace, kFactorStandard
         )
 
         sketches = []
-        if obj.GenerateSketch and shape is not None:
+        if self.skipSketches(obj):
+            sketches = None
+        elif obj.GenerateSketch and shape is not None:
             sketches = SheetMetalUnfolder.getUnfoldSketches(
                 shape, 
                 foldComp.Edges,
@@ -266,21 +657,28 @@ class SMUnfold:
                 obj.Proxy.SketchColor,
                 bendSketchColor=obj.Proxy.InternalColor,
                 internalSketchColor=obj.Proxy.BendLineColor,
+                doc=obj.Document,
             )
         return shape, sketches
 
     def execute(self, fp):
         '''"Print a short message when doing a recomputation, this method is mandatory"'''
         self.addVerifyProperties(fp)
-        baseObj, baseFace = SheetMetalTools.smGetSubElementName(fp.baseObject[1][0])
-        if baseObj is None:
-            baseObj = fp.baseObject[0]
+        if fp.ManualRecompute and not SheetMetalTools.smForceRecompute:
+            # keep the current result until an explicit update
+            SheetMetalTools.smAddToRecompute(fp)
+            return
+        baseObj, baseFace = self.getBaseFace(fp)
         if not NewUnfolderAvailable or SheetMetalTools.use_old_unfolder():
             shape, sketches = self.oldUnfolder(fp, baseObj, baseFace)
         else:
             shape, sketches = self.newUnfolder(fp, baseObj, baseFace)
      
         fp.Shape = shape
+        if sketches is None:
+            # preview, keep the existing sketches until the full recompute
+            SheetMetalTools.smRemoveFromRecompute(fp)
+            return
         parent = SheetMetalTools.smGetParentBody(fp)
         sketchList = []
         for sketch in sketches:
@@ -297,6 +695,7 @@ class SMUnfold:
                     fp.Document.removeObject(item.Name)
 
         fp.UnfoldSketches = sketchList
+        smUnfoldInputKeys[self] = self.getUpdateKey(fp, baseObj, baseFace)
         SheetMetalTools.smRemoveFromRecompute(fp)
 
 
@@ -307,6 +706,7 @@ class SMUnfold:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
     from PySide import QtGui, QtCore
 
     mds_help_url = "https://github.com/shaise/FreeCAD_SheetMetal#material-definition-sheet"
@@ -337,6 +737,44 @@ if SheetMetalTools.isGuiLoaded():
     # Task Panel
     ##########################################################################################################
 
+    class SMUnfoldWorker(QtCore.QThread):
+        ''' Runs the V2 unfold of a shape copy in a worker thread.
+            It does not access the document, the result is applied by the task panel '''
+        progressChanged = QtCore.Signal(str, float)
+
+        def __init__(self, bac, shape, placement, faceName):
+            super().__init__()
+            self.args = (bac, shape, placement, faceName)
+            self.cancelled = False
+            self.result = None
+            self.error = None
+
+        def run(self):
+            try:
+                self.result = SheetMetalNewUnfolder.getUnfoldFromShape(
+                    *self.args, progress=self.reportProgress)
+            except SheetMetalNewUnfolder.UnfoldCancelled:
+                self.cancelled = True
+            except Exception as e:
+                self.error = e
+
+        def reportProgress(self, stage, fraction):
+            if self.cancelled:
+                raise SheetMetalNewUnfolder.UnfoldCancelled()
+            self.progressChanged.emit(stage, fraction)
+
+        def cancel(self):
+            self.cancelled = True
+
+    # progress bar range of each unfold stage
+    smUnfoldStages = {
+        "graph": (0, 10),
+        "bends": (10, 60),
+        "placement": (60, 80),
+        "cleanup": (80, 90),
+        "sketches": (90, 100),
+    }
+
     class SMUnfoldTaskPanel:
         ''' Task Panel for the unfold function '''
         def __init__(self, obj):
@@ -419,6 +857,9 @@ if SheetMetalTools.isGuiLoaded():
             SheetMetalTools.taskConnectCheck(obj, self.form.chkManualUpdate, "ManualRecompute", self.chkManualChanged)
             SheetMetalTools.taskConnectSpin(obj, self.form.floatKFactor, "KFactor")
             SheetMetalTools.taskConnectSpin(obj.Proxy, self.form.transSpin, "UnfoldTransparency", bindFunction = False)
+            self.worker = None
+            self.showProgress(False)
+            self.form.pushCancelUnfold.clicked.connect(self.cancelUnfold)
             self.form.pushUnfold.clicked.connect(self.unfoldPressed)
             self.form.pushExport.clicked.connect(self.doExport)
             self.form.availableMds.currentIndexChanged.connect(self.availableMdsChacnge)
@@ -452,6 +893,7 @@ if SheetMetalTools.isGuiLoaded():
 
         def recomputeObject(self, closeTask = False):
             SheetMetalTools.smForceRecompute = True
+            self.obj.touch()
             if closeTask:
                 SheetMetalTools.taskAccept(self)
             else:
@@ -463,6 +905,7 @@ if SheetMetalTools.isGuiLoaded():
         def accept(self):
             if not self.checkKFactorValid():
                 return False
+            self.stopBackgroundUnfold()
             self.recomputeObject(True)
             self.obj.ViewObject.Transparency = self.obj.Proxy.UnfoldTransparency
             SheetMetalTools.taskSaveDefaults(self.obj, smUnfoldDefaultVars)
@@ -472,6 +915,7 @@ if SheetMetalTools.isGuiLoaded():
             # kFactorTable = self.getKFactorTable()
 
         def reject(self):
+            self.stopBackgroundUnfold()
             FreeCAD.ActiveDocument.abortTransaction()
             Gui.Control.closeDialog()
             FreeCAD.ActiveDocument.recompute()
@@ -480,21 +924,25 @@ if SheetMetalTools.isGuiLoaded():
             smUnfoldExportSketches(self.obj)
 
         def populateMdsList(self):
-            sheetnames = SheetMetalKfactor.getSpreadSheetNames()
+            sheetnames = SheetMetalKfactor.getSpreadSheetNames(self.obj.Document)
+            libraryMaterials = SheetMetalKfactor.getLibraryMaterialNames()
             self.form.availableMds.clear()
 
             self.form.availableMds.addItem(translate("SheetMetal","Please select"))
             for mds in sheetnames:
                 if mds.Label.startswith("material_"):
                     self.form.availableMds.addItem(mds.Label)
+            for reference in libraryMaterials:
+                self.form.availableMds.addItem(reference)
             self.form.availableMds.addItem(translate("SheetMetal", "Manual K-Factor"))
 
+            materialCount = len(sheetnames) + len(libraryMaterials)
             selMdsIndex = self._getLastSelectedMdsIndex()
             if selMdsIndex > 0:
                 self.form.availableMds.setCurrentIndex(selMdsIndex)
-            elif len(sheetnames) == 1:
+            elif materialCount == 1:
                 self.form.availableMds.setCurrentIndex(1)
-            elif engineering_mode_enabled() or len(sheetnames) > 1:
+            elif engineering_mode_enabled() or materialCount > 1:
                 self.form.availableMds.setCurrentIndex(0)
             else:
                 self.form.availableMds.setCurrentIndex(1)
@@ -519,9 +967,77 @@ if SheetMetalTools.isGuiLoaded():
         def unfoldPressed(self):
             if not self.checkKFactorValid():
                 return False
+            if self.startBackgroundUnfold():
+                return
+            self.recomputeObject()
+            self.chkSketchChange()
+
+        def showProgress(self, show):
+            self.form.progressUnfold.setVisible(show)
+            self.form.pushCancelUnfold.setVisible(show)
+            self.form.pushUnfold.setEnabled(not show and self.obj.ManualRecompute)
+
+        def startBackgroundUnfold(self):
+            ''' Unfold in a worker thread, only the V2 unfolder supports it.
+                Returns False if the unfold should be done in the main thread '''
+            if self.worker is not None:
+                return True
+            if not NewUnfolderAvailable or SheetMetalTools.use_old_unfolder():
+                return False
+            proxy = self.obj.Proxy
+            baseObj, baseFace = proxy.getBaseFace(self.obj)
+            try:
+                bac = proxy.getBendAllowance(self.obj, baseObj, baseFace)
+                self.unfoldKey = proxy.getUnfoldKey(self.obj, baseObj, baseFace)
+            except Exception:
+                return False  # report the error through a normal recompute
+            if self.unfoldKey is None:
+                return False
+            self.worker = SMUnfoldWorker(bac, baseObj.Shape.copy(), baseObj.Placement, baseFace)
+            # the signals are emitted from the worker thread, handle them in the gui thread
+            self.worker.progressChanged.connect(self.unfoldProgress, QtCore.Qt.QueuedConnection)
+            self.worker.finished.connect(self.unfoldFinished, QtCore.Qt.QueuedConnection)
+            self.unfoldProgress("graph", 0.0)
+            self.showProgress(True)
+            self.worker.start()
+            return True
+
+        def unfoldProgress(self, stage, fraction):
+            start, end = smUnfoldStages[stage]
+            self.form.progressUnfold.setValue(int(start + (end - start) * fraction))
+            self.form.progressUnfold.setFormat(f"{stage} %p%")
+
+        def unfoldFinished(self):
+            worker, self.worker = self.worker, None
+            if worker is None:
+                return
+            if worker.cancelled:
+                self.showProgress(False)
+                SMLogger.message(translate("Logger", "Unfold cancelled"))
+                return
+            if worker.error is not None:
+                self.showProgress(False)
+                SMLogger.error(translate("Logger", "Unfold failed: ") + str(worker.error))
+                return
+            self.obj.Proxy.setBackgroundUnfold(self.unfoldKey, worker.result)
+            self.unfoldProgress("sketches", 0.0)
+            QtGui.QApplication.processEvents()
             self.recomputeObject()
+            self.showProgress(False)
             self.chkSketchChange()
 
+        def cancelUnfold(self):
+            if self.worker is not None:
+                self.worker.cancel()
+
+        def stopBackgroundUnfold(self):
+            ''' Cancel a running unfold and wait for the worker thread to end '''
+            worker, self.worker = self.worker, None
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+                self.showProgress(False)
+
         def availableMdsChacnge(self):
             self.form.groupManualFactor.setEnabled(self._isManualKSelected())
             self._updateSelectedMds()
@@ -536,24 +1052,11 @@ if SheetMetalTools.isGuiLoaded():
 
         def GetResources(self):
             __dir__ = os.path.dirname(__file__)
-            iconPath = os.path.join(__dir__, "Resources", "icons")
             # add translations path
             LanguagePath = os.path.join(__dir__, "translations")
             Gui.addLanguagePath(LanguagePath)
             Gui.updateLocale()
-            return {
-                "Pixmap": os.path.join(
-                    iconPath, "SheetMetal_Unfold.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": translate("SheetMetal", "Unfold"),
-                "Accel": "U",
-                "ToolTip": translate(
-                    "SheetMetal",
-                    "Flatten folded sheet metal object.\n"
-                    "1. Select flat face on sheetmetal shape.\n"
-                    "2. Change parameters from task Panel to create unfold Shape & Flatten drawing.",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_Unfold")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -582,52 +1085,84 @@ if SheetMetalTools.isGuiLoaded():
 
         def GetResources(self):
             __dir__ = os.path.dirname(__file__)
-            iconPath = os.path.join(__dir__, "Resources", "icons")
             # add translations path
             LanguagePath = os.path.join(__dir__, "translations")
             Gui.addLanguagePath(LanguagePath)
             Gui.updateLocale()
-            return {
-                "Pixmap": os.path.join(
-                    iconPath, "SheetMetal_UnfoldUpdate.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": translate("SheetMetal", "Unfold Update"),
-                "Accel": "UU",
-                "ToolTip": translate(
-                    "SheetMetal",
-                    "Update all unfold objects.\n"
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_UnfoldUpdate")
 
         def Activated(self):
-            SheetMetalTools.smForceRecompute = True
-            for obj in list(SheetMetalTools.smObjectsToRecompute):
-                obj.touch()
-            FreeCAD.ActiveDocument.recompute()
-            SheetMetalTools.smForceRecompute = False
+            stats = smUpdateUnfolds(list(SheetMetalTools.smObjectsToRecompute))
+            SMLogger.message(str(stats))
 
         def IsActive(self):
             return len(SheetMetalTools.smObjectsToRecompute) > 0
 
+    class SMBatchExportCommandClass:
+        """Export the flat patterns of all or the selected unfold objects"""
+
+        exportFormats = [
+            ("dxf", False),
+            ("dxf", True),
+            ("svg", False),
+            ("svg", True),
+        ]
+
+        def GetResources(self):
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_BatchExport")
+
+        def getObjects(self):
+            objs = [obj for obj in Gui.Selection.getSelection()
+                    if isinstance(getattr(obj, "Proxy", None), SMUnfold)]
+            return objs or smGetUnfoldObjects(FreeCAD.ActiveDocument)
+
+        def Activated(self):
+            objs = self.getObjects()
+            items = [
+                translate("SheetMetal", "DXF, one file per part"),
+                translate("SheetMetal", "DXF, single file"),
+                translate("SheetMetal", "SVG, one file per part"),
+                translate("SheetMetal", "SVG, single file"),
+            ]
+            item, ok = QtGui.QInputDialog.getItem(
+                Gui.getMainWindow(),
+                translate("SheetMetal", "Export flat patterns"),
+                translate("SheetMetal", "Export {} flat patterns as:").format(len(objs)),
+                items, 0, False)
+            if not ok:
+                return
+            fileType, singleFile = self.exportFormats[items.index(item)]
+            folder = QtGui.QFileDialog.getExistingDirectory(
+                Gui.getMainWindow(),
+                translate("SheetMetal", "Export flat patterns to"),
+                os.path.dirname(FreeCAD.ActiveDocument.FileName))
+            if not folder:
+                return
+
+            def progress(obj, path, error):
+                if error is not None:
+                    SMLogger.error(f"{obj.Label}: " + str(error))
+                elif path is not None:
+                    SMLogger.message(path)
+                QtGui.QApplication.processEvents()
+
+            QtGui.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+            try:
+                stats = smExportFlatPatterns(objs, folder, fileType, singleFile,
+                                             progress=progress)
+            finally:
+                QtGui.QApplication.restoreOverrideCursor()
+            SMLogger.message(str(stats))
+
+        def IsActive(self):
+            return FreeCAD.ActiveDocument is not None and NewUnfolderAvailable and \
+                len(smGetUnfoldObjects(FreeCAD.ActiveDocument)) > 0
+
     class SMUnfoldUnattendedCommandClass:
         """Unfold object"""
 
         def GetResources(self):
-            __dir__ = os.path.dirname(__file__)
-            iconPath = os.path.join(__dir__, "Resources", "icons")
-            return {
-                "Pixmap": os.path.join(
-                    iconPath, "SheetMetal_UnfoldUnattended.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": translate("SheetMetal", "Unattended Unfold"),
-                "Accel": "U",
-                "ToolTip": translate(
-                    "SheetMetal",
-                    "Flatten folded sheet metal object with default options\n"
-                    "1. Select flat face on sheetmetal shape.\n"
-                    "2. Click this command to unfold the object with last used parameters.",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_UnattendedUnfold")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -656,6 +1191,7 @@ if SheetMetalTools.isGuiLoaded():
             return isinstance(selFace.Surface, Part.Plane)
 
 
-    Gui.addCommand("SheetMetal_UnattendedUnfold", SMUnfoldUnattendedCommandClass())
-    Gui.addCommand("SheetMetal_Unfold", SMUnfoldCommandClass())
-    Gui.addCommand("SheetMetal_UnfoldUpdate", SMRecomputeUnfoldsCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_UnattendedUnfold", SMUnfoldUnattendedCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_Unfold", SMUnfoldCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_UnfoldUpdate", SMRecomputeUnfoldsCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_BatchExport", SMBatchExportCommandClass())
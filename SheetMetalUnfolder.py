@@ -129,8 +129,6 @@ from math import sqrt
 from SheetMetalLogger import SMLogger, UnfoldException, BendException, TreeException
 
 
-KFACTORSTANDARD = None
-
 # TODO: Error Codes
 # - Put error numbers into the text
 # - Put user help into more texts
@@ -320,14 +318,13 @@ class Simple_node(object):
     These new faces are added to the index list.
     """
 
-    global KFACTORSTANDARD
-
     def __init__(
         self,
         f_idx=None,
         Parent_node=None,
         Parent_edge=None,
         k_factor_lookup=None,
+        k_factor_standard="ansi",
     ):
         self.idx = f_idx  # Index of the "top-face"
         self.c_face_idx = (
@@ -362,6 +359,7 @@ class Simple_node(object):
         self.k_factor_lookup = (
             k_factor_lookup  # K-factor lookup dictionary, according to ANSI standard
         )
+        self.k_factor_standard = k_factor_standard  # "ansi" or "din"
         # new node features:
         self.nfIndexes = []  # List of all face-indexes of a node (flat and bend: folded state)
         self.seam_edges = []  # List with edges to seams
@@ -416,7 +414,7 @@ class Simple_node(object):
     def k_Factor(self):
         k = get_val_from_range(self.k_factor_lookup, self.innerRadius / self.thickness)
 
-        return k if KFACTORSTANDARD == "ansi" else k / 2
+        return k if self.k_factor_standard == "ansi" else k / 2
 
     @k_Factor.setter
     def k_Factor(self, val):
@@ -464,7 +462,7 @@ class SheetTree(object):
         print("index Unfold list:")
         print(self.index_unfold_list)
 
-    def __init__(self, TheShape, f_idx, k_factor_lookup, obj):
+    def __init__(self, TheShape, f_idx, k_factor_lookup, obj, k_factor_standard="ansi"):
         self.cFaceTol = 0.002  # tolerance to detect counter-face vertices
         # this high tolerance was needed for more real parts
         self.root = None  # make_new_face_node adds the root node if parent_node == None
@@ -473,6 +471,7 @@ class SheetTree(object):
         self.error_code = None
         self.failed_face_idx = None
         self.k_factor_lookup = k_factor_lookup
+        self.k_factor_standard = k_factor_standard
         self.wire_replacements = []  # list of wires to be replaced during unfold shape creation
 
         if not self.__Shape.isValid():
@@ -1092,7 +1091,9 @@ class SheetTree(object):
         # search the counter face, get axis of Face
         # In case of "Bend" get angle, k_factor and trans_length
         # put the node into the tree
-        newNode = Simple_node(face_idx, P_node, P_edge, self.k_factor_lookup)
+        newNode = Simple_node(
+            face_idx, P_node, P_edge, self.k_factor_lookup, self.k_factor_standard
+        )
 
         # This face should be a node in the tree, and is therefore known!
         # removed from the list of all unknown faces
@@ -2095,7 +2096,7 @@ class SheetTree(object):
         kFactor = bend_node.k_Factor
 
         transRad = bRad + kFactor * thick
-        if KFACTORSTANDARD == "din":
+        if self.k_factor_standard == "din":
             conv = ", converted from DIN"
         else:
             conv = ""
@@ -2854,9 +2855,6 @@ def sew_Shape(obj):
 ##
 
 def getUnfold(k_factor_lookup, solid, facename, kFactorStandard):
-    global KFACTORSTANDARD
-    KFACTORSTANDARD = kFactorStandard
-
     resPart = None
     normalVect = None
     folds = None
@@ -2873,7 +2871,7 @@ def getUnfold(k_factor_lookup, solid, facename, kFactorStandard):
     startzeit = time.process_time()
 
     TheTree = SheetTree(
-        solid.Shape, f_number, k_factor_lookup, solid
+        solid.Shape, f_number, k_factor_lookup, solid, kFactorStandard
     )  # initializes the tree-structure
     if TheTree.error_code is None:
         TheTree.Bend_analysis(
@@ -2937,10 +2935,12 @@ def getUnfold(k_factor_lookup, solid, facename, kFactorStandard):
         if TheTree.error_code == 1:
             warn_print("Error at Face" + str(TheTree.failed_face_idx + 1))
             warn_print("Trying to repeat the unfold process again with the Sewed copied Shape")
-            FreeCAD.ActiveDocument.openTransaction("sanitize")
+            doc = solid.Document
+            doc.openTransaction("sanitize")
             sewedShape = sew_Shape(solid)
             solid.Visibility = False
-            ob = Part.show(sewedShape,"Solid")
+            ob = doc.addObject("Part::Feature", "Solid")
+            ob.Shape = sewedShape
             ob.Label = solid.Label + "_copy"
             if SheetMetalTools.isGuiLoaded():
                 ob.ViewObject.ShapeColor = solid.ViewObject.ShapeColor
@@ -2948,8 +2948,7 @@ def getUnfold(k_factor_lookup, solid, facename, kFactorStandard):
                 ob.ViewObject.PointColor = solid.ViewObject.PointColor
                 ob.ViewObject.DiffuseColor = solid.ViewObject.DiffuseColor
                 ob.ViewObject.Transparency = solid.ViewObject.Transparency
-            FreeCAD.ActiveDocument.commitTransaction()
-            ob = FreeCAD.ActiveDocument.ActiveObject
+            doc.commitTransaction()
             ob_Name = ob.Name
             ob.Label = solid.Label + "_copy"
             faceSel = facename
@@ -2982,10 +2981,9 @@ def SMGetGeoSegment(e):
     return None
 
 
-def SMmakeSketchfromEdges(edges, name):
+def SMGetSketchGeometry(edges):
     precision = 0.1  # precision in Bspline to BiArcs
     quasidef = 0.01  # quasi deflection for Ellipses and Parabola
-    usk = FreeCAD.activeDocument().addObject("Sketcher::SketchObject", name)
     geo = []
     for e in edges:
         if isinstance(e.Curve, Part.BSplineCurve):
@@ -3006,7 +3004,14 @@ def SMmakeSketchfromEdges(edges, name):
             seg = SMGetGeoSegment(e)
             if seg is not None:
                 geo.append(seg)
-    usk.addGeometry(geo)
+    return geo
+
+
+def SMmakeSketchfromEdges(edges, name, doc=None):
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    usk = doc.addObject("Sketcher::SketchObject", name)
+    usk.addGeometry(SMGetSketchGeometry(edges))
     return usk
 
 
@@ -3019,6 +3024,7 @@ def getUnfoldSketches(
     sketchColor="#000080",
     bendSketchColor="#c00000",
     internalSketchColor="#ff5733",
+    doc=None,
 ):
     unfold_sketch = None
 
@@ -3039,7 +3045,9 @@ def getUnfoldSketches(
 
         if not splitSketches:
             edges.append(foldEdges)
-    unfold_sketch = generateSketch(edges, "Unfold_Sketch", sketchColor, existingSketches)
+    unfold_sketch = generateSketch(
+        edges, "Unfold_Sketch", sketchColor, existingSketches, doc, norm
+    )
     sketches = [unfold_sketch]
     if not splitSketches:
         return sketches
@@ -3067,7 +3075,7 @@ def getUnfoldSketches(
         faceEdgs = unfold_sketch.Shape.Edges
 
     unfold_sketch_outline = generateSketch(
-        owEdgs, "Unfold_Sketch_Outline", sketchColor, existingSketches
+        owEdgs, "Unfold_Sketch_Outline", sketchColor, existingSketches, doc, norm
     )
     sketches.append(unfold_sketch_outline)
 
@@ -3088,43 +3096,62 @@ def getUnfoldSketches(
             intEdgs.append(e)
     if len(intEdgs) > 0:
         unfold_sketch_internal = generateSketch(
-            intEdgs, "Unfold_Sketch_Internal", internalSketchColor, existingSketches
+            intEdgs, "Unfold_Sketch_Internal", internalSketchColor, existingSketches, doc, norm
         )
         sketches.append(unfold_sketch_internal)
 
     if len(foldLines) > 0 and splitSketches:
         unfold_sketch_bend = generateSketch(
-            foldEdges, "Unfold_Sketch_Bends", bendSketchColor, existingSketches
+            foldEdges, "Unfold_Sketch_Bends", bendSketchColor, existingSketches, doc, norm
         )
         sketches.append(unfold_sketch_bend)
 
     return sketches
 
 
-def generateSketch(edges, name, color, existingSketches = None):
+def getSketchPlacement(shape, norm = None):
+    ''' Placement of a sketch on the plane of the given planar edges, the same way
+        Draft.makeSketch places the sketches it creates. norm is used when the
+        edges do not define a plane '''
+    plane = shape.findPlane()
+    if plane is not None:
+        norm = plane.Axis
+    if norm is None or not shape.Vertexes:
+        return FreeCAD.Placement()
+    norm = FreeCAD.Vector(norm).normalize()
+    base = norm * shape.Vertexes[0].Point.dot(norm)
+    return FreeCAD.Placement(base, FreeCAD.Rotation(FreeCAD.Vector(0, 0, 1), norm))
+
+
+def generateSketch(edges, name, color, existingSketches = None, doc = None, norm = None):
     p = Part.makeCompound(edges)
-    doc = FreeCAD.ActiveDocument
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
     # See if there is an existing sketch with the same name and use it insted of creating
     if existingSketches is None:
         existingSketchName = ""
     else:
         existingSketchName =  next((item for item in existingSketches if item.startswith(name)), "")
-    existingSketch = doc.getObject(existingSketchName)
-    if existingSketch is not None:
-        existingSketch.deleteAllGeometry()
+    sk = doc.getObject(existingSketchName)
+    if sk is not None:
+        sk.deleteAllGeometry()
+    else:
+        # created here rather than by Draft.makeSketch, which uses the active document.
+        # Draft keeps the placement of the sketches passed with addTo
+        sk = doc.addObject("Sketcher::SketchObject", name)
+        sk.Label = name
+        sk.Placement = getSketchPlacement(p, norm)
 
     try:
-        sk = Draft.makeSketch(
-            p.Edges, autoconstraints=True, addTo=existingSketch, delete=False, name=name
+        Draft.makeSketch(
+            p.Edges, autoconstraints=True, addTo=sk, delete=False, name=name
         )
-        if existingSketch is None:
-            sk.Label = name
     except:
-        doc = FreeCAD.ActiveDocument
-        skb = doc.ActiveObject
-        doc.removeObject(skb.Name)
+        sk.deleteAllGeometry()
         SMLogger.warning(FreeCAD.Qt.translate("Logger", "discretizing Sketch"))
-        sk = SMmakeSketchfromEdges(p.Edges, name)
+        local = p.copy()
+        local.transformShape(sk.Placement.inverse().toMatrix())
+        sk.addGeometry(SMGetSketchGeometry(local.Edges))
 
     if FreeCAD.GuiUp:
         rgb_color = tuple(int(color[i : i + 2], 16) for i in (1, 3, 5))
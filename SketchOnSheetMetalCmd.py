@@ -28,50 +28,21 @@ import os
 import FreeCAD
 import Part
 import SheetMetalTools
-import SheetMetalBendSolid
+import SheetMetalProfileMap
 
 smEpsilon = SheetMetalTools.smEpsilon
 
-def bendAngle(theFace, edge_vec):
-    # Start to investigate the angles at self.__Shape.Faces[face_idx].ParameterRange[0]
-    # Part.show(theFace,"theFace")
-    # valuelist =  theFace.ParameterRange
-    # print(valuelist)
-    angle_0 = theFace.ParameterRange[0]
-    angle_1 = theFace.ParameterRange[1]
-
-    # idea: identify the angle at edge_vec = P_edge.Vertexes[0].copy().Point
-    # This will be = angle_start
-    # calculate the tan_vec from valueAt
-    edgeAngle, edgePar = theFace.Surface.parameter(edge_vec)
-    # print('the angles: ', angle_0, ' ', angle_1, ' ', edgeAngle, ' ', edgeAngle - 2*math.pi)
-
-    if SheetMetalTools.smIsEqualAngle(angle_0, edgeAngle):
-        angle_start = angle_0
-        angle_end = angle_1
-    else:
-        angle_start = angle_1
-        angle_end = angle_0
-    bend_angle = angle_end - angle_start
-    #  angle_tan = angle_start + bend_angle/6.0 # need to have the angle_tan before correcting the sign
-
-    if bend_angle < 0.0:
-        bend_angle = -bend_angle
-    # print(math.degrees(bend_angle))
-    return math.degrees(bend_angle)
-
-
 def smSketchOnSheetMetal(
     kfactor=0.5, sketch="", flipped=False, selFaceNames="", MainObject=None
 ):
-    resultSolid = MainObject.Shape.copy()
+    profileMap = SheetMetalProfileMap.smGetProfileMap(MainObject.Shape)
+    resultSolid = profileMap.shape
     selElement = resultSolid.getElement(SheetMetalTools.getElementFromTNP(selFaceNames[0]))
     LargeFace = SheetMetalTools.smGetFaceByEdge(selElement, resultSolid)
     sketch_face = Part.makeFace(sketch.Shape.Wires, "Part::FaceMakerBullseye")
 
     # To get thk of sheet, top face normal
-    thk = SheetMetalTools.smGetThickness(resultSolid, LargeFace)
-    # print(thk)
+    thk = profileMap.getThickness(LargeFace)
 
     # To get top face normal, flatsolid
     solidlist = []
@@ -87,111 +58,14 @@ def smSketchOnSheetMetal(
     # Part.show(Flatsolid,"Flatsolid")
     solidlist.append(Flatsolid)
 
-    if BalanceFaces.Faces:
-        for BalanceFace in BalanceFaces.Faces:
-            # Part.show(BalanceFace,"BalanceFace")
-            TopFace = LargeFace
-            # Part.show(TopFace,"TopFace")
-            # flipped = False
-            while BalanceFace.Faces:
-                BendEdge = SheetMetalTools.smGetIntersectingEdge(BalanceFace, TopFace)
-                # Part.show(BendEdge,"BendEdge")
-                facelist = resultSolid.ancestorsOfType(BendEdge, Part.Face)
-
-                # To get bend radius, bend angle
-                for cylface in facelist:
-                    if issubclass(type(cylface.Surface), Part.Cylinder):
-                        break
-                if not (issubclass(type(cylface.Surface), Part.Cylinder)):
-                    break
-                # Part.show(cylface,"cylface")
-                for planeface in facelist:
-                    if issubclass(type(planeface.Surface), Part.Plane):
-                        break
-                # Part.show(planeface,"planeface")
-                normal = planeface.normalAt(0, 0)
-                revAxisV = cylface.Surface.Axis
-                revAxisP = cylface.Surface.Center
-                bendA = bendAngle(cylface, revAxisP)
-                # print([bendA, revAxisV, revAxisP, cylface.Orientation])
-
-                # To check bend direction
-                offsetface = cylface.makeOffsetShape(-thk, 0.0, fill=False)
-                # Part.show(offsetface,"offsetface")
-                if offsetface.Area < cylface.Area:
-                    bendR = cylface.Surface.Radius - thk
-                    flipped = True
-                else:
-                    bendR = cylface.Surface.Radius
-                    flipped = False
-                # To arrive unfold Length, neutralRadius
-                unfoldLength = (bendR + kfactor * thk) * abs(bendA) * math.pi / 180.0
-                neutralRadius = bendR + kfactor * thk
-                # print([unfoldLength,neutralRadius])
-
-                # To get faceNormal, bend face
-                faceNormal = normal.cross(revAxisV).normalize()
-                # print(faceNormal)
-                if bendR < cylface.Surface.Radius:
-                    offsetSolid = cylface.makeOffsetShape(bendR / 2.0, 0.0, fill=True)
-                else:
-                    offsetSolid = cylface.makeOffsetShape(-bendR / 2.0, 0.0, fill=True)
-                # Part.show(offsetSolid,"offsetSolid")
-                tool = BendEdge.copy()
-                FaceArea = tool.extrude(faceNormal * -unfoldLength)
-                # Part.show(FaceArea,"FaceArea")
-                # Part.show(BalanceFace,"BalanceFace")
-                SolidFace = offsetSolid.common(FaceArea)
-                # Part.show(BendSolidFace,"BendSolidFace")
-                if not (SolidFace.Faces):
-                    faceNormal = faceNormal * -1
-                    FaceArea = tool.extrude(faceNormal * -unfoldLength)
-                BendSolidFace = BalanceFace.common(FaceArea)
-                # Part.show(FaceArea,"FaceArea")
-                # Part.show(BendSolidFace,"BendSolidFace")
-                # print([bendR, bendA, revAxisV, revAxisP, normal, flipped, BendSolidFace.Faces[0].normalAt(0,0)])
-
-                bendsolid = SheetMetalBendSolid.bend_solid(
-                    BendSolidFace.Faces[0],
-                    BendEdge,
-                    bendR,
-                    thk,
-                    neutralRadius,
-                    revAxisV,
-                    flipped,
-                )
-                # Part.show(bendsolid,"bendsolid")
-                solidlist.append(bendsolid)
-
-                if flipped == True:
-                    bendA = -bendA
-                if not (SolidFace.Faces):
-                    revAxisV = revAxisV * -1
-                sketch_face = BalanceFace.cut(BendSolidFace)
-                sketch_face.translate(faceNormal * unfoldLength)
-                # Part.show(sketch_face,"sketch_face")
-                sketch_face.rotate(revAxisP, -revAxisV, bendA)
-                # Part.show(sketch_face,"Rsketch_face")
-                TopFace = SheetMetalTools.smGetIntersectingFace(sketch_face, resultSolid)
-                # Part.show(TopFace,"TopFace")
-
-                # To get top face normal, flatsolid
-                normal = TopFace.normalAt(0, 0)
-                Flatface = sketch_face.common(TopFace)
-                BalanceFace = sketch_face.cut(Flatface)
-                # Part.show(BalanceFace,"BalanceFace")
-                Flatsolid = Flatface.extrude(normal * -thk)
-                # Part.show(Flatsolid,"Flatsolid")
-                solidlist.append(Flatsolid)
+    # Follow the rest of the sketch across the bends
+    for BalanceFace in BalanceFaces.Faces:
+        solidlist += profileMap.mapProfile(BalanceFace, LargeFace, thk, kfactor)
     # To get relief Solid fused
-    if len(solidlist) > 1:
-        SMSolid = solidlist[0].multiFuse(solidlist[1:])
-        # Part.show(SMSolid,"SMSolid")
-        SMSolid = SMSolid.removeSplitter()
-    else:
-        SMSolid = solidlist[0]
+    SMSolid = SheetMetalProfileMap.smFuseProfileSolids(solidlist)
     # Part.show(SMSolid,"SMSolid")
-    resultSolid = resultSolid.cut(SMSolid)
+    if SMSolid is not None:
+        resultSolid = resultSolid.cut(SMSolid)
     SheetMetalTools.smHideObjects(MainObject, sketch)
     return resultSolid
 
@@ -236,6 +110,7 @@ class SMSketchOnSheet:
 
 if SheetMetalTools.isGuiLoaded():
     from FreeCAD import Gui
+    import SheetMetalCommands
 
     icons_path = SheetMetalTools.icons_path
 
@@ -283,20 +158,7 @@ if SheetMetalTools.isGuiLoaded():
         """Add Wrap cutout command"""
 
         def GetResources(self):
-            return {
-                "Pixmap": os.path.join(
-                    icons_path, "SheetMetal_SketchOnSheet.svg"
-                ),  # the name of a svg file available in the resources
-                "MenuText": FreeCAD.Qt.translate("SheetMetal", "Wrap Cutout"),
-                "Accel": "M, S",
-                "ToolTip": FreeCAD.Qt.translate(
-                    "SheetMetal",
-                    "Wrap cutout from a Sketch On Sheet metal faces\n"
-                    "1. Select a flat face on sheet metal and\n"
-                    "2. Select a sketch on same face to create sheetmetal wrapped cut.\n"
-                    "3. Use Property editor to modify other parameters",
-                ),
-            }
+            return SheetMetalCommands.smGetCommandResources("SheetMetal_SketchOnSheet")
 
         def Activated(self):
             sel = Gui.Selection.getSelectionEx()[0]
@@ -319,4 +181,4 @@ if SheetMetalTools.isGuiLoaded():
             return True
 
 
-    Gui.addCommand("SheetMetal_SketchOnSheet", AddSketchOnSheetCommandClass())
+    SheetMetalCommands.smAddCommand("SheetMetal_SketchOnSheet", AddSketchOnSheetCommandClass())
@@ -25,3 +25,4 @@ import TestApp
 
 from SMTests.testFolder import TestFolder
 from SMTests.testKfactor import TestKFactor
+from SMTests.testFlatExport import TestFlatExport
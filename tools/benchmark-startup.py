@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# Compare the workbench initialization and activation import cost, eager vs lazy
+# command registration. Activating the workbench imports no command module, the
+# "first use" run adds the import of the module of a single command.
+# Run with an interpreter that can import FreeCAD, e.g.:
+#   freecadcmd tools/benchmark-startup.py
+#   python3 tools/benchmark-startup.py --python /usr/lib/freecad/bin/freecadcmd
+# -*- coding: utf-8 -*-
+###################################################################################
+#
+#  benchmark-startup.py
+#
+#  Copyright 2025 Shai Seger <shaise at gmail dot com>
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 2 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+###################################################################################
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+mod_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules imported by the workbench Initialize before lazy command registration
+eager_modules = [
+    "SheetMetalCmd",
+    "SheetMetalExtendCmd",
+    "SheetMetalUnfolder",
+    "SheetMetalBaseCmd",
+    "SheetMetalFoldCmd",
+    "SheetMetalRelief",
+    "SheetMetalJunction",
+    "SheetMetalBend",
+    "SketchOnSheetMetalCmd",
+    "ExtrudedCutout",
+    "SheetMetalCornerReliefCmd",
+    "SheetMetalFormingCmd",
+    "SheetMetalUnfoldCmd",
+    "SheetMetalBaseShapeCmd",
+]
+
+lazy_modules = ["SheetMetalCommands"]
+
+# lazy registration, then the first activation of the "Make Base Wall" command
+first_use_modules = lazy_modules + ["SheetMetalBaseCmd"]
+
+# FreeCAD and Part are loaded before the workbench in any case, so they are not timed
+timing_script = """
+import sys, time
+sys.path.insert(0, {path!r})
+import FreeCAD
+import Part
+import SheetMetalTools
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - start)
+"""
+
+
+def time_imports(python, modules):
+    script = timing_script.format(path=mod_path, modules=modules)
+    result = subprocess.run(
+        [python, "-c", script], capture_output=True, text=True, check=True
+    )
+    # freecadcmd may print a banner, the timing is the last line
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the workbench initialization and activation imports")
+    parser.add_argument("--python", default=sys.executable,
+                        help="interpreter able to import FreeCAD")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold runs")
+    args = parser.parse_args()
+
+    for label, modules in (("eager", eager_modules), ("lazy", lazy_modules),
+                           ("first use", first_use_modules)):
+        times = [time_imports(args.python, modules) for _ in range(args.runs)]
+        print(f"{label:9s} median {statistics.median(times) * 1000.0:8.1f} ms"
+              f"  min {min(times) * 1000.0:8.1f} ms  ({args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()